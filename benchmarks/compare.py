@@ -0,0 +1,64 @@
+"""Compares two benchmark reports and fails if the candidate regressed.
+
+    uv run python benchmarks/compare.py baseline.json candidate.json --threshold 10
+
+A regression is a p95 latency increase or a requests/sec drop larger than
+--threshold percent in any scenario present in both reports.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# (metric label, path into a scenario result, True if higher is better)
+METRICS = (
+    ("p50 ms", ("latency_ms", "p50"), False),
+    ("p95 ms", ("latency_ms", "p95"), False),
+    ("p99 ms", ("latency_ms", "p99"), False),
+    ("req/s", ("requests_per_sec",), True),
+    ("chars/s", ("chars_per_sec",), True),
+    ("peak RSS MB", ("peak_rss_mb",), False),
+)
+GATED = {"p95 ms", "req/s"}
+
+
+def _value(result, path):
+    for key in path:
+        result = result[key]
+    return float(result)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument("--threshold", type=float, default=10.0, help="Allowed regression in percent")
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text())
+    candidate = json.loads(args.candidate.read_text())
+    regressions = []
+
+    print(f"{'scenario':<10} {'metric':<12} {'baseline':>10} {'candidate':>10} {'change':>8}")
+    for scenario, new in candidate["scenarios"].items():
+        old = baseline["scenarios"].get(scenario)
+        if old is None:
+            continue
+        for label, path, higher_is_better in METRICS:
+            before, after = _value(old, path), _value(new, path)
+            change = (after - before) / before * 100 if before else 0.0
+            worse = -change if higher_is_better else change
+            flag = ""
+            if label in GATED and worse > args.threshold:
+                flag = " !"
+                regressions.append(f"{scenario} {label}")
+            print(f"{scenario:<10} {label:<12} {before:>10.2f} {after:>10.2f} {change:>+7.1f}%{flag}")
+
+    if regressions:
+        print(f"\nRegressed beyond {args.threshold:.0f}%: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
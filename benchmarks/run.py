@@ -0,0 +1,49 @@
+"""Runs the gcp-chirp benchmark suite against the in-process fake TTS server.
+
+    uv run python benchmarks/run.py --output benchmarks/results/$(git rev-parse --short HEAD).json
+
+The report is JSON so runs from different commits can be diffed with compare.py.
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from gcp_chirp.bench import SCENARIOS, BenchConfig, run_benchmarks
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> int:
+    defaults = BenchConfig()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    for field, default in defaults._asdict().items():
+        parser.add_argument(f"--{field.replace('_', '-')}", type=type(default), default=default)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--address", default=None, help="Use an already running fake server instead")
+    parser.add_argument("--output", type=Path, default=None, help="Report file (default: stdout)")
+    args = parser.parse_args()
+
+    config = BenchConfig(**{field: getattr(args, field) for field in defaults._fields})
+    report = run_benchmarks(config, args.scenarios.split(","), address=args.address)
+    report["commit"] = git_commit()
+
+    text = json.dumps(report, indent=2) + "\n"
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text)
+    else:
+        sys.stdout.write(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
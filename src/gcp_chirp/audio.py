@@ -0,0 +1,325 @@
+import io
+import struct
+from typing import BinaryIO, Iterator, List, NamedTuple, Optional, Sequence
+
+# Layer III bitrates in kbps, indexed by the 4-bit bitrate field.
+_MP3_BITRATES_V1 = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+_MP3_BITRATES_V2 = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+_MP3_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),  # MPEG-1
+    2: (22050, 24000, 16000),  # MPEG-2
+    0: (11025, 12000, 8000),   # MPEG-2.5
+}
+
+
+class Mp3Frame(NamedTuple):
+    offset: int
+    length: int
+    sample_rate: int
+    samples: int
+    header: bytes
+
+
+def _parse_mp3_header(data, offset: int) -> Optional[Mp3Frame]:
+    if offset + 4 > len(data):
+        return None
+    b1, b2 = data[offset + 1], data[offset + 2]
+    if data[offset] != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+    version = (b1 >> 3) & 0x03
+    layer = (b1 >> 1) & 0x03
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 0x03
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    sample_rate = _MP3_SAMPLE_RATES[version][rate_index]
+    padding = (b2 >> 1) & 0x01
+    if version == 3:
+        bitrate = _MP3_BITRATES_V1[bitrate_index] * 1000
+        samples = 1152
+        length = 144 * bitrate // sample_rate + padding
+    else:
+        bitrate = _MP3_BITRATES_V2[bitrate_index] * 1000
+        samples = 576
+        length = 72 * bitrate // sample_rate + padding
+    return Mp3Frame(offset, length, sample_rate, samples, bytes(data[offset:offset + 4]))
+
+
+def silent_mp3_frame(header: bytes) -> bytes:
+    """Builds a frame that decodes to silence, matching the format of an existing frame header.
+
+    Zeroed side info gives part2_3_length = 0 and global_gain = 0 for every
+    granule, so no encoder is needed.
+    """
+    frame = _parse_mp3_header(header, 0)
+    if frame is None:
+        raise ValueError("Not an MPEG Layer III frame header")
+    # Clear the CRC-protection flag so the frame carries no checksum to compute.
+    unprotected = bytes((header[0], header[1] | 0x01, header[2], header[3]))
+    return unprotected + bytes(frame.length - 4)
+
+
+def _skip_id3v2(data) -> int:
+    if len(data) >= 10 and bytes(data[:3]) == b"ID3":
+        size = 0
+        for byte in data[6:10]:
+            size = (size << 7) | (byte & 0x7F)
+        footer = 10 if data[5] & 0x10 else 0
+        return 10 + size + footer
+    return 0
+
+
+def iter_mp3_frames(data) -> Iterator[Mp3Frame]:
+    """Yields MPEG audio Layer III frames, skipping tags and resyncing over junk."""
+    view = memoryview(data)
+    offset = _skip_id3v2(view)
+    end = len(view)
+    if end - offset >= 128 and bytes(view[end - 128:end - 125]) == b"TAG":
+        end -= 128
+    view = view[:end]
+
+    while offset + 4 <= end:
+        frame = _parse_mp3_header(view, offset)
+        if frame is None or offset + frame.length > end:
+            offset += 1
+            continue
+        yield frame
+        offset += frame.length
+
+
+def is_mp3_info_frame(data, frame: Mp3Frame) -> bool:
+    """Detects the Xing/Info/VBRI metadata frame encoders put at the start of a stream."""
+    mpeg1 = (frame.header[1] >> 3) & 0x03 == 3
+    mono = (frame.header[3] >> 6) == 3
+    side_info = (17 if mono else 32) if mpeg1 else (9 if mono else 17)
+    crc = 0 if frame.header[1] & 0x01 else 2
+    tag_at = frame.offset + 4 + crc + side_info
+    return (
+        bytes(data[tag_at:tag_at + 4]) in (b"Xing", b"Info")
+        or bytes(data[frame.offset + 36:frame.offset + 40]) == b"VBRI"
+    )
+
+
+class WavFormat(NamedTuple):
+    fmt_chunk: bytes
+    data_offset: int
+    data_length: int
+
+
+def parse_wav(data) -> Optional[WavFormat]:
+    """Locates the fmt and data chunks of a RIFF/WAVE byte string."""
+    view = memoryview(data)
+    if len(view) < 12 or bytes(view[:4]) != b"RIFF" or bytes(view[8:12]) != b"WAVE":
+        return None
+    offset = 12
+    fmt_chunk = None
+    while offset + 8 <= len(view):
+        chunk_id = bytes(view[offset:offset + 4])
+        (chunk_size,) = struct.unpack_from("<I", view, offset + 4)
+        body = offset + 8
+        if chunk_id == b"fmt ":
+            fmt_chunk = bytes(view[body:body + chunk_size])
+        elif chunk_id == b"data":
+            if fmt_chunk is None:
+                return None
+            # Streamed WAVs may carry a placeholder size; trust the payload instead.
+            length = min(chunk_size, len(view) - body)
+            return WavFormat(fmt_chunk, body, length)
+        offset = body + chunk_size + (chunk_size & 1)
+    return None
+
+
+class AudioWriter:
+    """Appends synthesized segments of one encoding into a single output stream."""
+
+    def __init__(self, out: BinaryIO):
+        self.out = out
+
+    def write(self, segment: bytes):
+        self.out.write(memoryview(segment))
+
+    def close(self):
+        pass
+
+
+class Mp3Writer(AudioWriter):
+    """Joins MP3 segments at frame boundaries, dropping per-segment tags and Info frames."""
+
+    def __init__(self, out: BinaryIO):
+        super().__init__(out)
+        self._pending: Optional[bytes] = None
+        self._joined = False
+
+    def _write_frames(self, segment: bytes):
+        view = memoryview(segment)
+        for frame in iter_mp3_frames(view):
+            if is_mp3_info_frame(view, frame):
+                continue
+            self.out.write(view[frame.offset:frame.offset + frame.length])
+
+    def write(self, segment: bytes):
+        # The first segment is held back so a single-segment output stays byte-identical.
+        if self._pending is None and not self._joined:
+            self._pending = segment
+            return
+        if self._pending is not None:
+            self._write_frames(self._pending)
+            self._pending = None
+            self._joined = True
+        self._write_frames(segment)
+
+    def close(self):
+        if self._pending is not None:
+            self.out.write(memoryview(self._pending))
+            self._pending = None
+
+
+def pcm_format(sample_rate: int, channels: int = 1, bits_per_sample: int = 16, format_tag: int = 1) -> bytes:
+    """Builds a WAVE fmt chunk body; format_tag is 1 for PCM, 6 for A-law and 7 for mu-law."""
+    block_align = channels * bits_per_sample // 8
+    return struct.pack(
+        "<HHIIHH", format_tag, channels, sample_rate, sample_rate * block_align, block_align, bits_per_sample
+    )
+
+
+class WavWriter(AudioWriter):
+    """Concatenates PCM payloads under one RIFF header, patched with final sizes on close.
+
+    Segments normally carry their own WAV header. When raw_format is given
+    (a fmt chunk from pcm_format), headerless segments, as returned by the
+    streaming API, are accepted as sample data in that format.
+    """
+
+    def __init__(self, out: BinaryIO, raw_format: Optional[bytes] = None):
+        super().__init__(out)
+        self._raw_format = raw_format
+        self._fmt_chunk: Optional[bytes] = None
+        self._header_offset = 0
+        self._data_length = 0
+
+    def _write_header(self, data_length: int):
+        self.out.write(b"RIFF")
+        self.out.write(struct.pack("<I", min(0xFFFFFFFF, 4 + 8 + len(self._fmt_chunk) + 8 + data_length)))
+        self.out.write(b"WAVE")
+        self.out.write(b"fmt " + struct.pack("<I", len(self._fmt_chunk)) + self._fmt_chunk)
+        self.out.write(b"data" + struct.pack("<I", min(0xFFFFFFFF, data_length)))
+
+    def write(self, segment: bytes):
+        wav = parse_wav(segment)
+        if wav is None and self._raw_format is not None:
+            wav = WavFormat(self._raw_format, 0, len(segment))
+        if wav is None:
+            raise ValueError("Expected a WAV segment for PCM output")
+        if self._fmt_chunk is None:
+            self._fmt_chunk = wav.fmt_chunk
+            self._header_offset = self.out.tell() if self.out.seekable() else 0
+            self._write_header(0xFFFFFFFF)
+        elif wav.fmt_chunk != self._fmt_chunk:
+            raise ValueError("Cannot join WAV segments with different sample formats")
+        self.out.write(memoryview(segment)[wav.data_offset:wav.data_offset + wav.data_length])
+        self._data_length += wav.data_length
+
+    def close(self):
+        if self._fmt_chunk is None or not self.out.seekable():
+            return
+        end = self.out.tell()
+        self.out.seek(self._header_offset)
+        self._write_header(self._data_length)
+        self.out.seek(end)
+
+
+# File extension and WAVE format tag for each supported AudioEncoding name.
+ENCODING_EXTENSIONS = {
+    "MP3": ".mp3",
+    "LINEAR16": ".wav",
+    "OGG_OPUS": ".ogg",
+    "MULAW": ".wav",
+    "ALAW": ".wav",
+}
+_WAV_FORMAT_TAGS = {"LINEAR16": (1, 16), "ALAW": (6, 8), "MULAW": (7, 8)}
+
+
+def create_writer(encoding: str, out: BinaryIO, sample_rate: int = 24000) -> AudioWriter:
+    """Returns the segment joiner for an AudioEncoding name."""
+    if encoding == "MP3":
+        return Mp3Writer(out)
+    if encoding in _WAV_FORMAT_TAGS:
+        format_tag, bits = _WAV_FORMAT_TAGS[encoding]
+        return WavWriter(out, raw_format=pcm_format(sample_rate, bits_per_sample=bits, format_tag=format_tag))
+    if encoding == "OGG_OPUS":
+        # Back-to-back Ogg physical streams form a valid chained stream, so plain appends are a join.
+        return AudioWriter(out)
+    raise ValueError(f"Joining segments is not supported for {encoding} audio")
+
+
+# Byte that decodes to zero amplitude for each 8-bit companded WAVE format tag.
+_SILENT_SAMPLE = {6: b"\xd5", 7: b"\xff"}
+
+
+def silence_like(encoding: str, segment: bytes, seconds: float) -> bytes:
+    """Builds a segment of silence in the same format as an existing segment, without synthesis.
+
+    PCM is zero samples, mu-law 0xFF and A-law 0xD5 bytes, all under the
+    segment's own WAV header. MP3 repeats a silent frame matching the
+    segment's first frame. OGG_OPUS would need an encoder and is rejected.
+    """
+    if encoding in _WAV_FORMAT_TAGS:
+        wav = parse_wav(segment)
+        if wav is None:
+            raise ValueError("Expected a WAV segment for PCM output")
+        format_tag, _, sample_rate, _, block_align, _ = struct.unpack_from("<HHIIHH", wav.fmt_chunk)
+        samples = round(seconds * sample_rate)
+        buffer = io.BytesIO()
+        writer = WavWriter(buffer, raw_format=wav.fmt_chunk)
+        writer.write(_SILENT_SAMPLE.get(format_tag, b"\x00") * (samples * block_align))
+        writer.close()
+        return buffer.getvalue()
+    if encoding == "MP3":
+        view = memoryview(segment)
+        frame = next((frame for frame in iter_mp3_frames(view) if not is_mp3_info_frame(view, frame)), None)
+        if frame is None:
+            raise ValueError("Expected an MP3 segment with at least one audio frame")
+        silent = silent_mp3_frame(frame.header)
+        return silent * round(seconds * frame.sample_rate / frame.samples)
+    raise ValueError(f"Generating silence is not supported for {encoding} audio")
+
+
+def split_audio(encoding: str, data: bytes, starts: Sequence[float]) -> List[bytes]:
+    """Cuts one synthesized response into standalone clips beginning at each start time (seconds).
+
+    PCM-family WAVs are cut at the exact sample; MP3 is cut at the frame
+    boundary nearest each start time. The first clip always begins at zero.
+    """
+    if encoding in _WAV_FORMAT_TAGS:
+        wav = parse_wav(data)
+        if wav is None:
+            raise ValueError("Expected a WAV response for PCM output")
+        _, _, sample_rate, _, block_align, _ = struct.unpack_from("<HHIIHH", wav.fmt_chunk)
+        offsets = [0] + [min(round(start * sample_rate) * block_align, wav.data_length) for start in starts[1:]]
+        offsets.append(wav.data_length)
+        view = memoryview(data)[wav.data_offset:wav.data_offset + wav.data_length]
+        clips = []
+        for begin, end in zip(offsets, offsets[1:]):
+            buffer = io.BytesIO()
+            writer = WavWriter(buffer, raw_format=wav.fmt_chunk)
+            writer.write(bytes(view[begin:max(begin, end)]))
+            writer.close()
+            clips.append(buffer.getvalue())
+        return clips
+    if encoding == "MP3":
+        clips = [bytearray() for _ in starts]
+        view = memoryview(data)
+        elapsed = 0.0
+        clip = 0
+        for frame in iter_mp3_frames(view):
+            if is_mp3_info_frame(view, frame):
+                continue
+            duration = frame.samples / frame.sample_rate
+            # A frame belongs to the next clip once most of it lies past that clip's start
+            while clip + 1 < len(starts) and elapsed + duration / 2 >= starts[clip + 1]:
+                clip += 1
+            clips[clip] += view[frame.offset:frame.offset + frame.length]
+            elapsed += duration
+        return [bytes(clip) for clip in clips]
+    raise ValueError(f"Splitting audio is not supported for {encoding}")
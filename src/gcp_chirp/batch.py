@@ -0,0 +1,182 @@
+import csv
+import json
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Set
+from .audio import ENCODING_EXTENSIONS
+from .tts import ChirpTTS
+from .workers import unordered_map
+
+# Rows handed to synthesize_many() at once in pack mode; it splits them further by request size.
+PACK_ROWS = 100
+# Rows deduplicated together in dedupe mode; repeats across groups are still served by the cache.
+DEDUPE_ROWS = 1000
+
+
+class ManifestRow(NamedTuple):
+    id: str
+    text: str
+    voice: Optional[str]
+    output: Optional[str]
+
+
+def read_manifest(manifest: Path) -> Iterator[ManifestRow]:
+    """Streams rows from a CSV or JSONL manifest with id, text, voice and output columns."""
+    with open(manifest, "r", newline="") as f:
+        if manifest.suffix.lower() in (".jsonl", ".ndjson"):
+            records = (json.loads(line) for line in f if line.strip())
+        else:
+            records = csv.DictReader(f)
+        for line_number, record in enumerate(records, start=1):
+            row_id = str(record.get("id") or "").strip()
+            text = record.get("text") or ""
+            if not row_id:
+                raise ValueError(f"{manifest}: row {line_number} has no id")
+            yield ManifestRow(
+                id=row_id,
+                text=text,
+                voice=record.get("voice") or None,
+                output=record.get("output") or None,
+            )
+
+
+def load_completed(results_file: Path) -> Set[str]:
+    """Returns the ids a previous run already finished, so a resumed batch skips them."""
+    completed = set()
+    if results_file.exists():
+        with open(results_file, "r") as f:
+            for line in f:
+                try:
+                    result = json.loads(line)
+                except ValueError:
+                    # The last line may be torn if the previous run crashed mid-write.
+                    continue
+                if result.get("status") in ("ok", "skipped"):
+                    completed.add(result["id"])
+    return completed
+
+
+def _groups(rows: Iterator[ManifestRow], size: int) -> Iterator[List[ManifestRow]]:
+    while True:
+        group = list(islice(rows, size))
+        if not group:
+            return
+        yield group
+
+
+def run_batch(
+    tts: ChirpTTS,
+    manifest: Path,
+    results_file: Path,
+    default_voice: str,
+    output_dir: Path = Path("."),
+    concurrency: int = 1,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+    pack: bool = False,
+    dedupe: bool = False
+) -> Dict[str, int]:
+    """Synthesizes every manifest row through one shared client, appending a result line per row.
+
+    With pack, groups of rows sharing a voice go through synthesize_many(), so
+    many short rows cost one request. With dedupe, they go through
+    synthesize_deduplicated(), so a sentence repeated across rows is billed
+    once; the summary then also reports characters_saved.
+    """
+    completed = load_completed(results_file)
+    summary = {"ok": 0, "skipped": 0, "error": 0, "resumed": 0}
+    if dedupe:
+        summary["characters_saved"] = 0
+
+    def pending_rows() -> Iterator[ManifestRow]:
+        for row in read_manifest(manifest):
+            if row.id in completed:
+                summary["resumed"] += 1
+                continue
+            yield row
+
+    def prepare(row: ManifestRow) -> Dict[str, Any]:
+        output = output_dir / (row.output or f"{row.id}{ENCODING_EXTENSIONS[tts.audio_encoding]}")
+        result = {"id": row.id, "output": str(output)}
+        if output.exists():
+            result.update(status="skipped", latency_ms=0.0)
+        elif not row.text.strip():
+            result.update(status="error", error="Input text is empty", latency_ms=0.0)
+        return result
+
+    def process(row: ManifestRow) -> List[Dict[str, Any]]:
+        result = prepare(row)
+        if "status" in result:
+            return [result]
+        start = time.perf_counter()
+        try:
+            tts.synthesize(row.text, row.voice or default_voice, result["output"])
+            result["status"] = "ok"
+        except Exception as e:
+            result["status"] = "error"
+            result["error"] = str(e)
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        return [result]
+
+    def process_group(rows: List[ManifestRow]) -> List[Dict[str, Any]]:
+        results = [prepare(row) for row in rows]
+        by_voice: Dict[str, List[int]] = {}
+        for i, (row, result) in enumerate(zip(rows, results)):
+            if "status" not in result:
+                by_voice.setdefault(row.voice or default_voice, []).append(i)
+        for voice, indexes in by_voice.items():
+            start = time.perf_counter()
+            try:
+                tts.synthesize_many([rows[i].text for i in indexes], [results[i]["output"] for i in indexes], voice)
+                outcome = {"status": "ok"}
+            except Exception as e:
+                outcome = {"status": "error", "error": str(e)}
+            # Rows in one request share its latency
+            outcome["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            for i in indexes:
+                results[i].update(outcome)
+        return results
+
+    def dedupe_group(rows: List[ManifestRow]) -> List[Dict[str, Any]]:
+        results = [prepare(row) for row in rows]
+        by_voice: Dict[str, List[int]] = {}
+        for i, (row, result) in enumerate(zip(rows, results)):
+            if "status" not in result:
+                by_voice.setdefault(row.voice or default_voice, []).append(i)
+        for voice, indexes in by_voice.items():
+            start = time.perf_counter()
+            try:
+                outcome = tts.synthesize_deduplicated(
+                    [rows[i].text for i in indexes], [results[i]["output"] for i in indexes], voice,
+                    concurrency=concurrency,
+                )
+                errors = outcome.errors
+                summary["characters_saved"] += outcome.characters_saved
+            except Exception as e:
+                errors = [str(e)] * len(indexes)
+            latency_ms = round((time.perf_counter() - start) * 1000, 1)
+            for i, error in zip(indexes, errors):
+                if error is None:
+                    results[i].update(status="ok", latency_ms=latency_ms)
+                else:
+                    results[i].update(status="error", error=error, latency_ms=latency_ms)
+        return results
+
+    if dedupe:
+        # Groups run one at a time; unique sentences within a group are the unit of parallelism
+        work = map(dedupe_group, _groups(pending_rows(), DEDUPE_ROWS))
+    elif pack:
+        work = unordered_map(process_group, _groups(pending_rows(), PACK_ROWS), concurrency)
+    else:
+        work = unordered_map(process, pending_rows(), concurrency)
+
+    results_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(results_file, "a") as out:
+        for results in work:
+            for result in results:
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+                summary[result["status"]] += 1
+                if on_result:
+                    on_result(result)
+    return summary
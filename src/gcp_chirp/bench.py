@@ -0,0 +1,242 @@
+import json
+import math
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+from .batch import run_batch
+from .fakeserver import FakeServerConfig, fake_client, start_fake_server
+from .ratelimit import RetryPolicy
+from .tts import ChirpTTS
+from .workers import unordered_map
+
+SCENARIOS = ("single", "batch", "chunked", "streaming")
+BENCH_VOICE = "en-US-Chirp3-HD-Aoede"
+_SENTENCE = "The quick brown fox jumps over the lazy dog near the riverbank. "
+
+
+class BenchConfig(NamedTuple):
+    requests: int = 50
+    concurrency: int = 4
+    latency_ms: float = 50.0
+    jitter_ms: float = 10.0
+    error_rate: float = 0.0
+    payload_bytes: int = 16000
+    text_chars: int = 200
+    chunk_bytes: int = 400
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty sample."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process image so far, in MiB.
+
+    The figure only ever rises, so run_benchmarks measures each scenario in
+    its own process. On Linux it is read from VmHWM, which starts over at
+    exec; ru_maxrss would carry the parent's peak into a spawned child.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _sample_text(chars: int) -> str:
+    return (_SENTENCE * (chars // len(_SENTENCE) + 1))[:chars].strip()
+
+
+def _summarize(latencies: List[float], errors: int, chars: int, elapsed: float) -> Dict[str, Any]:
+    completed = len(latencies)
+    return {
+        "requests": completed + errors,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 4),
+        "requests_per_sec": round(completed / elapsed, 2) if elapsed else 0.0,
+        "chars_per_sec": round(chars / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            name: round(percentile(latencies, pct) * 1000, 2)
+            for name, pct in (("p50", 50), ("p95", 95), ("p99", 99))
+        },
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def _timed_calls(fn: Callable[[int], int], count: int, concurrency: int) -> Dict[str, Any]:
+    """Runs fn(i) count times in parallel; fn returns the characters it synthesized."""
+    def call(i: int):
+        start = time.perf_counter()
+        try:
+            chars = fn(i)
+            return chars, time.perf_counter() - start, None
+        except Exception as e:
+            return 0, time.perf_counter() - start, e
+
+    latencies: List[float] = []
+    errors = chars = 0
+    start = time.perf_counter()
+    for done, latency, error in unordered_map(call, range(count), concurrency):
+        if error is None:
+            latencies.append(latency)
+            chars += done
+        else:
+            errors += 1
+    return _summarize(latencies, errors, chars, time.perf_counter() - start)
+
+
+def bench_single(tts: ChirpTTS, config: BenchConfig, work_dir: Path) -> Dict[str, Any]:
+    """One SynthesizeSpeech call per request, issued from `concurrency` threads."""
+    text = _sample_text(config.text_chars)
+
+    def run(i: int) -> int:
+        tts.synthesize(f"{i} {text}", BENCH_VOICE, str(work_dir / f"single_{i}.mp3"))
+        return len(text)
+
+    return _timed_calls(run, config.requests, config.concurrency)
+
+
+def bench_chunked(tts: ChirpTTS, config: BenchConfig, work_dir: Path) -> Dict[str, Any]:
+    """Long documents split into chunk_bytes pieces and synthesized in parallel per document."""
+    text = _sample_text(config.chunk_bytes * 4)
+    documents = max(1, config.requests // 4)
+    tts.concurrency = config.concurrency
+
+    def run(i: int) -> int:
+        tts.synthesize(f"{i} {text}", BENCH_VOICE, str(work_dir / f"chunked_{i}.mp3"))
+        return len(text)
+
+    try:
+        # Documents go one at a time; their chunks are the unit of parallelism
+        return _timed_calls(run, documents, 1)
+    finally:
+        tts.concurrency = 1
+
+
+def bench_streaming(tts: ChirpTTS, config: BenchConfig, work_dir: Path) -> Dict[str, Any]:
+    """StreamingSynthesize sessions; latency is time to the first audio chunk."""
+    text = _sample_text(config.text_chars)
+    pieces = [text[i:i + 50] for i in range(0, len(text), 50)]
+    sessions = max(1, config.requests // len(pieces))
+    latencies: List[float] = []
+    errors = chars = 0
+    start = time.perf_counter()
+    for _ in range(sessions):
+        session_start = time.perf_counter()
+        first_audio = None
+        try:
+            for _audio in tts.stream(pieces, BENCH_VOICE):
+                if first_audio is None:
+                    first_audio = time.perf_counter() - session_start
+            latencies.append(first_audio if first_audio is not None else time.perf_counter() - session_start)
+            chars += len(text)
+        except Exception:
+            errors += 1
+    return _summarize(latencies, errors, chars, time.perf_counter() - start)
+
+
+def bench_batch(tts: ChirpTTS, config: BenchConfig, work_dir: Path) -> Dict[str, Any]:
+    """A JSONL manifest run through run_batch; latency is the per-row time it records."""
+    text = _sample_text(config.text_chars)
+    manifest = work_dir / "manifest.jsonl"
+    with open(manifest, "w") as f:
+        for i in range(config.requests):
+            f.write(json.dumps({"id": f"row{i}", "text": f"{i} {text}"}) + "\n")
+
+    latencies: List[float] = []
+    start = time.perf_counter()
+    summary = run_batch(
+        tts,
+        manifest,
+        work_dir / "results.jsonl",
+        default_voice=BENCH_VOICE,
+        output_dir=work_dir / "batch",
+        concurrency=config.concurrency,
+        on_result=lambda result: latencies.append(result["latency_ms"] / 1000) if result["status"] == "ok" else None,
+    )
+    return _summarize(latencies, summary["error"], summary["ok"] * len(text), time.perf_counter() - start)
+
+
+_SCENARIO_RUNNERS = {
+    "single": bench_single,
+    "batch": bench_batch,
+    "chunked": bench_chunked,
+    "streaming": bench_streaming,
+}
+
+
+def run_benchmarks(
+    config: BenchConfig = BenchConfig(),
+    scenarios: Iterable[str] = SCENARIOS,
+    address: Optional[str] = None
+) -> Dict[str, Any]:
+    """Runs each scenario in its own process against a fresh fake server (or address); returns a JSON-ready report."""
+    scenarios = list(scenarios)
+    unknown = [name for name in scenarios if name not in _SCENARIO_RUNNERS]
+    if unknown:
+        raise ValueError(f"Unknown scenario(s): {', '.join(unknown)}. Choose from {', '.join(SCENARIOS)}")
+
+    report: Dict[str, Any] = {
+        "config": config._asdict(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "scenarios": {},
+    }
+    # A fresh interpreter per scenario, so each peak RSS covers that scenario alone. Spawned
+    # rather than forked: gRPC's threads do not survive fork.
+    context = multiprocessing.get_context("spawn")
+    for name in scenarios:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            report["scenarios"][name] = executor.submit(_run_scenario, name, config, address).result()
+    return report
+
+
+def _run_scenario(name: str, config: BenchConfig, address: Optional[str]) -> Dict[str, Any]:
+    """Runs one scenario against a fresh in-process fake server (or address)."""
+    server = servicer = None
+    target = address
+    if target is None:
+        server, servicer, target = start_fake_server(FakeServerConfig(
+            latency_ms=config.latency_ms,
+            jitter_ms=config.jitter_ms,
+            error_rate=config.error_rate,
+            payload_bytes=config.payload_bytes,
+        ))
+    tts = ChirpTTS(
+        max_chunk_bytes=config.chunk_bytes,
+        max_in_flight=config.concurrency,
+        # Keep injected failures from turning the run into a measurement of backoff sleeps
+        retry_policy=RetryPolicy(max_attempts=3, initial_backoff=0.01, max_backoff=0.1),
+        client=fake_client(target),
+    )
+    try:
+        with tempfile.TemporaryDirectory(prefix="gcp-chirp-bench-") as work_dir:
+            result = _SCENARIO_RUNNERS[name](tts, config, Path(work_dir))
+        if servicer is not None:
+            # Includes retried attempts, unlike "requests"
+            result["rpcs"] = servicer.requests
+        return result
+    finally:
+        tts.client.transport.close()
+        if server is not None:
+            server.stop(grace=None)
@@ -0,0 +1,236 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from .normalize import normalize_text
+from .storage import FileLock, atomic_open, atomic_write, lock_path
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+DEFAULT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+# ioctl(2) request that shares a file's extents with another (btrfs, XFS, ...), from <linux/fs.h>
+_FICLONE = 0x40049409
+
+
+def clone_file(source, target):
+    """Copies open file source into open file target, as a copy-on-write reflink where supported."""
+    if fcntl is not None and hasattr(fcntl, "ioctl"):
+        try:
+            fcntl.ioctl(target.fileno(), _FICLONE, source.fileno())
+            return
+        except OSError:
+            pass
+    shutil.copyfileobj(source, target, 1024 * 1024)
+
+
+class SynthesisCache:
+    """Content-addressed, size-bounded LRU cache of synthesized audio files.
+
+    Lookups never touch the index: a hit bumps the object's mtime, which
+    eviction uses as its last access, and hits and misses are appended to a
+    small log that is folded into the index when it is next rewritten. Only
+    store(), prune() and clear() take the lock, so workers sharing a cache do
+    not queue behind each other on every lookup.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = DEFAULT_CACHE_MAX_BYTES, link_outputs: bool = False):
+        self.cache_dir = Path(cache_dir)
+        self.objects_dir = self.cache_dir / "objects"
+        self.index_file = self.cache_dir / "index.json"
+        self.counts_file = self.cache_dir / "lookups.log"
+        self.max_bytes = max_bytes
+        # Hardlinking outputs to objects saves space and time, but editing such an output in place
+        # would corrupt the cached copy, so it is opt-in
+        self.link_outputs = link_outputs
+        # Index updates are read-modify-write; serialize them across threads and processes sharing
+        # this cache. The lock file sits beside the cache directory so clear() can remove the directory.
+        self._lock = FileLock(lock_path(self.cache_dir))
+
+    @staticmethod
+    def make_key(
+        text: str,
+        voice_name: str,
+        language_code: str,
+        audio_config: Dict[str, Any]
+    ) -> str:
+        """Builds the cache key from everything that affects the synthesized bytes."""
+        payload = json.dumps(
+            {
+                "text": normalize_text(text),
+                "voice": voice_name,
+                "language": language_code,
+                "audio": audio_config,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _object_path(self, key: str) -> Path:
+        return self.objects_dir / key[:2] / key
+
+    def _load_index(self) -> Dict[str, Any]:
+        index = {"entries": {}, "hits": 0, "misses": 0}
+        if self.index_file.exists():
+            try:
+                with open(self.index_file, "r") as f:
+                    index.update(json.load(f))
+            except (OSError, ValueError):
+                # A damaged index only costs us counters; objects are still valid.
+                pass
+        return index
+
+    def _save_index(self, index: Dict[str, Any]):
+        # Not fsynced: a lost update only costs counters and size bookkeeping
+        atomic_write(self.index_file, json.dumps(index), durable=False)
+
+    def _count(self, outcome: bytes):
+        # One O_APPEND write per lookup: atomic between processes, no lock or index rewrite needed
+        try:
+            fd = os.open(self.counts_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        except FileNotFoundError:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.counts_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, outcome)
+        finally:
+            os.close(fd)
+
+    def _read_counts(self, path: Path) -> Tuple[int, int]:
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return 0, 0
+        return data.count(b"h"), data.count(b"m")
+
+    def _fold_counts(self, index: Dict[str, Any]):
+        """Moves logged hits and misses into index. Call with the lock held."""
+        pending = self.counts_file.with_name(f"{self.counts_file.name}.{os.getpid()}.{threading.get_ident()}")
+        try:
+            os.replace(self.counts_file, pending)
+        except FileNotFoundError:
+            return
+        hits, misses = self._read_counts(pending)
+        os.remove(pending)
+        index["hits"] += hits
+        index["misses"] += misses
+
+    def lookup(self, key: str) -> Optional[Path]:
+        """Returns the stored object for key, recording a hit or a miss."""
+        path = self._object_path(key)
+        try:
+            now = time.time()
+            os.utime(path, (now, now))
+        except FileNotFoundError:
+            self._count(b"m")
+            return None
+        self._count(b"h")
+        return path
+
+    def materialize(self, key: str, output_file: str) -> bool:
+        """Writes a cached object to output_file, replacing it atomically. Returns False on a miss."""
+        path = self.lookup(key)
+        if path is None:
+            return False
+        try:
+            if self.link_outputs:
+                output_dir = os.path.dirname(output_file)
+                if output_dir:
+                    os.makedirs(output_dir, exist_ok=True)
+                tmp_file = f"{output_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+                try:
+                    os.link(path, tmp_file)
+                    os.replace(tmp_file, output_file)
+                    return True
+                except OSError:
+                    # Cross-device or unsupported filesystem; fall back to a copy
+                    if os.path.lexists(tmp_file):
+                        os.remove(tmp_file)
+            with open(path, "rb") as source, atomic_open(output_file, "wb", durable=False) as target:
+                clone_file(source, target)
+        except FileNotFoundError:
+            # Evicted by another process since the lookup
+            return False
+        return True
+
+    def store(self, key: str, source_file: str):
+        """Adds a synthesized file to the cache and evicts old entries if over budget."""
+        path = self._object_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(source_file, "rb") as source, open(tmp_path, "wb") as target:
+            clone_file(source, target)
+        now = time.time()
+        os.utime(tmp_path, (now, now))
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            index = self._load_index()
+            self._fold_counts(index)
+            index["entries"][key] = {"size": path.stat().st_size}
+            self._evict(index, self.max_bytes)
+            self._save_index(index)
+
+    def _evict(self, index: Dict[str, Any], max_bytes: int) -> Tuple[int, int]:
+        entries = index["entries"]
+        total = sum(entry["size"] for entry in entries.values())
+        if total <= max_bytes:
+            return 0, 0
+        # Last access is the object's mtime, bumped by every hit
+        accessed = {}
+        for key in entries:
+            try:
+                accessed[key] = self._object_path(key).stat().st_mtime
+            except FileNotFoundError:
+                accessed[key] = 0.0
+        removed = freed = 0
+        for key in sorted(entries, key=accessed.__getitem__):
+            if total <= max_bytes:
+                break
+            size = entries.pop(key)["size"]
+            try:
+                self._object_path(key).unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+            freed += size
+        return removed, freed
+
+    def prune(self, max_bytes: Optional[int] = None) -> Tuple[int, int]:
+        """Evicts least recently used entries until the cache fits max_bytes."""
+        with self._lock:
+            index = self._load_index()
+            self._fold_counts(index)
+            result = self._evict(index, self.max_bytes if max_bytes is None else max_bytes)
+            self._save_index(index)
+            return result
+
+    def clear(self):
+        """Removes every cached object and resets the counters."""
+        with self._lock:
+            if self.cache_dir.exists():
+                shutil.rmtree(self.cache_dir)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            index = self._load_index()
+        hits, misses = self._read_counts(self.counts_file)
+        hits += index["hits"]
+        misses += index["misses"]
+        lookups = hits + misses
+        return {
+            "entries": len(index["entries"]),
+            "size_bytes": sum(entry["size"] for entry in index["entries"].values()),
+            "max_bytes": self.max_bytes,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
@@ -1,20 +1,26 @@
 import os
 import shutil
 import subprocess
+import sys
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
 import typer
 from rich.console import Console
-from rich.table import Table
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from dotenv import load_dotenv
-from .tts import ChirpTTS
-from .config import ConfigManager
+from .config import ConfigError, ConfigManager
 
-# Load environment variables
-load_dotenv()
+# Heavy dependencies (google-cloud-texttospeech, grpc, rich tables/progress, YAML)
+# are imported inside the commands that need them so --help, config and shell
+# completion start fast. tests/test_startup.py enforces this.
+if TYPE_CHECKING:
+    from .cache import SynthesisCache
+    from rich.table import Table
+    from .jobs import LongAudioJobs
+    from .tts import ChirpTTS
+    from .voices import VoiceCatalog
 
+# Settings are parsed on first access, not at import time
 config_manager = ConfigManager()
 
 app = typer.Typer(
@@ -35,11 +41,35 @@ app = typer.Typer(
 )
 console = Console()
 
+cache_app = typer.Typer(help="Inspect and manage the local synthesis cache.")
+app.add_typer(cache_app, name="cache")
+jobs_app = typer.Typer(help="Track and download long audio synthesis jobs.")
+app.add_typer(jobs_app, name="jobs")
+
 @app.callback(invoke_without_command=True)
 def main(ctx: typer.Context):
     """
     Main entry point for GCP Chirp 3 HD TTS CLI.
     """
+    from dotenv import load_dotenv
+
+    # Load environment variables
+    load_dotenv()
+    # `say --output -` redirects console output to stderr; start every command on stdout
+    console.stderr = False
+
+    # A broken settings file fails every command up front, except the ones that repair it
+    if ctx.invoked_subcommand not in (None, "config-reset", "uninstall"):
+        try:
+            config_manager.ensure_loaded()
+        except ConfigError as e:
+            console.print(Panel(
+                f"[red]Error:[/red] {e}\nFix the file or run [bold]gcp-chirp config-reset[/bold].",
+                title="Failure",
+                border_style="red"
+            ))
+            raise typer.Exit(code=1)
+
     if ctx.invoked_subcommand is None:
         console.print(Panel(
             "[yellow]No command provided.[/yellow] Please see the available commands below.",
@@ -69,6 +99,292 @@ def validate_project_id(cli_project: Optional[str] = None):
         raise typer.Exit(code=1)
     return project_id
 
+def get_cache() -> "SynthesisCache":
+    """Builds the synthesis cache from the current configuration."""
+    from .cache import SynthesisCache
+
+    return SynthesisCache(
+        config_manager.config_dir / "cache",
+        max_bytes=int(config_manager.get("cache_max_mb")) * 1024 * 1024,
+        link_outputs=bool(config_manager.get("cache_link_outputs"))
+    )
+
+def get_long_audio_jobs(project: Optional[str] = None, creds: Optional[str] = None) -> "LongAudioJobs":
+    from .jobs import JOBS_DB, JobStore, LongAudioJobs
+
+    return LongAudioJobs(
+        JobStore(config_manager.config_dir / JOBS_DB),
+        project_id=project or config_manager.get("project_id"),
+        location=config_manager.get("long_audio_location"),
+        credentials_path=creds,
+    )
+
+def get_voice_catalog() -> "VoiceCatalog":
+    """Opens the on-disk voice catalog."""
+    from .voices import VoiceCatalog
+
+    return VoiceCatalog(
+        config_manager.config_dir / "voices.json",
+        ttl_seconds=float(config_manager.get("voice_catalog_ttl_hours")) * 3600
+    )
+
+def refresh_voice_catalog(catalog: "VoiceCatalog"):
+    """Fetches all voices from the API into the catalog."""
+    from .tts import ChirpTTS
+
+    with console.status("[bold green]Refreshing voice catalog..."):
+        changed = catalog.update(ChirpTTS().fetch_voices())
+    if changed:
+        console.print(f"[dim]Voice catalog updated ({len(catalog)} voices).[/dim]")
+
+def check_voice(voice: str):
+    """Rejects unknown voices using the local catalog, before any network call."""
+    catalog = get_voice_catalog()
+    if not catalog.load() or voice in catalog:
+        return
+    suggestions = catalog.suggest(voice)
+    hint = f"\nDid you mean: [bold cyan]{', '.join(suggestions)}[/bold cyan]?" if suggestions else ""
+    console.print(Panel(
+        f"[red]Unknown voice:[/red] {voice}{hint}\n"
+        "[dim]Run 'gcp-chirp list --refresh' if the catalog is out of date.[/dim]",
+        title="Voice Error",
+        border_style="red"
+    ))
+    raise typer.Exit(code=1)
+
+def resolve_encoding(encoding: Optional[str]) -> str:
+    """Validates an --encoding value, falling back to the configured default."""
+    from .audio import ENCODING_EXTENSIONS
+
+    target = (encoding or config_manager.get("audio_encoding")).upper()
+    if target not in ENCODING_EXTENSIONS:
+        console.print(f"[red]Error: Unsupported encoding '{target}'. Choose from {', '.join(ENCODING_EXTENSIONS)}.[/red]")
+        raise typer.Exit(code=1)
+    return target
+
+def resolve_preset(name: Optional[str]) -> Optional[dict]:
+    """Looks up a --preset value in the configured presets."""
+    if not name:
+        return None
+    presets = config_manager.get("presets") or {}
+    if name not in presets:
+        available = ", ".join(presets) or "none configured"
+        console.print(f"[red]Error: Unknown preset '{name}'. Presets in settings.yaml: {available}.[/red]")
+        raise typer.Exit(code=1)
+    return presets[name]
+
+@lru_cache(maxsize=1)
+def compile_lexicon(path: str):
+    from .lexicon import load_lexicon
+
+    return load_lexicon(Path(path).expanduser())
+
+def load_configured_lexicon():
+    """Compiles the lexicon file named in settings, if any, once per process."""
+    path = config_manager.get("lexicon")
+    if not path:
+        return None
+    try:
+        return compile_lexicon(path)
+    except Exception as e:
+        console.print(Panel(f"[red]Error:[/red] {str(e)}", title="Lexicon Error", border_style="red"))
+        raise typer.Exit(code=1)
+
+def build_tts(
+    creds: Optional[str] = None,
+    use_cache: Optional[bool] = None,
+    concurrency: Optional[int] = None,
+    preset: Optional[str] = None
+) -> "ChirpTTS":
+    """Builds a ChirpTTS wired with the configured cache, chunking, rate limits, retries, normalization,
+    lexicon and the named preset."""
+    from .normalize import TextNormalizer
+    from .pool import ClientPool
+    from .ratelimit import RateLimiter, RetryPolicy
+    from .tts import ChirpTTS
+
+    # An explicit --creds means one account; otherwise spread load over the configured projects
+    projects = None if creds else config_manager.get("projects")
+    target_use_cache = use_cache if use_cache is not None else config_manager.get("cache_enabled")
+    target_concurrency = concurrency or int(config_manager.get("concurrency"))
+    return ChirpTTS(
+        credentials_path=creds,
+        cache=get_cache() if target_use_cache else None,
+        max_chunk_bytes=int(config_manager.get("chunk_max_bytes")),
+        concurrency=target_concurrency,
+        audio_encoding=resolve_encoding(None),
+        sample_rate_hertz=int(config_manager.get("sample_rate_hertz")),
+        rate_limiter=RateLimiter(
+            requests_per_minute=float(config_manager.get("requests_per_minute")),
+            characters_per_minute=float(config_manager.get("characters_per_minute"))
+        ),
+        retry_policy=RetryPolicy(max_attempts=int(config_manager.get("max_retries")) + 1),
+        normalizer=TextNormalizer(config_manager.get("abbreviations") or {})
+        if config_manager.get("normalize_text") else None,
+        pool=ClientPool.from_config(projects) if projects else None,
+        lexicon=load_configured_lexicon(),
+        preset=resolve_preset(preset)
+    )
+
+def iter_input_lines(text: Optional[str], input_file: Optional[Path]):
+    """Yields input text incrementally from a file, stdin ('-') or the text argument."""
+    if input_file:
+        with open(input_file, "r") as f:
+            yield from (line for line in f if line.strip())
+    elif text == "-":
+        yield from (line for line in sys.stdin if line.strip())
+    else:
+        yield text
+
+# Inputs longer than this are streamed through synthesis instead of being read whole.
+INPUT_BLOCK_CHARS = 64 * 1024
+
+def read_input(input_file: Optional[Path]) -> Tuple[str, Optional[Iterator[str]]]:
+    """Reads a file or stdin (None), returning (text, None) when small, or (head, blocks) when large.
+
+    blocks yields the whole input in INPUT_BLOCK_CHARS pieces, head included,
+    so large inputs are never held in memory at once.
+    """
+    source = open(input_file, "r") if input_file else sys.stdin
+    head = source.read(INPUT_BLOCK_CHARS)
+    more = source.read(INPUT_BLOCK_CHARS) if len(head) == INPUT_BLOCK_CHARS else ""
+    if not more:
+        if input_file:
+            source.close()
+        return head.strip(), None
+
+    def blocks() -> Iterator[str]:
+        try:
+            yield head
+            yield more
+            while True:
+                block = source.read(INPUT_BLOCK_CHARS)
+                if not block:
+                    return
+                yield block
+        finally:
+            if input_file:
+                source.close()
+
+    return head, blocks()
+
+def print_timings(started: float):
+    """Prints the per-stage breakdown collected by the metrics registry during this command."""
+    import time
+    from rich.table import Table
+    from .metrics import REGISTRY
+
+    snapshot = REGISTRY.snapshot()
+    table = Table(title="Timings", show_header=True, header_style="bold cyan")
+    table.add_column("Stage", style="green")
+    table.add_column("Calls", style="yellow", justify="right")
+    table.add_column("Total ms", style="yellow", justify="right")
+    table.add_column("Mean ms", style="yellow", justify="right")
+    table.add_column("Max ms", style="yellow", justify="right")
+    for name, stage in sorted(snapshot["stages"].items(), key=lambda item: -item[1]["total_ms"]):
+        table.add_row(
+            name, str(stage["count"]), f"{stage['total_ms']:.1f}", f"{stage['mean_ms']:.1f}", f"{stage['max_ms']:.1f}"
+        )
+    table.add_row("[bold]total[/bold]", "", f"{(time.perf_counter() - started) * 1000:.1f}", "", "")
+    console.print(table)
+    if snapshot["counters"]:
+        console.print("  ".join(f"[dim]{name}[/dim]={value:g}" for name, value in sorted(snapshot["counters"].items())))
+
+def submit_long_audio(text: str, voice: str, output_path: str, project: Optional[str], creds: Optional[str]):
+    """Starts a long audio job writing to the configured bucket; `jobs wait` fetches the result later."""
+    import uuid
+
+    bucket = config_manager.get("long_audio_bucket")
+    if not bucket:
+        console.print(Panel(
+            "[bold red]No Cloud Storage location for long audio output.[/bold red]\n\n"
+            "Set [bold cyan]long_audio_bucket[/bold cyan] (e.g. gs://my-bucket/chirp) in settings.yaml.",
+            title="Configuration Error",
+            border_style="red"
+        ))
+        raise typer.Exit(code=1)
+    stem = os.path.splitext(os.path.basename(output_path))[0]
+    gcs_uri = f"{bucket.rstrip('/')}/{stem}-{uuid.uuid4().hex[:8]}.wav"
+    try:
+        job = get_long_audio_jobs(project, creds).submit(text, voice, gcs_uri, output_path)
+    except Exception as e:
+        console.print(Panel(f"[red]Error:[/red] {str(e)}", title="Failure", border_style="red"))
+        raise typer.Exit(code=1)
+    console.print(Panel(
+        f"[bold blue]Job:[/bold blue] {job.id}\n"
+        f"[bold green]Voice:[/bold green] {voice}\n"
+        f"[bold yellow]Destination:[/bold yellow] {gcs_uri}\n"
+        f"[bold yellow]Download to:[/bold yellow] {output_path}",
+        title="Long Audio Job Submitted",
+        border_style="blue"
+    ))
+    console.print(f"[dim]Track it with 'gcp-chirp jobs status {job.id}' or fetch it with 'gcp-chirp jobs wait {job.id}'.[/dim]")
+
+def check_wav_output(flag: str, encoding: Optional[str], output: Optional[str]):
+    """Rejects --encoding and --output values that contradict a mode that always writes LINEAR16 WAV."""
+    if encoding and encoding.upper() != "LINEAR16":
+        console.print(f"[red]Error: {flag} always produces WAV (LINEAR16); drop --encoding {encoding}.[/red]")
+        raise typer.Exit(code=1)
+    if output and os.path.splitext(output)[1].lower() != ".wav":
+        console.print(f"[red]Error: {flag} writes WAV audio; choose an --output path ending in .wav.[/red]")
+        raise typer.Exit(code=1)
+
+def stream_say(tts: "ChirpTTS", pieces, voice: str, output_path: str, play: bool):
+    """Writes streamed PCM to a WAV file and, optionally, straight into a player process."""
+    from .audio import WavWriter, pcm_format
+    from .playback import open_player
+    from .storage import atomic_open
+    from .tts import STREAMING_SAMPLE_RATE
+
+    player = open_player("LINEAR16", STREAMING_SAMPLE_RATE) if play else None
+    if play and player is None:
+        console.print("[yellow]⚠️  No PCM player found (install ffmpeg or sox); writing file only.[/yellow]")
+
+    console.print(Panel(
+        f"[bold green]Voice:[/bold green] {voice}\n"
+        f"[bold yellow]Output:[/bold yellow] {output_path}",
+        title="TTS Streaming",
+        border_style="blue"
+    ))
+
+    try:
+        with atomic_open(output_path, "wb", durable=False) as out:
+            writer = WavWriter(out, raw_format=pcm_format(STREAMING_SAMPLE_RATE))
+            for pcm in tts.stream(pieces, voice):
+                writer.write(pcm)
+                if player is not None:
+                    player.put(pcm)
+            writer.close()
+    except BaseException:
+        if player is not None:
+            player.stop()
+        raise
+    if player is not None:
+        with tts.metrics.stage("playback"):
+            player.close()
+
+    console.print(f"[bold green]✨ Success![/bold green] Audio saved to [underline]{output_path}[/underline]")
+
+def open_say_player(encoding: str, sample_rate: int):
+    """Starts a streaming player for say's output format, or returns None to play the file afterwards."""
+    from .playback import open_player
+    from .tts import DEFAULT_SAMPLE_RATE
+
+    return open_player(encoding, sample_rate or DEFAULT_SAMPLE_RATE)
+
+def finish_playback(player, output_path: str):
+    """Waits for streamed playback, or plays the finished file when nothing was streamed."""
+    from .playback import play_file
+
+    if player is not None:
+        if not player.segments:
+            # Cache hits never pass through synthesis, so feed the stored file instead
+            with open(output_path, "rb") as f:
+                player.put(f.read())
+        player.close()
+    elif not play_file(output_path):
+        console.print("[yellow]⚠️  No audio player found (install ffmpeg, sox or mpg123).[/yellow]")
+
 @app.command()
 def setup():
     """
@@ -125,6 +441,8 @@ def config(
     Configure settings interactively.
     """
     if show:
+        from rich.table import Table
+
         table = Table(title="Current Configuration", show_header=True, header_style="bold cyan")
         table.add_column("Setting", style="green")
         table.add_column("Value", style="yellow")
@@ -194,77 +512,165 @@ def uninstall():
 @app.command()
 def list(
     lang: str = typer.Option(None, "--lang", help="Language code (e.g., en-US, es-ES)"),
+    gender: Optional[str] = typer.Option(None, "--gender", help="Filter by gender (MALE, FEMALE, NEUTRAL)"),
+    family: str = typer.Option("Chirp3-HD", "--family", help="Voice family (e.g., Chirp3-HD, Neural2)"),
+    refresh: bool = typer.Option(False, "--refresh", help="Re-fetch the voice catalog from the API"),
     project: str = typer.Option(None, "--project", help="GCP Project ID override")
 ):
     """
-    List available Chirp 3 HD voices.
+    List available Chirp 3 HD voices from the local voice catalog.
     """
-    validate_project_id(project)
+    from rich.table import Table
+
     target_lang = lang or config_manager.get("default_language")
-    try:
-        tts = ChirpTTS()
-        with console.status(f"[bold green]Fetching voices for {target_lang}..."):
-            voices = tts.list_voices(target_lang)
-        
-        if not voices:
-            console.print(f"[yellow]No Chirp 3 HD voices found for language: {target_lang}[/yellow]")
-            return
+    catalog = get_voice_catalog()
+    if refresh or catalog.is_stale:
+        # Outside the handler below: typer.Exit is an Exception too, and must not be reported as an API failure
+        validate_project_id(project)
+        try:
+            refresh_voice_catalog(catalog)
+        except Exception as e:
+            if not len(catalog):
+                console.print(Panel(f"[red]Error:[/red] {str(e)}", title="Failure", border_style="red"))
+                raise typer.Exit(code=1)
+            # Offline or API failure: a stale catalog is still better than nothing.
+            console.print(f"[yellow]⚠️  Could not refresh the voice catalog; using cached copy. ({e})[/yellow]")
 
-        table = Table(title=f"Chirp 3 HD Voices ({lang})", show_header=True, header_style="bold magenta")
-        table.add_column("Voice Name", style="cyan")
-        
-        for voice in voices:
-            table.add_row(voice)
-        
-        console.print(table)
-    except Exception as e:
-        console.print(Panel(f"[red]Error:[/red] {str(e)}", title="Failure", border_style="red"))
+    voices = catalog.find(language=target_lang, gender=gender, family=family)
+    if not voices:
+        console.print(f"[yellow]No {family} voices found for language: {target_lang}[/yellow]")
+        return
+
+    table = Table(title=f"{family} Voices ({target_lang})", show_header=True, header_style="bold magenta")
+    table.add_column("Voice Name", style="cyan")
+    table.add_column("Gender", style="green")
+    
+    for voice in voices:
+        table.add_row(voice.name, voice.gender)
+    
+    console.print(table)
 
 @app.command()
 def say(
-    text: Optional[str] = typer.Argument(None, help="Text to synthesize"),
+    ctx: typer.Context,
+    text: Optional[str] = typer.Argument(None, help="Text to synthesize ('-' reads stdin)"),
     input_file: Optional[Path] = typer.Option(None, "--file", "-f", help="Read text from file"),
     voice: str = typer.Option(None, "--voice", help="Voice name"),
-    output: str = typer.Option(None, "--output", help="Output audio file path"),
+    output: str = typer.Option(None, "--output", help="Output audio file path ('-' writes to stdout)"),
     project: str = typer.Option(None, "--project", help="GCP Project ID override"),
     auto_play: Optional[bool] = typer.Option(None, "--play/--no-play", help="Override auto-play setting"),
+    encoding: Optional[str] = typer.Option(None, "--encoding", "-e", help="Audio encoding: MP3, LINEAR16, OGG_OPUS, MULAW, ALAW"),
+    sample_rate: Optional[int] = typer.Option(None, "--sample-rate", min=0, help="Output sample rate in Hz (0 = voice default)"),
+    use_cache: Optional[bool] = typer.Option(None, "--cache/--no-cache", help="Override the synthesis cache setting"),
+    concurrency: Optional[int] = typer.Option(None, "--concurrency", "-j", min=1, help="Parallel requests for long inputs"),
+    stream: bool = typer.Option(False, "--stream", help="Stream PCM audio as it is synthesized (writes WAV)"),
+    long: bool = typer.Option(False, "--long", help="Submit a Long Audio Synthesis job and return immediately (WAV via Cloud Storage)"),
+    use_daemon: bool = typer.Option(True, "--daemon/--no-daemon", help="Use a running 'gcp-chirp serve' daemon if available"),
+    timings: bool = typer.Option(False, "--timings", help="Print a per-stage timing breakdown when done"),
+    preset: Optional[str] = typer.Option(None, "--preset", help="Named speaking rate/pitch/gain preset from settings.yaml"),
     creds: str = typer.Option(None, help="Path to GCP Service Account JSON")
 ):
     """
     Synthesize speech using Chirp 3 HD.
     """
+    to_stdout = output == "-"
+    # Keep stdout clean for the audio bytes
+    console.stderr = to_stdout
+    if timings:
+        import time
+        # Runs on every exit path, so failed runs still show where the time went
+        ctx.call_on_close(partial(print_timings, time.perf_counter()))
+
     # Validate input
     if not text and not input_file:
         console.print("[red]Error: Please provide either a text argument or a --file path.[/red]")
         raise typer.Exit(code=1)
     
-    if input_file:
-        if not input_file.exists():
-            console.print(f"[red]Error: File not found: {input_file}[/red]")
-            raise typer.Exit(code=1)
-        with open(input_file, "r") as f:
-            final_text = f.read().strip()
+    if input_file and not input_file.exists():
+        console.print(f"[red]Error: File not found: {input_file}[/red]")
+        raise typer.Exit(code=1)
+
+    # Set for inputs too large to hold in memory; synthesized chunk by chunk as they are read
+    large_input = None
+    if stream:
+        final_text = None
+    elif input_file or text == "-":
+        final_text, large_input = read_input(input_file)
+        if long and large_input is not None:
+            # The Long Audio API takes the whole text in one request anyway
+            final_text, large_input = "".join(large_input).strip(), None
     else:
         final_text = text
 
-    if not final_text:
+    if not stream and not final_text.strip():
         console.print("[red]Error: Input text is empty.[/red]")
         raise typer.Exit(code=1)
+    if stream or long:
+        check_wav_output("--stream" if stream else "--long", encoding, output)
 
     validate_project_id(project)
     target_voice = voice or config_manager.get("default_voice")
+    check_voice(target_voice)
     target_auto_play = auto_play if auto_play is not None else config_manager.get("auto_play")
+    target_encoding = resolve_encoding(encoding)
+    target_sample_rate = sample_rate if sample_rate is not None else int(config_manager.get("sample_rate_hertz"))
+    # Checked here, since build_tts() runs inside the failure handlers below
+    resolve_preset(preset)
+    load_configured_lexicon()
     # Determine output path
     if output:
         output_path = output
     else:
         from datetime import datetime
+        from .audio import ENCODING_EXTENSIONS
+
         name_template = config_manager.get("output_template").replace("{timestamp}", datetime.now().strftime("%Y%m%d_%H%M%S"))
         output_path = os.path.join(config_manager.get("output_dir"), name_template)
+        output_path = os.path.splitext(output_path)[0] + (".wav" if stream or long else ENCODING_EXTENSIONS[target_encoding])
+
+    if long:
+        submit_long_audio(final_text, target_voice, output_path, project, creds)
+        return
+
+    if stream:
+        try:
+            stream_say(build_tts(creds, use_cache, concurrency, preset), iter_input_lines(text, input_file), target_voice, output_path, target_auto_play)
+        except Exception as e:
+            console.print(Panel(f"[red]Error:[/red] {str(e)}", title="Failure", border_style="red"))
+            raise typer.Exit(code=1)
+        return
+
+    if to_stdout:
+        try:
+            tts = build_tts(creds, use_cache, concurrency, preset)
+            if large_input is not None:
+                tts.synthesize_chunks_to(
+                    large_input, sys.stdout.buffer, target_voice,
+                    audio_encoding=target_encoding, sample_rate_hertz=target_sample_rate
+                )
+            else:
+                tts.synthesize_to(
+                    final_text, sys.stdout.buffer, target_voice,
+                    audio_encoding=target_encoding, sample_rate_hertz=target_sample_rate
+                )
+        except Exception as e:
+            console.print(Panel(f"[red]Error:[/red] {str(e)}", title="Failure", border_style="red"))
+            raise typer.Exit(code=1)
+        return
 
     try:
-        tts = ChirpTTS(credentials_path=creds)
-        
+        from rich.progress import Progress, SpinnerColumn, TextColumn
+        from .metrics import REGISTRY
+        from .server import find_daemon
+
+        # A warm daemon shares the same synthesize() signature; explicit credentials, presets and large inputs bypass it.
+        bypass_daemon = creds or preset or large_input is not None
+        daemon = find_daemon(config_manager.config_dir) if use_daemon and not bypass_daemon else None
+        tts = daemon or build_tts(creds, use_cache, concurrency, preset)
+        # Plays chunks as they are synthesized; the daemon only returns whole files
+        player = open_say_player(target_encoding, target_sample_rate) if target_auto_play and not daemon else None
+        segment_options = {"on_segment": player.put} if player is not None else {}
+
         console.print(Panel(
             f"[bold blue]Synthesizing:[/bold blue] {final_text[:50]}{'...' if len(final_text) > 50 else ''}\n"
             f"[bold green]Voice:[/bold green] {target_voice}\n"
@@ -277,20 +683,520 @@ def say(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             transient=True,
-        ) as progress:
+        ) as progress, REGISTRY.stage("daemon_request" if daemon else "synthesize"):
             progress.add_task(description="Generating audio...", total=None)
-            final_output = tts.synthesize(final_text, target_voice, output_path)
+            try:
+                if large_input is not None:
+                    final_output = tts.synthesize_chunks(
+                        large_input, target_voice, output_path,
+                        audio_encoding=target_encoding, sample_rate_hertz=target_sample_rate, **segment_options
+                    )
+                else:
+                    final_output = tts.synthesize(
+                        final_text, target_voice, output_path,
+                        audio_encoding=target_encoding, sample_rate_hertz=target_sample_rate, **segment_options
+                    )
+            except BaseException:
+                # Includes Ctrl-C: silence the player rather than letting queued audio run on
+                if player is not None:
+                    player.stop()
+                raise
 
         console.print(f"[bold green]✨ Success![/bold green] Audio saved to [underline]{final_output}[/underline]")
-        
+
         if target_auto_play:
             console.print("[dim]Playing audio...[/dim]")
-            if os.uname().sysname == "Darwin":
-                os.system(f"afplay '{final_output}'")
-            else:
-                os.system(f"play '{final_output}'") # Common on Linux with sox
+            with REGISTRY.stage("playback"):
+                finish_playback(player, final_output)
+    except Exception as e:
+        console.print(Panel(f"[red]Error:[/red] {str(e)}", title="Failure", border_style="red"))
+
+@app.command()
+def serve(
+    host: str = typer.Option("127.0.0.1", "--host", help="Interface to bind"),
+    port: int = typer.Option(8765, "--port", help="TCP port to listen on"),
+    socket_path: Optional[str] = typer.Option(None, "--socket", help="Listen on a Unix socket instead of TCP"),
+    project: str = typer.Option(None, "--project", help="GCP Project ID override"),
+    concurrency: Optional[int] = typer.Option(None, "--concurrency", "-j", min=1, help="Parallel requests for long inputs"),
+    preset: Optional[str] = typer.Option(None, "--preset", help="Named speaking rate/pitch/gain preset from settings.yaml"),
+    creds: str = typer.Option(None, help="Path to GCP Service Account JSON")
+):
+    """
+    Run a local daemon that keeps a warm TTS client for fast synthesis.
+    """
+    from .server import create_server, server_endpoint, write_daemon_state
+
+    validate_project_id(project)
+    tts = build_tts(creds, concurrency=concurrency, preset=preset)
+    with console.status("[bold blue]Connecting to Text-to-Speech..."):
+        # Resolve credentials and open the channel now rather than on the first request.
+        tts.client
+
+    server = create_server(
+        tts,
+        default_voice=config_manager.get("default_voice"),
+        default_language=config_manager.get("default_language"),
+        host=host,
+        port=port,
+        socket_path=socket_path,
+    )
+    endpoint = server_endpoint(server)
+    state_file = write_daemon_state(config_manager.config_dir, endpoint)
+    location = endpoint.get("socket") or f"http://{endpoint['host']}:{endpoint['port']}"
+    console.print(Panel(
+        f"[bold green]Listening on[/bold green] {location}\n"
+        "[dim]Endpoints: POST /synthesize, GET /voices?lang=, GET /health. Press Ctrl-C to stop.[/dim]",
+        title="gcp-chirp daemon",
+        border_style="green"
+    ))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if state_file.exists():
+            state_file.unlink()
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
+        console.print("[dim]Daemon stopped.[/dim]")
+
+@app.command()
+def batch(
+    manifest: Path = typer.Argument(..., help="CSV or JSONL manifest with id, text, voice and output columns"),
+    results: Optional[Path] = typer.Option(None, "--results", help="Per-row results file (default: <manifest>.results.jsonl)"),
+    output_dir: Path = typer.Option(Path("."), "--output-dir", help="Base directory for relative output paths"),
+    voice: str = typer.Option(None, "--voice", help="Voice for rows that do not set one"),
+    project: str = typer.Option(None, "--project", help="GCP Project ID override"),
+    concurrency: Optional[int] = typer.Option(None, "--concurrency", "-j", min=1, help="Rows synthesized in parallel"),
+    use_cache: Optional[bool] = typer.Option(None, "--cache/--no-cache", help="Override the synthesis cache setting"),
+    pack: bool = typer.Option(False, "--pack", help="Pack short rows into shared SSML requests, split by marks"),
+    dedupe: bool = typer.Option(False, "--dedupe", help="Synthesize sentences repeated across rows only once"),
+    preset: Optional[str] = typer.Option(None, "--preset", help="Named speaking rate/pitch/gain preset from settings.yaml"),
+    creds: str = typer.Option(None, help="Path to GCP Service Account JSON")
+):
+    """
+    Synthesize every row of a manifest, resuming from a previous results file.
+    """
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    from rich.table import Table
+    from .batch import run_batch
+
+    if not manifest.exists():
+        console.print(f"[red]Error: File not found: {manifest}[/red]")
+        raise typer.Exit(code=1)
+
+    if pack and dedupe:
+        console.print("[red]Error: --pack and --dedupe cannot be combined.[/red]")
+        raise typer.Exit(code=1)
+
+    validate_project_id(project)
+    results_file = results or manifest.with_name(f"{manifest.name}.results.jsonl")
+    target_concurrency = concurrency or int(config_manager.get("concurrency"))
+    tts = build_tts(creds, use_cache, target_concurrency, preset)
+    # Rows are the unit of parallelism here; chunks of a long row go one at a time
+    tts.concurrency = 1
+
+    console.print(Panel(
+        f"[bold blue]Manifest:[/bold blue] {manifest}\n"
+        f"[bold yellow]Results:[/bold yellow] {results_file}",
+        title="Batch Synthesis",
+        border_style="blue"
+    ))
+
+    try:
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            TextColumn("{task.completed} rows"),
+            transient=True,
+        ) as progress:
+            task = progress.add_task(description="Synthesizing...", total=None)
+            summary = run_batch(
+                tts,
+                manifest,
+                results_file,
+                default_voice=voice or config_manager.get("default_voice"),
+                output_dir=output_dir,
+                concurrency=target_concurrency,
+                on_result=lambda result: progress.advance(task),
+                pack=pack,
+                dedupe=dedupe,
+            )
+    except Exception as e:
+        console.print(Panel(f"[red]Error:[/red] {str(e)}", title="Failure", border_style="red"))
+        raise typer.Exit(code=1)
+
+    characters_saved = summary.pop("characters_saved", None)
+    table = Table(title="Batch Summary", show_header=True, header_style="bold cyan")
+    table.add_column("Status", style="green")
+    table.add_column("Rows", style="yellow")
+    for status, count in summary.items():
+        table.add_row(status, str(count))
+    console.print(table)
+    if characters_saved is not None:
+        console.print(f"[bold green]Characters saved by deduplication:[/bold green] {characters_saved}")
+    if summary["error"]:
+        raise typer.Exit(code=1)
+
+@app.command()
+def render(
+    script_file: Path = typer.Argument(..., help="YAML script with a voices mapping and speaker lines"),
+    output: str = typer.Option(None, "--output", help="Output audio file (default: the script's output, or <script> + extension)"),
+    pause_ms: Optional[int] = typer.Option(None, "--pause-ms", min=0, help="Silence between lines (overrides the script's pause_ms)"),
+    encoding: Optional[str] = typer.Option(None, "--encoding", "-e", help="Audio encoding: MP3, LINEAR16, OGG_OPUS, MULAW, ALAW"),
+    sample_rate: Optional[int] = typer.Option(None, "--sample-rate", min=0, help="Output sample rate in Hz (0 = voice default)"),
+    project: str = typer.Option(None, "--project", help="GCP Project ID override"),
+    concurrency: Optional[int] = typer.Option(None, "--concurrency", "-j", min=1, help="Lines synthesized in parallel"),
+    use_cache: Optional[bool] = typer.Option(None, "--cache/--no-cache", help="Override the synthesis cache setting"),
+    preset: Optional[str] = typer.Option(None, "--preset", help="Named speaking rate/pitch/gain preset from settings.yaml"),
+    creds: str = typer.Option(None, help="Path to GCP Service Account JSON")
+):
+    """
+    Render a multi-voice dialogue script into a single audio file.
+    """
+    from .audio import ENCODING_EXTENSIONS
+    from .render import load_script, render_script
+
+    if not script_file.exists():
+        console.print(f"[red]Error: File not found: {script_file}[/red]")
+        raise typer.Exit(code=1)
+    try:
+        script = load_script(script_file, pause_ms)
+    except Exception as e:
+        console.print(Panel(f"[red]Error:[/red] {str(e)}", title="Script Error", border_style="red"))
+        raise typer.Exit(code=1)
+
+    validate_project_id(project)
+    for voice in dict.fromkeys(line.voice for line in script.lines):
+        check_voice(voice)
+    target_encoding = resolve_encoding(encoding)
+    target_sample_rate = sample_rate if sample_rate is not None else int(config_manager.get("sample_rate_hertz"))
+    output_path = output or script.output or str(script_file.with_suffix(ENCODING_EXTENSIONS[target_encoding]))
+    target_concurrency = concurrency or int(config_manager.get("concurrency"))
+    tts = build_tts(creds, use_cache, target_concurrency, preset)
+    # Lines are the unit of parallelism; chunks of a long line go one at a time
+    tts.concurrency = 1
+
+    console.print(Panel(
+        f"[bold blue]Script:[/bold blue] {script_file} ({len(script.lines)} lines)\n"
+        f"[bold yellow]Output:[/bold yellow] {output_path}",
+        title="Dialogue Rendering",
+        border_style="blue"
+    ))
+    try:
+        with console.status("[bold blue]Synthesizing lines..."):
+            summary = render_script(
+                tts, script, output_path, target_concurrency,
+                audio_encoding=target_encoding, sample_rate_hertz=target_sample_rate
+            )
+    except Exception as e:
+        console.print(Panel(f"[red]Error:[/red] {str(e)}", title="Failure", border_style="red"))
+        raise typer.Exit(code=1)
+
+    console.print(
+        f"[bold green]✨ Success![/bold green] {summary['lines']} lines from {summary['synthesized']} syntheses "
+        f"({summary['characters_saved']} characters saved) in [underline]{output_path}[/underline]"
+    )
+
+@app.command()
+def watch(
+    directory: Path = typer.Argument(..., help="Directory to watch for text files"),
+    pattern: List[str] = typer.Option(["*.txt"], "--pattern", "-p", help="Filename glob to synthesize (repeatable)"),
+    voice: str = typer.Option(None, "--voice", help="Voice name"),
+    encoding: Optional[str] = typer.Option(None, "--encoding", "-e", help="Audio encoding: MP3, LINEAR16, OGG_OPUS, MULAW, ALAW"),
+    project: str = typer.Option(None, "--project", help="GCP Project ID override"),
+    concurrency: Optional[int] = typer.Option(None, "--concurrency", "-j", min=1, help="Files synthesized in parallel"),
+    use_cache: Optional[bool] = typer.Option(None, "--cache/--no-cache", help="Override the synthesis cache setting"),
+    state: Optional[Path] = typer.Option(None, "--state", help="State file of processed content hashes (default: <dir>/.gcp-chirp-watch.json)"),
+    poll: bool = typer.Option(False, "--poll", help="Poll the directory instead of using inotify"),
+    interval: float = typer.Option(2.0, "--interval", min=0.1, help="Seconds between polls"),
+    once: bool = typer.Option(False, "--once", help="Process current files and exit"),
+    preset: Optional[str] = typer.Option(None, "--preset", help="Named speaking rate/pitch/gain preset from settings.yaml"),
+    metrics_port: Optional[int] = typer.Option(None, "--metrics-port", min=0, max=65535, help="Serve Prometheus metrics on 127.0.0.1:PORT/metrics"),
+    creds: str = typer.Option(None, help="Path to GCP Service Account JSON")
+):
+    """
+    Synthesize text files dropped into a directory into audio next to them.
+    """
+    from .watch import WATCH_STATE, FolderWatcher, WatchState
+
+    if not directory.is_dir():
+        console.print(f"[red]Error: Not a directory: {directory}[/red]")
+        raise typer.Exit(code=1)
+
+    validate_project_id(project)
+    target_voice = voice or config_manager.get("default_voice")
+    check_voice(target_voice)
+    target_concurrency = concurrency or int(config_manager.get("concurrency"))
+    tts = build_tts(creds, use_cache, target_concurrency, preset)
+    tts.audio_encoding = resolve_encoding(encoding)
+    # Files are the unit of parallelism; chunks of a long file go one at a time
+    tts.concurrency = 1
+
+    def report(result):
+        name = os.path.basename(result["file"])
+        tts.metrics.count(f"watch_files_{result['status']}")
+        if result["status"] == "ok":
+            console.print(f"[green]✔[/green] {name} → {result['output']} [dim]({result['latency_ms']} ms)[/dim]")
+        elif result["status"] == "error":
+            console.print(f"[red]✘[/red] {name}: {result['error']}")
+
+    watcher = FolderWatcher(
+        tts,
+        directory,
+        target_voice,
+        state=WatchState(state or directory / WATCH_STATE),
+        patterns=pattern,
+        concurrency=target_concurrency,
+        on_result=report,
+    )
+    metrics_server = None
+    if metrics_port is not None:
+        from .server import start_metrics_server
+
+        try:
+            metrics_server = start_metrics_server(tts.metrics, port=metrics_port)
+        except OSError as e:
+            console.print(f"[red]Error: Cannot serve metrics on port {metrics_port}: {e}[/red]")
+            raise typer.Exit(code=1)
+        host, bound_port = metrics_server.server_address[:2]
+        console.print(f"[dim]Metrics at http://{host}:{bound_port}/metrics[/dim]")
+    if not once:
+        console.print(f"[bold blue]Watching[/bold blue] {directory} for {', '.join(pattern)} [dim](Ctrl-C to stop)[/dim]")
+    try:
+        watcher.run(once=once, poll=poll, interval=interval)
+    except KeyboardInterrupt:
+        console.print("[dim]Stopped.[/dim]")
+    except Exception as e:
+        console.print(Panel(f"[red]Error:[/red] {str(e)}", title="Failure", border_style="red"))
+        raise typer.Exit(code=1)
+    finally:
+        if metrics_server is not None:
+            metrics_server.shutdown()
+            metrics_server.server_close()
+
+@app.command()
+def bench(
+    requests: int = typer.Option(50, "--requests", "-n", min=1, help="Requests per scenario"),
+    concurrency: int = typer.Option(4, "--concurrency", "-j", min=1, help="Parallel requests"),
+    latency_ms: float = typer.Option(50.0, "--latency-ms", min=0, help="Simulated server latency"),
+    jitter_ms: float = typer.Option(10.0, "--jitter-ms", min=0, help="Random +/- latency jitter"),
+    error_rate: float = typer.Option(0.0, "--error-rate", min=0, max=1, help="Fraction of RPCs failing with UNAVAILABLE"),
+    payload_bytes: int = typer.Option(16000, "--payload-bytes", min=1, help="Audio bytes per response"),
+    scenarios: str = typer.Option("single,batch,chunked,streaming", "--scenarios", help="Comma-separated scenarios to run"),
+    output: Optional[Path] = typer.Option(None, "--output", "-o", help="Write the JSON report to this file ('-' for stdout)")
+):
+    """
+    Benchmark the synthesis paths against a local fake TTS server (no quota used).
+    """
+    import json
+    from rich.table import Table
+    from .bench import BenchConfig, run_benchmarks
+
+    config = BenchConfig(
+        requests=requests,
+        concurrency=concurrency,
+        latency_ms=latency_ms,
+        jitter_ms=jitter_ms,
+        error_rate=error_rate,
+        payload_bytes=payload_bytes,
+    )
+    try:
+        report = run_benchmarks(config, [name.strip() for name in scenarios.split(",") if name.strip()])
     except Exception as e:
         console.print(Panel(f"[red]Error:[/red] {str(e)}", title="Failure", border_style="red"))
+        raise typer.Exit(code=1)
+
+    if output is not None and str(output) == "-":
+        sys.stdout.write(json.dumps(report, indent=2) + "\n")
+        return
+    if output is not None:
+        output.write_text(json.dumps(report, indent=2) + "\n")
+
+    table = Table(title="Benchmark Results", show_header=True, header_style="bold cyan")
+    table.add_column("Scenario", style="green")
+    for column in ("Requests", "Errors", "p50 ms", "p95 ms", "p99 ms", "req/s", "chars/s", "Peak RSS MB"):
+        table.add_column(column, style="yellow", justify="right")
+    for name, result in report["scenarios"].items():
+        latency = result["latency_ms"]
+        table.add_row(
+            name,
+            str(result["requests"]),
+            str(result["errors"]),
+            f"{latency['p50']:.1f}",
+            f"{latency['p95']:.1f}",
+            f"{latency['p99']:.1f}",
+            f"{result['requests_per_sec']:.1f}",
+            f"{result['chars_per_sec']:.0f}",
+            f"{result['peak_rss_mb']:.1f}",
+        )
+    console.print(table)
+    if output is not None:
+        console.print(f"[dim]Report written to {output}[/dim]")
+
+@cache_app.command("stats")
+def cache_stats():
+    """
+    Show synthesis cache size and hit/miss counters.
+    """
+    from rich.table import Table
+
+    cache = get_cache()
+    stats = cache.stats()
+    table = Table(title="Synthesis Cache", show_header=True, header_style="bold cyan")
+    table.add_column("Metric", style="green")
+    table.add_column("Value", style="yellow")
+    table.add_row("Location", str(cache.cache_dir))
+    table.add_row("Entries", str(stats["entries"]))
+    table.add_row("Size", f"{stats['size_bytes'] / (1024 * 1024):.2f} MB / {stats['max_bytes'] / (1024 * 1024):.0f} MB")
+    table.add_row("Hits", str(stats["hits"]))
+    table.add_row("Misses", str(stats["misses"]))
+    table.add_row("Hit Rate", f"{stats['hit_rate']:.1%}")
+    console.print(table)
+
+@cache_app.command("prune")
+def cache_prune(
+    max_mb: Optional[int] = typer.Option(None, "--max-mb", help="Target size in MB (defaults to cache_max_mb)")
+):
+    """
+    Evict least recently used entries until the cache fits its size budget.
+    """
+    removed, freed = get_cache().prune(None if max_mb is None else max_mb * 1024 * 1024)
+    console.print(f"[bold green]✨ Pruned {removed} entries ({freed / (1024 * 1024):.2f} MB freed).[/bold green]")
+
+@cache_app.command("clear")
+def cache_clear(
+    yes: bool = typer.Option(False, "--yes", "-y", help="Skip confirmation")
+):
+    """
+    Remove every cached audio file.
+    """
+    if yes or typer.confirm("Are you sure you want to clear the synthesis cache?"):
+        get_cache().clear()
+        console.print("[bold green]✨ Synthesis cache cleared.[/bold green]")
+
+def jobs_table(jobs) -> "Table":
+    import time
+    from rich.table import Table
+
+    table = Table(title="Long Audio Jobs", show_header=True, header_style="bold cyan")
+    table.add_column("ID", style="cyan", justify="right")
+    table.add_column("Status", style="green")
+    table.add_column("Progress", style="yellow", justify="right")
+    table.add_column("Chars", justify="right")
+    table.add_column("Age", justify="right")
+    table.add_column("Output")
+    now = time.time()
+    for job in jobs:
+        status = f"[red]{job.status}[/red]" if job.error else job.status
+        age_minutes = int((now - job.created_at) // 60)
+        table.add_row(
+            str(job.id), status, f"{job.progress:.0f}%", str(job.characters),
+            f"{age_minutes // 60}h{age_minutes % 60:02d}m", job.error or job.output or job.gcs_uri
+        )
+    return table
+
+@jobs_app.command("list")
+def jobs_list(
+    status: Optional[str] = typer.Option(None, "--status", help="Only show jobs in this state (running, succeeded, failed, downloaded)"),
+    project: str = typer.Option(None, "--project", help="GCP Project ID override"),
+    creds: str = typer.Option(None, help="Path to GCP Service Account JSON (the one the job was submitted with)")
+):
+    """
+    Show recorded jobs, refreshing those that are due for a poll.
+    """
+    manager = get_long_audio_jobs(project, creds)
+    try:
+        jobs = manager.refresh_due()
+    except Exception as e:
+        console.print(f"[yellow]⚠️  Could not refresh job state: {e}[/yellow]")
+        jobs = manager.store.list()
+    jobs = [job for job in jobs if status is None or job.status == status]
+    if not jobs:
+        console.print("[yellow]No long audio jobs recorded.[/yellow]")
+        return
+    console.print(jobs_table(jobs))
+
+@jobs_app.command("status")
+def jobs_status(
+    job_id: int = typer.Argument(..., help="Job ID shown by 'say --long'"),
+    project: str = typer.Option(None, "--project", help="GCP Project ID override"),
+    creds: str = typer.Option(None, help="Path to GCP Service Account JSON (the one the job was submitted with)")
+):
+    """
+    Fetch the current state of one job.
+    """
+    manager = get_long_audio_jobs(project, creds)
+    job = manager.store.get(job_id)
+    if job is None:
+        console.print(f"[red]Error: Unknown job: {job_id}[/red]")
+        raise typer.Exit(code=1)
+    try:
+        job = manager.refresh(job)
+    except Exception as e:
+        console.print(Panel(f"[red]Error:[/red] {str(e)}", title="Failure", border_style="red"))
+        raise typer.Exit(code=1)
+    console.print(jobs_table([job]))
+
+@jobs_app.command("wait")
+def jobs_wait(
+    job_ids: Optional[List[int]] = typer.Argument(None, help="Jobs to wait for (default: every running job)"),
+    timeout: Optional[float] = typer.Option(None, "--timeout", help="Give up after this many seconds"),
+    download: bool = typer.Option(True, "--download/--no-download", help="Download finished jobs"),
+    project: str = typer.Option(None, "--project", help="GCP Project ID override"),
+    creds: str = typer.Option(None, help="Path to GCP Service Account JSON (the one the job was submitted with)")
+):
+    """
+    Poll jobs with backoff until they finish, then download their audio.
+    """
+    manager = get_long_audio_jobs(project, creds)
+    ids = job_ids or [job.id for job in manager.store.list(status="running")]
+    if not ids:
+        console.print("[yellow]No running jobs to wait for.[/yellow]")
+        return
+    try:
+        jobs = manager.wait(ids, timeout=timeout)
+        if download:
+            for job in jobs:
+                if job.status == "succeeded":
+                    console.print(f"[bold green]✨ Job {job.id}[/bold green] saved to [underline]{manager.download(job.id)}[/underline]")
+            jobs = [manager.store.get(job.id) for job in jobs]
+    except Exception as e:
+        console.print(Panel(f"[red]Error:[/red] {str(e)}", title="Failure", border_style="red"))
+        raise typer.Exit(code=1)
+    console.print(jobs_table(jobs))
+    if any(job.status in ("failed", "running") for job in jobs):
+        raise typer.Exit(code=1)
+
+@jobs_app.command("download")
+def jobs_download(
+    job_id: int = typer.Argument(..., help="Job ID shown by 'say --long'"),
+    output: Optional[str] = typer.Option(None, "--output", help="Destination WAV file (default: the path given at submission)"),
+    project: str = typer.Option(None, "--project", help="GCP Project ID override"),
+    creds: str = typer.Option(None, help="Path to GCP Service Account JSON (the one the job was submitted with)")
+):
+    """
+    Download a finished job's audio from Cloud Storage.
+    """
+    check_wav_output("jobs download", None, output)
+    manager = get_long_audio_jobs(project, creds)
+    try:
+        job = manager.store.get(job_id)
+        if job is not None:
+            manager.refresh(job)
+        path = manager.download(job_id, output)
+    except Exception as e:
+        console.print(Panel(f"[red]Error:[/red] {str(e)}", title="Failure", border_style="red"))
+        raise typer.Exit(code=1)
+    console.print(f"[bold green]✨ Success![/bold green] Audio saved to [underline]{path}[/underline]")
+
+def __getattr__(name: str):
+    # Keeps `gcp_chirp.cli.ChirpTTS` importable without loading the Google client at startup.
+    if name == "ChirpTTS":
+        from .tts import ChirpTTS
+        return ChirpTTS
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == "__main__":
     app()
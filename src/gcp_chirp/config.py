@@ -1,7 +1,7 @@
 import os
-import yaml
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Set, Tuple
+from .storage import FileLock, atomic_open, lock_path
 
 # These are defaults, but the class can take customs
 CONFIG_DIR = Path.home() / ".gcp-chirp"
@@ -13,33 +13,110 @@ DEFAULT_CONFIG = {
     "default_language": "en-US",
     "output_dir": ".",
     "auto_play": False,
-    "output_template": "speech_{timestamp}.mp3"
+    "output_template": "speech_{timestamp}.mp3",
+    "audio_encoding": "MP3",
+    "sample_rate_hertz": 0,
+    "cache_enabled": True,
+    "cache_max_mb": 512,
+    "cache_link_outputs": False,
+    "chunk_max_bytes": 4800,
+    "concurrency": 4,
+    "requests_per_minute": 0,
+    "characters_per_minute": 0,
+    "max_retries": 5,
+    "voice_catalog_ttl_hours": 168,
+    "long_audio_bucket": "",
+    "long_audio_location": "us-central1",
+    "normalize_text": True,
+    "abbreviations": {},
+    "projects": [],
+    "lexicon": "",
+    "presets": {}
 }
 
+class ConfigError(Exception):
+    """The settings file exists but cannot be read or parsed."""
+
+
 class ConfigManager:
     def __init__(self, config_dir: Optional[Path] = None):
         self.config_dir = config_dir or (Path.home() / ".gcp-chirp")
         self.config_file = self.config_dir / "settings.yaml"
-        self._config: Dict[str, Any] = DEFAULT_CONFIG.copy()
-        self.load()
+        # Parsed on first access so commands that never read settings skip YAML entirely.
+        self._loaded: Optional[Dict[str, Any]] = None
+        # The file's (mtime_ns, size) and parsed content, so unchanged settings are never re-parsed
+        self._parsed: Optional[Tuple[Tuple[int, int], Dict[str, Any]]] = None
+        # Keys set since the last load; save() merges only these into the file
+        self._changed: Set[str] = set()
+        self._lock = FileLock(lock_path(self.config_file))
+
+    @property
+    def _config(self) -> Dict[str, Any]:
+        if self._loaded is None:
+            self.load()
+        return self._loaded
+
+    @_config.setter
+    def _config(self, value: Dict[str, Any]):
+        self._loaded = value
 
     def _ensure_config_dir(self):
         self.config_dir.mkdir(parents=True, exist_ok=True)
 
+    def _read_file(self) -> Dict[str, Any]:
+        """Returns the settings stored on disk, re-parsing only when the file changed."""
+        try:
+            stat = os.stat(self.config_file)
+        except FileNotFoundError:
+            return {}
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if self._parsed is not None and self._parsed[0] == signature:
+            return self._parsed[1]
+
+        import yaml
+
+        try:
+            with open(self.config_file, "r") as f:
+                file_config = yaml.safe_load(f) or {}
+        except (OSError, UnicodeDecodeError, yaml.YAMLError) as e:
+            raise ConfigError(f"Cannot read {self.config_file}: {e}") from e
+        if not isinstance(file_config, dict):
+            raise ConfigError(f"{self.config_file} must contain a mapping of settings")
+        self._parsed = (signature, file_config)
+        return file_config
+
     def load(self):
-        if self.config_file.exists():
-            try:
-                with open(self.config_file, "r") as f:
-                    file_config = yaml.safe_load(f)
-                    if file_config:
-                        self._config.update(file_config)
-            except Exception:
-                pass
+        """(Re)reads the settings file, discarding unsaved changes. Raises ConfigError if it is broken."""
+        config = DEFAULT_CONFIG.copy()
+        config.update(self._read_file())
+        self._loaded = config
+        self._changed.clear()
+
+    def ensure_loaded(self):
+        """Loads the settings unless already loaded, raising ConfigError now rather than mid-command."""
+        self._config
+
+    def _write(self, config: Dict[str, Any]):
+        import yaml
 
-    def save(self):
         self._ensure_config_dir()
-        with open(self.config_file, "w") as f:
-            yaml.safe_dump(self._config, f)
+        with atomic_open(self.config_file) as f:
+            yaml.safe_dump(config, f)
+        # What we just wrote needs no parsing to be read back
+        stat = os.stat(self.config_file)
+        self._parsed = ((stat.st_mtime_ns, stat.st_size), config)
+
+    def save(self):
+        """Merges the keys set on this manager into the settings file, atomically and under a file lock.
+
+        Settings saved meanwhile by other processes are kept rather than
+        overwritten with this manager's stale copy.
+        """
+        with self._lock:
+            config = dict(self._read_file())
+            config.update({key: self._config[key] for key in self._changed})
+            self._write(config)
+            self.load()
 
     def get(self, key: str, default: Any = None) -> Any:
         value = self._config.get(key)
@@ -52,11 +129,13 @@ class ConfigManager:
 
     def set(self, key: str, value: Any):
         self._config[key] = value
+        self._changed.add(key)
 
     def reset(self):
         """Resets the configuration to defaults."""
-        self._config = DEFAULT_CONFIG.copy()
-        self.save()
+        with self._lock:
+            self._write(DEFAULT_CONFIG.copy())
+            self.load()
 
     @property
     def all(self) -> Dict[str, Any]:
@@ -0,0 +1,210 @@
+import io
+import random
+import threading
+import time
+from concurrent import futures
+from typing import Iterator, NamedTuple, Tuple
+import grpc
+from google.cloud import texttospeech
+from google.cloud.texttospeech_v1.services.text_to_speech.transports import TextToSpeechGrpcTransport
+from google.cloud.texttospeech_v1.services.text_to_speech_long_audio_synthesize.transports import (
+    TextToSpeechLongAudioSynthesizeGrpcTransport,
+)
+from google.longrunning import operations_pb2
+from google.protobuf import any_pb2
+from google.rpc import status_pb2
+from .audio import create_writer, silent_mp3_frame
+
+SERVICE_NAME = "google.cloud.texttospeech.v1.TextToSpeech"
+LONG_AUDIO_SERVICE_NAME = "google.cloud.texttospeech.v1.TextToSpeechLongAudioSynthesize"
+OPERATIONS_SERVICE_NAME = "google.longrunning.Operations"
+
+# MPEG-2 Layer III, 32 kbps, 24 kHz, mono: 96-byte frames of 24 ms each.
+_MP3_FRAME = silent_mp3_frame(b"\xff\xf3\x44\xc4")
+
+
+class FakeServerConfig(NamedTuple):
+    latency_ms: float = 50.0
+    jitter_ms: float = 10.0
+    error_rate: float = 0.0
+    payload_bytes: int = 16000
+
+
+class FakeTextToSpeech:
+    """In-process stand-in for the Text-to-Speech service with configurable latency and failures."""
+
+    def __init__(self, config: FakeServerConfig = FakeServerConfig(), seed: int = 0):
+        self.config = config
+        self.requests = 0
+        self.long_audio = FakeLongAudio()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _delay_and_maybe_fail(self, context: grpc.ServicerContext):
+        with self._lock:
+            self.requests += 1
+            jitter = self._random.uniform(-self.config.jitter_ms, self.config.jitter_ms)
+            fail = self._random.random() < self.config.error_rate
+        time.sleep(max(0.0, self.config.latency_ms + jitter) / 1000)
+        if fail:
+            context.abort(grpc.StatusCode.UNAVAILABLE, "Injected failure from the fake TTS server")
+
+    def _audio(self, audio_config: texttospeech.AudioConfig) -> bytes:
+        size = self.config.payload_bytes
+        encoding = audio_config.audio_encoding
+        if encoding == texttospeech.AudioEncoding.MP3:
+            return _MP3_FRAME * max(1, size // len(_MP3_FRAME))
+        name = texttospeech.AudioEncoding(encoding).name
+        if name in ("LINEAR16", "MULAW", "ALAW"):
+            # Let WavWriter frame raw zero samples, so the header matches what real responses carry.
+            buffer = io.BytesIO()
+            writer = create_writer(name, buffer, audio_config.sample_rate_hertz or 24000)
+            writer.write(bytes(size - size % 2))
+            writer.close()
+            return buffer.getvalue()
+        return bytes(size)
+
+    def synthesize_speech(self, request: texttospeech.SynthesizeSpeechRequest, context) -> texttospeech.SynthesizeSpeechResponse:
+        self._delay_and_maybe_fail(context)
+        return texttospeech.SynthesizeSpeechResponse(audio_content=self._audio(request.audio_config))
+
+    def list_voices(self, request: texttospeech.ListVoicesRequest, context) -> texttospeech.ListVoicesResponse:
+        voices = [
+            texttospeech.Voice(
+                name=f"en-US-Chirp3-HD-{name}",
+                language_codes=["en-US"],
+                ssml_gender=gender,
+                natural_sample_rate_hertz=24000,
+            )
+            for name, gender in (
+                ("Aoede", texttospeech.SsmlVoiceGender.FEMALE),
+                ("Charon", texttospeech.SsmlVoiceGender.MALE),
+            )
+        ]
+        if request.language_code:
+            voices = [voice for voice in voices if request.language_code in voice.language_codes]
+        return texttospeech.ListVoicesResponse(voices=voices)
+
+    def streaming_synthesize(
+        self,
+        request_iterator: Iterator[texttospeech.StreamingSynthesizeRequest],
+        context
+    ) -> Iterator[texttospeech.StreamingSynthesizeResponse]:
+        for request in request_iterator:
+            if not request.input.text:
+                continue
+            self._delay_and_maybe_fail(context)
+            size = self.config.payload_bytes - self.config.payload_bytes % 2
+            yield texttospeech.StreamingSynthesizeResponse(audio_content=bytes(size))
+
+    def handler(self) -> grpc.GenericRpcHandler:
+        return grpc.method_handlers_generic_handler(SERVICE_NAME, {
+            "SynthesizeSpeech": grpc.unary_unary_rpc_method_handler(
+                self.synthesize_speech,
+                request_deserializer=texttospeech.SynthesizeSpeechRequest.deserialize,
+                response_serializer=texttospeech.SynthesizeSpeechResponse.serialize,
+            ),
+            "ListVoices": grpc.unary_unary_rpc_method_handler(
+                self.list_voices,
+                request_deserializer=texttospeech.ListVoicesRequest.deserialize,
+                response_serializer=texttospeech.ListVoicesResponse.serialize,
+            ),
+            "StreamingSynthesize": grpc.stream_stream_rpc_method_handler(
+                self.streaming_synthesize,
+                request_deserializer=texttospeech.StreamingSynthesizeRequest.deserialize,
+                response_serializer=texttospeech.StreamingSynthesizeResponse.serialize,
+            ),
+        })
+
+
+class FakeLongAudio:
+    """Stand-in for the Long Audio API and its operations service.
+
+    Each GetOperation advances a job by 100 / polls_to_complete percent. Inputs
+    containing "fail" finish with an error. Finished audio lands in `objects`,
+    keyed by its gs:// URI, standing in for Cloud Storage.
+    """
+
+    def __init__(self, polls_to_complete: int = 3):
+        self.polls_to_complete = polls_to_complete
+        self.operations = {}
+        self.objects = {}
+        self.get_calls = 0
+        self._lock = threading.Lock()
+
+    def synthesize_long_audio(self, request: texttospeech.SynthesizeLongAudioRequest, context) -> operations_pb2.Operation:
+        with self._lock:
+            name = f"{request.parent}/operations/{len(self.operations) + 1}"
+            self.operations[name] = {"request": request, "polls": 0}
+        return operations_pb2.Operation(name=name)
+
+    def get_operation(self, request: operations_pb2.GetOperationRequest, context) -> operations_pb2.Operation:
+        with self._lock:
+            self.get_calls += 1
+            state = self.operations.get(request.name)
+            if state is None:
+                context.abort(grpc.StatusCode.NOT_FOUND, f"Operation {request.name} not found")
+            state["polls"] += 1
+            done = state["polls"] >= self.polls_to_complete
+        synth_request = state["request"]
+        metadata = texttospeech.SynthesizeLongAudioMetadata(
+            progress_percentage=min(100.0, 100.0 * state["polls"] / self.polls_to_complete)
+        )
+        operation = operations_pb2.Operation(
+            name=request.name,
+            done=done,
+            metadata=any_pb2.Any(
+                type_url="type.googleapis.com/google.cloud.texttospeech.v1.SynthesizeLongAudioMetadata",
+                value=texttospeech.SynthesizeLongAudioMetadata.serialize(metadata),
+            ),
+        )
+        if done and "fail" in synth_request.input.text:
+            operation.error.CopyFrom(status_pb2.Status(code=3, message="Injected long audio failure"))
+        elif done:
+            self.objects.setdefault(synth_request.output_gcs_uri, b"RIFF" + synth_request.input.text.encode())
+            operation.response.CopyFrom(any_pb2.Any(
+                type_url="type.googleapis.com/google.cloud.texttospeech.v1.SynthesizeLongAudioResponse"
+            ))
+        return operation
+
+    def handlers(self):
+        return (
+            grpc.method_handlers_generic_handler(LONG_AUDIO_SERVICE_NAME, {
+                "SynthesizeLongAudio": grpc.unary_unary_rpc_method_handler(
+                    self.synthesize_long_audio,
+                    request_deserializer=texttospeech.SynthesizeLongAudioRequest.deserialize,
+                    response_serializer=operations_pb2.Operation.SerializeToString,
+                ),
+            }),
+            grpc.method_handlers_generic_handler(OPERATIONS_SERVICE_NAME, {
+                "GetOperation": grpc.unary_unary_rpc_method_handler(
+                    self.get_operation,
+                    request_deserializer=operations_pb2.GetOperationRequest.FromString,
+                    response_serializer=operations_pb2.Operation.SerializeToString,
+                ),
+            }),
+        )
+
+
+def start_fake_server(
+    config: FakeServerConfig = FakeServerConfig(),
+    max_workers: int = 64
+) -> Tuple[grpc.Server, FakeTextToSpeech, str]:
+    """Starts the fake service on a free localhost port. Returns (server, servicer, address)."""
+    servicer = FakeTextToSpeech(config)
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
+    server.add_generic_rpc_handlers((servicer.handler(), *servicer.long_audio.handlers()))
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+    return server, servicer, f"127.0.0.1:{port}"
+
+
+def fake_client(address: str) -> texttospeech.TextToSpeechClient:
+    """Builds a real TextToSpeechClient talking to the fake server over an insecure channel."""
+    transport = TextToSpeechGrpcTransport(channel=grpc.insecure_channel(address))
+    return texttospeech.TextToSpeechClient(transport=transport)
+
+
+def fake_long_audio_client(address: str) -> texttospeech.TextToSpeechLongAudioSynthesizeClient:
+    transport = TextToSpeechLongAudioSynthesizeGrpcTransport(channel=grpc.insecure_channel(address))
+    return texttospeech.TextToSpeechLongAudioSynthesizeClient(transport=transport)
@@ -0,0 +1,286 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterable, List, NamedTuple, Optional, Tuple
+from .storage import atomic_open
+
+JOBS_DB = "jobs.db"
+DEFAULT_LOCATION = "us-central1"
+# Poll intervals grow from the first to the last value, so hundreds of jobs cost few calls.
+INITIAL_POLL_SECONDS = 5.0
+MAX_POLL_SECONDS = 300.0
+
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+DOWNLOADED = "downloaded"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    operation TEXT NOT NULL UNIQUE,
+    voice TEXT NOT NULL,
+    characters INTEGER NOT NULL,
+    gcs_uri TEXT NOT NULL,
+    output TEXT,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    poll_interval REAL NOT NULL,
+    next_poll_at REAL NOT NULL
+)
+"""
+
+
+class Job(NamedTuple):
+    id: int
+    operation: str
+    voice: str
+    characters: int
+    gcs_uri: str
+    output: Optional[str]
+    status: str
+    progress: float
+    error: Optional[str]
+    created_at: float
+    updated_at: float
+    poll_interval: float
+    next_poll_at: float
+
+    @property
+    def done(self) -> bool:
+        return self.status != RUNNING
+
+
+class JobStore:
+    """SQLite record of submitted long-audio operations, so jobs outlive the CLI process."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # WAL lets a `jobs wait` in one shell and `say --long` in another share the file
+            self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+            self._conn.commit()
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def add(
+        self,
+        operation: str,
+        voice: str,
+        characters: int,
+        gcs_uri: str,
+        output: Optional[str],
+        next_poll_at: float
+    ) -> Job:
+        now = time.time()
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO jobs (operation, voice, characters, gcs_uri, output, status, created_at, updated_at,"
+                " poll_interval, next_poll_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (operation, voice, characters, gcs_uri, output, RUNNING, now, now, INITIAL_POLL_SECONDS, next_poll_at),
+            )
+        return self.get(cursor.lastrowid)
+
+    def get(self, job_id: int) -> Optional[Job]:
+        with self._lock:
+            row = self.conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job(*row) if row else None
+
+    def list(self, status: Optional[str] = None) -> List[Job]:
+        with self._lock:
+            if status:
+                rows = self.conn.execute("SELECT * FROM jobs WHERE status = ? ORDER BY id", (status,)).fetchall()
+            else:
+                rows = self.conn.execute("SELECT * FROM jobs ORDER BY id").fetchall()
+        return [Job(*row) for row in rows]
+
+    def update(self, job_id: int, **fields) -> Job:
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self.conn:
+            self.conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+        return self.get(job_id)
+
+
+def parse_gcs_uri(uri: str) -> Tuple[str, str]:
+    """Splits gs://bucket/path into (bucket, path)."""
+    if not uri.startswith("gs://") or "/" not in uri[5:]:
+        raise ValueError(f"Expected a gs://bucket/object URI, got: {uri}")
+    bucket, _, name = uri[5:].partition("/")
+    return bucket, name
+
+
+class LongAudioJobs:
+    """Submits, tracks and downloads Long Audio Synthesis operations.
+
+    Submission returns as soon as the operation exists; progress lives on the
+    server and in the JobStore, so jobs keep running across CLI restarts.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        project_id: str,
+        location: str = DEFAULT_LOCATION,
+        client=None,
+        storage_client=None,
+        credentials_path: Optional[str] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        self.store = store
+        self.clock = clock
+        self.project_id = project_id
+        self.location = location
+        self.credentials_path = credentials_path
+        self._client = client
+        self._storage_client = storage_client
+
+    @property
+    def client(self):
+        if self._client is None:
+            from google.cloud import texttospeech
+
+            if self.credentials_path:
+                self._client = texttospeech.TextToSpeechLongAudioSynthesizeClient.from_service_account_file(
+                    self.credentials_path
+                )
+            else:
+                self._client = texttospeech.TextToSpeechLongAudioSynthesizeClient()
+        return self._client
+
+    @property
+    def storage_client(self):
+        if self._storage_client is None:
+            try:
+                from google.cloud import storage
+            except ImportError:
+                raise Exception(
+                    "Downloading long audio results needs google-cloud-storage; install the long-audio extra: "
+                    "uv tool install 'gcp-chirp[long-audio]' (or pip install 'gcp-chirp[long-audio]')"
+                )
+            if self.credentials_path:
+                # Downloads use the same account the job was submitted and polled with
+                self._storage_client = storage.Client.from_service_account_json(
+                    self.credentials_path, project=self.project_id
+                )
+            else:
+                self._storage_client = storage.Client(project=self.project_id)
+        return self._storage_client
+
+    def submit(self, text: str, voice_name: str, gcs_uri: str, output: Optional[str] = None) -> Job:
+        """Starts a long audio operation writing LINEAR16 WAV to gcs_uri and records it."""
+        from google.cloud import texttospeech
+
+        parse_gcs_uri(gcs_uri)
+        request = texttospeech.SynthesizeLongAudioRequest(
+            parent=f"projects/{self.project_id}/locations/{self.location}",
+            input=texttospeech.SynthesisInput(text=text),
+            # The Long Audio API only produces LINEAR16
+            audio_config=texttospeech.AudioConfig(audio_encoding=texttospeech.AudioEncoding.LINEAR16),
+            output_gcs_uri=gcs_uri,
+            voice=texttospeech.VoiceSelectionParams(
+                language_code="-".join(voice_name.split("-")[:2]),
+                name=voice_name
+            ),
+        )
+        try:
+            operation = self.client.synthesize_long_audio(request=request)
+        except Exception as e:
+            raise Exception(f"Long audio submission failed: {e}") from e
+        return self.store.add(
+            operation.operation.name, voice_name, len(text), gcs_uri, output, self.clock() + INITIAL_POLL_SECONDS
+        )
+
+    def refresh(self, job: Job) -> Job:
+        """Fetches the operation's state once and records it, backing off the next poll."""
+        from google.cloud import texttospeech
+        from google.longrunning import operations_pb2
+
+        if job.done:
+            return job
+        operation = self.client.get_operation(operations_pb2.GetOperationRequest(name=job.operation))
+        if operation.done:
+            if operation.HasField("error"):
+                return self.store.update(job.id, status=FAILED, error=operation.error.message or "Operation failed")
+            return self.store.update(job.id, status=SUCCEEDED, progress=100.0)
+
+        progress = job.progress
+        if operation.metadata.value:
+            metadata = texttospeech.SynthesizeLongAudioMetadata.deserialize(operation.metadata.value)
+            progress = metadata.progress_percentage
+        interval = min(job.poll_interval * 2, MAX_POLL_SECONDS)
+        return self.store.update(
+            job.id, progress=progress, poll_interval=interval, next_poll_at=self.clock() + job.poll_interval
+        )
+
+    def refresh_due(self, jobs: Optional[Iterable[Job]] = None, force: bool = False) -> List[Job]:
+        """Refreshes running jobs whose next poll time has passed (or all of them with force)."""
+        now = self.clock()
+        return [
+            self.refresh(job) if not job.done and (force or job.next_poll_at <= now) else job
+            for job in (jobs if jobs is not None else self.store.list())
+        ]
+
+    def wait(
+        self,
+        job_ids: List[int],
+        timeout: Optional[float] = None,
+        on_update: Optional[Callable[[Job], None]] = None,
+        sleep: Callable[[float], None] = time.sleep
+    ) -> List[Job]:
+        """Polls until every job is done, sleeping until the earliest scheduled poll."""
+        deadline = None if timeout is None else self.clock() + timeout
+        jobs = [self._require(job_id) for job_id in job_ids]
+        # The first round reports current state right away; later rounds follow each job's backoff
+        force = True
+        while True:
+            jobs = self.refresh_due(jobs, force=force)
+            force = False
+            if on_update:
+                for job in jobs:
+                    on_update(job)
+            pending = [job for job in jobs if not job.done]
+            if not pending:
+                return jobs
+            now = self.clock()
+            if deadline is not None and now >= deadline:
+                return jobs
+            wake = min(job.next_poll_at for job in pending)
+            if deadline is not None:
+                wake = min(wake, deadline)
+            sleep(max(0.0, wake - now))
+
+    def download(self, job_id: int, output: Optional[str] = None) -> str:
+        """Copies a finished job's audio from Cloud Storage to output (or the path given at submission)."""
+        job = self._require(job_id)
+        if job.status not in (SUCCEEDED, DOWNLOADED):
+            raise Exception(f"Job {job.id} is {job.status}; only finished jobs can be downloaded")
+        target = output or job.output or f"long_{job.id}.wav"
+        bucket, name = parse_gcs_uri(job.gcs_uri)
+        blob = self.storage_client.bucket(bucket).blob(name)
+        with atomic_open(target, "wb") as out:
+            blob.download_to_file(out)
+        self.store.update(job.id, status=DOWNLOADED, output=target)
+        return target
+
+    def _require(self, job_id: int) -> Job:
+        job = self.store.get(job_id)
+        if job is None:
+            raise Exception(f"Unknown job: {job_id}")
+        return job
@@ -0,0 +1,203 @@
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from .normalize import collapse_whitespace
+
+# Alphabets accepted for phonetic entries, mapped to CustomPronunciationParams.PhoneticEncoding names
+PHONETIC_ALPHABETS = {
+    "ipa": "PHONETIC_ENCODING_IPA",
+    "x-sampa": "PHONETIC_ENCODING_X_SAMPA",
+}
+
+
+class LexiconEntry(NamedTuple):
+    phrase: str
+    # Replacement text, spoken instead of the phrase
+    say: Optional[str] = None
+    # Phonetic spelling in alphabet, sent to the API as a custom pronunciation
+    pronunciation: Optional[str] = None
+    alphabet: Optional[str] = None
+
+
+def _fold(text: str) -> str:
+    """Lowercases text without changing its length, so match offsets stay valid in the original."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # A few characters (e.g. "İ") lower to two code points; leave those as they are
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+def _is_word(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class Lexicon:
+    """Custom pronunciations for product names and jargon, matched case-insensitively as whole words.
+
+    Entries either replace the phrase with other text ("say") or keep it and
+    attach a phonetic spelling. All phrases are compiled once into an
+    Aho-Corasick automaton, so scanning a document is linear in its length
+    plus the number of matches, however many entries there are. Overlapping
+    matches resolve leftmost-longest, so "Cloud Run jobs" beats "Cloud Run".
+    """
+
+    def __init__(self, entries: Iterable[LexiconEntry]):
+        self.entries: List[LexiconEntry] = []
+        self.has_substitutions = False
+        self.has_pronunciations = False
+        # Trie transitions, failure links, the entry ending at each node and the nearest
+        # node on the failure chain that ends an entry (the "dictionary suffix link")
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Optional[LexiconEntry]] = [None]
+        self._next_output: List[int] = [0]
+
+        seen = set()
+        for entry in entries:
+            phrase = collapse_whitespace(entry.phrase)
+            key = _fold(phrase)
+            if not key:
+                raise ValueError("Lexicon phrases cannot be empty")
+            if key in seen:
+                raise ValueError(f"Lexicon phrase '{phrase}' is defined twice")
+            if (entry.say is None) == (entry.pronunciation is None):
+                raise ValueError(f"Lexicon entry '{phrase}' needs exactly one of 'say' or a phonetic spelling")
+            if entry.pronunciation is not None and entry.alphabet not in PHONETIC_ALPHABETS:
+                raise ValueError(f"Lexicon entry '{phrase}': alphabet must be one of {', '.join(PHONETIC_ALPHABETS)}")
+            seen.add(key)
+            entry = entry._replace(phrase=phrase)
+            self.entries.append(entry)
+            self.has_substitutions |= entry.say is not None
+            self.has_pronunciations |= entry.pronunciation is not None
+            self._insert(key, entry)
+        self._link()
+
+    def _insert(self, key: str, entry: LexiconEntry):
+        node = 0
+        for char in key:
+            child = self._goto[node].get(char)
+            if child is None:
+                child = len(self._goto)
+                self._goto[node][char] = child
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(None)
+                self._next_output.append(0)
+            node = child
+        self._output[node] = entry
+
+    def _link(self):
+        # Breadth-first, so every failure target is final before its descendants need it
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._next_output[child] = target if self._output[target] is not None else self._next_output[target]
+                queue.append(child)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def matches(self, text: str) -> List[Tuple[int, int, LexiconEntry]]:
+        """Returns non-overlapping whole-word matches as (start, end, entry), leftmost-longest first."""
+        if not self.entries:
+            return []
+        folded = _fold(text)
+        goto, fail, output, next_output = self._goto, self._fail, self._output, self._next_output
+        # Longest match starting at each offset
+        longest: Dict[int, Tuple[int, LexiconEntry]] = {}
+        node = 0
+        for index, char in enumerate(folded):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            hit = node if output[node] is not None else next_output[node]
+            while hit:
+                entry = output[hit]
+                end = index + 1
+                start = end - len(entry.phrase)
+                if self._bounded(text, start, end) and end > longest.get(start, (0,))[0]:
+                    longest[start] = (end, entry)
+                hit = next_output[hit]
+
+        found = []
+        position = 0
+        for start in sorted(longest):
+            if start >= position:
+                end, entry = longest[start]
+                found.append((start, end, entry))
+                position = end
+        return found
+
+    @staticmethod
+    def _bounded(text: str, start: int, end: int) -> bool:
+        # Only edges that are word characters need a boundary, so phrases like "C++" still match
+        if _is_word(text[start]) and start > 0 and _is_word(text[start - 1]):
+            return False
+        if _is_word(text[end - 1]) and end < len(text) and _is_word(text[end]):
+            return False
+        return True
+
+    def substitute(self, text: str) -> str:
+        """Replaces every phrase that has a `say` entry; phrases with phonetic spellings are kept."""
+        if not self.has_substitutions:
+            return text
+        pieces = []
+        position = 0
+        for start, end, entry in self.matches(text):
+            if entry.say is not None:
+                pieces.append(text[position:start])
+                pieces.append(entry.say)
+                position = end
+        if not pieces:
+            return text
+        pieces.append(text[position:])
+        return "".join(pieces)
+
+    def pronunciations(self, text: str) -> List[Tuple[str, LexiconEntry]]:
+        """Returns (phrase as written in text, entry) for each phonetic entry text uses, in first-seen order."""
+        if not self.has_pronunciations:
+            return []
+        found: Dict[str, LexiconEntry] = {}
+        for start, end, entry in self.matches(text):
+            if entry.pronunciation is not None:
+                found.setdefault(text[start:end], entry)
+        return list(found.items())
+
+
+def parse_lexicon(data: Any, source: str = "lexicon") -> Lexicon:
+    """Builds a Lexicon from a mapping of phrase to replacement text, or to {ipa: ...} / {x-sampa: ...}."""
+    if data is None:
+        data = {}
+    if not isinstance(data, dict):
+        raise ValueError(f"{source}: expected a mapping of phrases to replacements or phonetic spellings")
+    entries = []
+    for phrase, value in data.items():
+        if isinstance(value, str):
+            entries.append(LexiconEntry(str(phrase), say=value))
+        elif isinstance(value, dict) and len(value) == 1:
+            (alphabet, pronunciation), = value.items()
+            if alphabet == "say":
+                entries.append(LexiconEntry(str(phrase), say=str(pronunciation)))
+            else:
+                entries.append(LexiconEntry(str(phrase), pronunciation=str(pronunciation), alphabet=alphabet))
+        else:
+            raise ValueError(f"{source}: '{phrase}' must map to text or to one of say, {', '.join(PHONETIC_ALPHABETS)}")
+    try:
+        return Lexicon(entries)
+    except ValueError as e:
+        raise ValueError(f"{source}: {e}") from e
+
+
+def load_lexicon(path: Path) -> Lexicon:
+    """Reads and compiles a YAML lexicon file."""
+    import yaml
+
+    with open(path, "r") as f:
+        return parse_lexicon(yaml.safe_load(f), source=str(path))
@@ -0,0 +1,161 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+
+# Upper bounds, in seconds, of the Prometheus histogram buckets for stage durations.
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+_NAMESPACE = "gcp_chirp"
+
+
+class StageStats:
+    """Call count, total and max duration, and bucket counts for one stage."""
+
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * len(DURATION_BUCKETS)
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        index = bisect_left(DURATION_BUCKETS, seconds)
+        if index < len(self.buckets):
+            self.buckets[index] += 1
+
+
+def _open_telemetry() -> Tuple[Any, Any]:
+    """Returns an OpenTelemetry (tracer, meter) pair, or (None, None) if the API is not installed.
+
+    Without a configured SDK the API hands out no-op implementations, so this
+    costs nothing unless the host application exports telemetry.
+    """
+    try:
+        from opentelemetry import metrics, trace
+    except ImportError:
+        return None, None
+    return trace.get_tracer(_NAMESPACE), metrics.get_meter(_NAMESPACE)
+
+
+class Metrics:
+    """Thread-safe stage timers and counters for the synthesis hot path.
+
+    Stages are timed with `stage(name)`, counters bumped with `count(name)`.
+    Everything is mirrored to OpenTelemetry when its API is available, and
+    can be rendered in the Prometheus text format or as a per-stage summary.
+    """
+
+    def __init__(self, use_open_telemetry: bool = True):
+        self._lock = threading.Lock()
+        self._stages: Dict[str, StageStats] = {}
+        self._counters: Dict[str, float] = {}
+        self._use_open_telemetry = use_open_telemetry
+        self._otel_ready = False
+        self._tracer = None
+        self._meter = None
+        self._histogram = None
+        self._otel_counters: Dict[str, Any] = {}
+
+    def _otel(self):
+        # Resolved on first use so importing this module never pulls in OpenTelemetry.
+        if not self._otel_ready:
+            with self._lock:
+                if not self._otel_ready:
+                    if self._use_open_telemetry:
+                        self._tracer, meter = _open_telemetry()
+                        if meter is not None:
+                            self._meter = meter
+                            self._histogram = meter.create_histogram(
+                                f"{_NAMESPACE}.stage.duration", unit="s", description="Time spent per synthesis stage"
+                            )
+                    self._otel_ready = True
+        return self._tracer
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            stats = self._stages.get(name)
+            if stats is None:
+                stats = self._stages[name] = StageStats()
+            stats.observe(seconds)
+        if self._histogram is not None:
+            self._histogram.record(seconds, {"stage": name})
+
+    @contextmanager
+    def stage(self, name: str, **attributes) -> Iterator[None]:
+        """Times the enclosed block as one occurrence of stage name (and as an OpenTelemetry span)."""
+        tracer = self._otel()
+        start = time.perf_counter()
+        if tracer is None:
+            try:
+                yield
+            finally:
+                self.observe(name, time.perf_counter() - start)
+            return
+        with tracer.start_as_current_span(f"{_NAMESPACE}.{name}", attributes=attributes):
+            try:
+                yield
+            finally:
+                self.observe(name, time.perf_counter() - start)
+
+    def count(self, name: str, amount: float = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+        self._otel()
+        if self._meter is not None:
+            counter = self._otel_counters.get(name)
+            if counter is None:
+                counter = self._otel_counters.setdefault(name, self._meter.create_counter(f"{_NAMESPACE}.{name}"))
+            counter.add(amount)
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns {"stages": {name: {count, total_ms, mean_ms, max_ms}}, "counters": {...}}."""
+        with self._lock:
+            stages = {
+                name: {
+                    "count": stats.count,
+                    "total_ms": round(stats.total * 1000, 3),
+                    "mean_ms": round(stats.total * 1000 / stats.count, 3) if stats.count else 0.0,
+                    "max_ms": round(stats.max * 1000, 3),
+                }
+                for name, stats in self._stages.items()
+            }
+            return {"stages": stages, "counters": dict(self._counters)}
+
+    def render_prometheus(self) -> str:
+        """Renders every stage as a histogram and every counter as a counter, in the Prometheus text format."""
+        lines: List[str] = []
+        with self._lock:
+            stages = sorted(self._stages.items())
+            counters = sorted(self._counters.items())
+            if stages:
+                metric = f"{_NAMESPACE}_stage_duration_seconds"
+                lines.append(f"# HELP {metric} Time spent per synthesis stage.")
+                lines.append(f"# TYPE {metric} histogram")
+                for name, stats in stages:
+                    cumulative = 0
+                    for bound, bucket in zip(DURATION_BUCKETS, stats.buckets):
+                        cumulative += bucket
+                        lines.append(f'{metric}_bucket{{stage="{name}",le="{bound}"}} {cumulative}')
+                    lines.append(f'{metric}_bucket{{stage="{name}",le="+Inf"}} {stats.count}')
+                    lines.append(f'{metric}_sum{{stage="{name}"}} {stats.total:.6f}')
+                    lines.append(f'{metric}_count{{stage="{name}"}} {stats.count}')
+            for name, value in counters:
+                metric = f"{_NAMESPACE}_{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide default, shared by every ChirpTTS that is not given its own registry.
+REGISTRY = Metrics()
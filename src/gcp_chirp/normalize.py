@@ -0,0 +1,56 @@
+import re
+import unicodedata
+from typing import Dict, Iterator, Optional
+
+# Characters that are invisible in text but still billed: zero-width spaces and joiners, soft hyphens, BOMs.
+_INVISIBLE_RE = re.compile("[\u00ad\u200b\u200c\u200d\u2060\ufeff]")
+_CONTROL_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
+# The one definition of paragraph and sentence boundaries and of whitespace collapsing, shared by
+# normalization, chunking, deduplication and cache keys so their boundaries always agree.
+PARAGRAPH_RE = re.compile(r"\n\s*\n")
+SENTENCE_RE = re.compile(r"(?<=[.!?…。！？])\s+")
+BOUNDARY_RE = re.compile(f"{PARAGRAPH_RE.pattern}|{SENTENCE_RE.pattern}")
+
+
+def collapse_whitespace(text: str) -> str:
+    """Joins words with single spaces, dropping leading, trailing and repeated whitespace."""
+    return " ".join(text.split())
+
+
+def normalize_text(text: str) -> str:
+    """Collapses whitespace and applies Unicode NFC so equivalent inputs share a cache key."""
+    return collapse_whitespace(unicodedata.normalize("NFC", text))
+
+
+class TextNormalizer:
+    """Canonicalizes text before synthesis, so equivalent inputs bill and cache identically.
+
+    Applies Unicode NFC, drops invisible and control characters, collapses
+    whitespace (keeping paragraph breaks) and expands configured abbreviations
+    as whole tokens, e.g. {"Dr.": "Doctor"}. Expanding before splitting also
+    stops "Dr. Smith" from being cut as a sentence end.
+    """
+
+    def __init__(self, abbreviations: Optional[Dict[str, str]] = None):
+        self.abbreviations = dict(abbreviations or {})
+        self._abbreviation_re = None
+        if self.abbreviations:
+            # Longest first, so "U.S.A." wins over "U.S."
+            alternatives = "|".join(re.escape(key) for key in sorted(self.abbreviations, key=len, reverse=True))
+            self._abbreviation_re = re.compile(rf"(?<!\w)(?:{alternatives})(?!\w)")
+
+    def __call__(self, text: str) -> str:
+        text = unicodedata.normalize("NFC", text)
+        text = _CONTROL_RE.sub(" ", _INVISIBLE_RE.sub("", text))
+        if self._abbreviation_re is not None:
+            text = self._abbreviation_re.sub(lambda match: self.abbreviations[match.group()], text)
+        paragraphs = (collapse_whitespace(paragraph) for paragraph in PARAGRAPH_RE.split(text))
+        return "\n\n".join(paragraph for paragraph in paragraphs if paragraph)
+
+
+def iter_sentences(text: str) -> Iterator[str]:
+    """Yields the sentences of normalized text, the unit shared between clips when deduplicating."""
+    for paragraph in PARAGRAPH_RE.split(text):
+        for sentence in SENTENCE_RE.split(paragraph.strip()):
+            if sentence:
+                yield sentence
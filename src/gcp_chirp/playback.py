@@ -0,0 +1,189 @@
+import queue
+import shutil
+import subprocess
+import threading
+from typing import List, Optional
+from .audio import is_mp3_info_frame, iter_mp3_frames, parse_wav
+
+# Segments waiting for the player before put() blocks, bounding memory when synthesis outruns playback.
+MAX_PENDING_SEGMENTS = 8
+
+
+def pcm_player_command(sample_rate: int, channels: int = 1) -> Optional[List[str]]:
+    """Returns a command that plays signed 16-bit little-endian PCM from stdin, if a player is installed."""
+    if shutil.which("ffplay"):
+        return [
+            "ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet",
+            "-f", "s16le", "-ar", str(sample_rate), "-ac", str(channels), "-i", "-",
+        ]
+    if shutil.which("play"):
+        return [
+            "play", "-q", "-t", "raw", "-r", str(sample_rate),
+            "-e", "signed", "-b", "16", "-c", str(channels), "-",
+        ]
+    if shutil.which("aplay"):
+        return ["aplay", "-q", "-f", "S16_LE", "-r", str(sample_rate), "-c", str(channels)]
+    return None
+
+
+def stream_player_command(encoding: str, sample_rate: int, channels: int = 1) -> Optional[List[str]]:
+    """Returns a command that plays audio of an AudioEncoding name from stdin, if a player is installed.
+
+    WAV encodings are played as headerless samples, as AudioPlayer sends them.
+    """
+    if encoding == "LINEAR16":
+        return pcm_player_command(sample_rate, channels)
+    rate, count = str(sample_rate), str(channels)
+    if shutil.which("ffplay"):
+        formats = {
+            "MP3": ["-f", "mp3"],
+            "OGG_OPUS": ["-f", "ogg"],
+            "MULAW": ["-f", "mulaw", "-ar", rate, "-ac", count],
+            "ALAW": ["-f", "alaw", "-ar", rate, "-ac", count],
+        }
+        return ["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet", *formats[encoding], "-i", "-"]
+    if shutil.which("play"):
+        formats = {
+            "MP3": ["-t", "mp3"],
+            "OGG_OPUS": ["-t", "opus"],
+            "MULAW": ["-t", "raw", "-r", rate, "-e", "mu-law", "-b", "8", "-c", count],
+            "ALAW": ["-t", "raw", "-r", rate, "-e", "a-law", "-b", "8", "-c", count],
+        }
+        return ["play", "-q", *formats[encoding], "-"]
+    if encoding == "MP3" and shutil.which("mpg123"):
+        return ["mpg123", "-q", "-"]
+    if encoding in ("MULAW", "ALAW") and shutil.which("aplay"):
+        return ["aplay", "-q", "-f", "MU_LAW" if encoding == "MULAW" else "A_LAW", "-r", rate, "-c", count]
+    return None
+
+
+def file_player_command(path: str) -> Optional[List[str]]:
+    """Returns a command that plays an audio file, if a player is installed."""
+    for player in (["afplay"], ["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet"], ["play", "-q"]):
+        if shutil.which(player[0]):
+            return [*player, path]
+    if path.endswith(".mp3") and shutil.which("mpg123"):
+        return ["mpg123", "-q", path]
+    if path.endswith(".wav") and shutil.which("aplay"):
+        return ["aplay", "-q", path]
+    return None
+
+
+def _stop_process(process: subprocess.Popen):
+    if process.poll() is None:
+        process.terminate()
+        try:
+            process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def play_file(path: str) -> bool:
+    """Plays a file to the end, stopping the player if interrupted. Returns False without a player."""
+    command = file_player_command(path)
+    if command is None:
+        return False
+    # Arguments go to the player as a list, so no shell ever parses the path
+    process = subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        process.wait()
+    except BaseException:
+        _stop_process(process)
+        raise
+    return True
+
+
+class AudioPlayer:
+    """Plays audio segments back to back through one player process fed from a background thread.
+
+    put() returns as soon as the segment is queued (until MAX_PENDING_SEGMENTS
+    are waiting), so the next chunk is synthesized while the current one
+    plays, and one long-lived player avoids per-clip start-up gaps. WAV
+    segments are unwrapped to their sample data and MP3 segments lose their
+    tags and Info frames, so nothing but audio reaches the player between
+    chunks. Used as a context manager, it waits for playback on success and
+    stops the player at once on an error or Ctrl-C.
+    """
+
+    def __init__(self, command: List[str], encoding: Optional[str] = None, max_pending: int = MAX_PENDING_SEGMENTS):
+        self.encoding = encoding
+        self.process = subprocess.Popen(
+            command, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        self.segments = 0
+        self._queue: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=max_pending)
+        self._broken = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._feed, name="gcp-chirp-playback", daemon=True)
+        self._thread.start()
+
+    def _feed(self):
+        while True:
+            segment = self._queue.get()
+            if segment is None:
+                break
+            if self._broken:
+                # Keep draining so producers never block on a player that has gone away
+                continue
+            try:
+                self.process.stdin.write(segment)
+                self.process.stdin.flush()
+            except (OSError, ValueError):
+                self._broken = True
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+
+    def put(self, segment: bytes):
+        if self.encoding == "MP3":
+            view = memoryview(segment)
+            segment = b"".join(
+                view[frame.offset:frame.offset + frame.length]
+                for frame in iter_mp3_frames(view)
+                if not is_mp3_info_frame(view, frame)
+            )
+        else:
+            wav = parse_wav(segment)
+            if wav is not None:
+                segment = bytes(memoryview(segment)[wav.data_offset:wav.data_offset + wav.data_length])
+        self.segments += 1
+        self._queue.put(segment)
+
+    def close(self):
+        """Lets queued audio finish playing, then waits for the player to exit."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        try:
+            self._thread.join()
+            self.process.wait()
+        except BaseException:
+            self.stop()
+            raise
+
+    def stop(self):
+        """Stops playback immediately, discarding queued audio."""
+        self._broken = True
+        _stop_process(self.process)
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join()
+
+    def __enter__(self) -> "AudioPlayer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.stop()
+
+
+def open_player(encoding: str, sample_rate: int) -> Optional[AudioPlayer]:
+    """Starts an AudioPlayer for an AudioEncoding name, or returns None if no streaming player is installed."""
+    command = stream_player_command(encoding, sample_rate)
+    return AudioPlayer(command, encoding) if command is not None else None
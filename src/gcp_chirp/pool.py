@@ -0,0 +1,108 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+# First cooldown after an entry hits its quota; doubles with each consecutive strike.
+INITIAL_COOLDOWN_SECONDS = 5.0
+MAX_COOLDOWN_SECONDS = 120.0
+
+
+def build_client(client_class, project_id: Optional[str], credentials_path: Optional[str]):
+    """Builds one API client with explicit credentials billed to project_id, leaving os.environ alone.
+
+    Without a credentials file, Application Default Credentials are used.
+    """
+    from google.api_core.client_options import ClientOptions
+
+    credentials = None
+    if credentials_path:
+        from google.oauth2 import service_account
+
+        credentials = service_account.Credentials.from_service_account_file(credentials_path)
+    options = ClientOptions(quota_project_id=project_id) if project_id else None
+    return client_class(credentials=credentials, client_options=options)
+
+
+class PoolEntry:
+    """One project and its credentials, with lazily built clients and load bookkeeping."""
+
+    def __init__(self, project_id: str, credentials_path: Optional[str] = None):
+        self.project_id = project_id
+        self.credentials_path = credentials_path
+        self.in_flight = 0
+        self.requests = 0
+        self.strikes = 0
+        self.cooldown_until = 0.0
+        self._clients: Dict[Any, Any] = {}
+        self._lock = threading.Lock()
+
+    def client(self, client_class):
+        # One client per API surface (v1, v1beta1), created on first use
+        with self._lock:
+            client = self._clients.get(client_class)
+            if client is None:
+                client = self._clients[client_class] = build_client(
+                    client_class, self.project_id, self.credentials_path
+                )
+            return client
+
+
+class ClientPool:
+    """Spreads requests over several projects, so throughput scales with the quota attached.
+
+    Each request goes to the entry with the fewest requests in flight among
+    those not cooling down. An entry that reports ResourceExhausted cools
+    down for a growing interval and traffic fails over to the others; if all
+    are cooling down, the one that recovers first is used.
+    """
+
+    def __init__(self, entries: Sequence[PoolEntry], clock: Callable[[], float] = time.monotonic):
+        if not entries:
+            raise ValueError("A client pool needs at least one project")
+        self.entries: List[PoolEntry] = list(entries)
+        self.clock = clock
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, projects: Sequence[Dict[str, Any]]) -> "ClientPool":
+        """Builds a pool from the `projects` setting: [{project_id, credentials}, ...]."""
+        entries = []
+        for index, project in enumerate(projects):
+            if not isinstance(project, dict) or not project.get("project_id"):
+                raise ValueError(f"projects[{index}] needs a project_id")
+            entries.append(PoolEntry(project["project_id"], project.get("credentials") or None))
+        return cls(entries)
+
+    def _pick(self) -> PoolEntry:
+        now = self.clock()
+        ready = [entry for entry in self.entries if entry.cooldown_until <= now]
+        if not ready:
+            return min(self.entries, key=lambda entry: entry.cooldown_until)
+        # Ties go to the entry used least so far, which round-robins an idle pool
+        return min(ready, key=lambda entry: (entry.in_flight, entry.requests))
+
+    @contextmanager
+    def lease(self) -> Iterator[PoolEntry]:
+        """Reserves the least-loaded entry for one request."""
+        with self._lock:
+            entry = self._pick()
+            entry.in_flight += 1
+            entry.requests += 1
+        try:
+            yield entry
+        finally:
+            with self._lock:
+                entry.in_flight -= 1
+
+    def on_success(self, entry: PoolEntry):
+        with self._lock:
+            entry.strikes = 0
+
+    def on_exhausted(self, entry: PoolEntry) -> bool:
+        """Puts entry on cooldown. Returns True if another entry can take the retry right away."""
+        with self._lock:
+            now = self.clock()
+            entry.cooldown_until = now + min(INITIAL_COOLDOWN_SECONDS * 2 ** entry.strikes, MAX_COOLDOWN_SECONDS)
+            entry.strikes += 1
+            return any(other.cooldown_until <= now for other in self.entries)
@@ -0,0 +1,134 @@
+import random
+import threading
+import time
+from typing import Callable, Optional
+from google.api_core import exceptions as core_exceptions
+
+RETRYABLE_ERRORS = (
+    core_exceptions.ResourceExhausted,
+    core_exceptions.ServiceUnavailable,
+    core_exceptions.DeadlineExceeded,
+    core_exceptions.Aborted,
+    core_exceptions.InternalServerError,
+)
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at rate_per_minute."""
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1) -> float:
+        """Takes amount tokens, sleeping until they are available. Returns the time waited.
+
+        Tokens are reserved before sleeping, so concurrent callers queue up fairly
+        and a request larger than the bucket still goes through once its debt is paid.
+        """
+        with self._lock:
+            now = self._clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self.tokens -= amount
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+class RateLimiter:
+    """Client-side limits on requests per minute and characters per minute (0 disables a limit)."""
+
+    def __init__(self, requests_per_minute: float = 0, characters_per_minute: float = 0):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.characters = TokenBucket(characters_per_minute) if characters_per_minute else None
+
+    def acquire(self, characters: int):
+        if self.requests is not None:
+            self.requests.acquire(1)
+        if self.characters is not None:
+            self.characters.acquire(characters)
+
+
+class AdaptiveConcurrency:
+    """AIMD gate on in-flight requests: halves on RESOURCE_EXHAUSTED, grows back by one per window."""
+
+    def __init__(self, max_limit: int):
+        self.max_limit = max(1, max_limit)
+        self.limit = float(self.max_limit)
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+    def __enter__(self):
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def on_success(self):
+        with self._cond:
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+
+    def on_throttled(self):
+        with self._cond:
+            self.limit = max(1.0, self.limit / 2)
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Extracts a server retry hint from google.rpc.RetryInfo details or a Retry-After header."""
+    for detail in getattr(error, "details", None) or []:
+        delay = getattr(detail, "retry_delay", None)
+        if delay is not None and hasattr(delay, "seconds"):
+            return delay.seconds + delay.nanos / 1e9
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter for retryable gRPC status codes."""
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        initial_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        multiplier: float = 2.0
+    ):
+        self.max_attempts = max_attempts
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.multiplier = multiplier
+
+    def is_retryable(self, error: Exception) -> bool:
+        return isinstance(error, RETRYABLE_ERRORS)
+
+    def delay(self, attempt: int, error: Exception) -> float:
+        """Seconds to wait before retry number attempt (0-based), honouring server hints."""
+        hint = retry_after(error)
+        if hint is not None:
+            return min(self.max_backoff, hint)
+        ceiling = min(self.max_backoff, self.initial_backoff * self.multiplier ** attempt)
+        return random.uniform(0, ceiling)
@@ -0,0 +1,132 @@
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+from .audio import ENCODING_EXTENSIONS, create_writer, silence_like
+from .normalize import collapse_whitespace
+from .storage import atomic_open
+from .tts import DEFAULT_SAMPLE_RATE, ChirpTTS
+from .workers import unordered_map
+
+DEFAULT_PAUSE_MS = 400
+
+
+class ScriptLine(NamedTuple):
+    speaker: str
+    voice: str
+    text: str
+    # Silence after this line, before the next one
+    pause_ms: int
+
+
+class Script(NamedTuple):
+    lines: List[ScriptLine]
+    output: Optional[str]
+
+
+def _pause(value: Any, where: str) -> int:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+        raise ValueError(f"{where}: pause_ms must be a non-negative number")
+    return int(value)
+
+
+def parse_script(data: Any, default_pause_ms: Optional[int] = None, source: str = "script") -> Script:
+    """Validates a parsed script: a voices mapping of speaker to voice, and lines of speaker and text.
+
+    Lines are either `{speaker: text}` or `{speaker, text, pause_ms}`.
+    default_pause_ms, when given, overrides the script's own pause_ms.
+    """
+    if not isinstance(data, dict):
+        raise ValueError(f"{source}: expected a mapping with 'voices' and 'lines'")
+    voices = data.get("voices") or {}
+    if not isinstance(voices, dict):
+        raise ValueError(f"{source}: 'voices' must map speaker names to voice names")
+    raw_lines = data.get("lines")
+    if not isinstance(raw_lines, list) or not raw_lines:
+        raise ValueError(f"{source}: 'lines' must be a non-empty list")
+    if default_pause_ms is None:
+        default_pause_ms = _pause(data.get("pause_ms", DEFAULT_PAUSE_MS), source)
+
+    lines = []
+    for number, raw in enumerate(raw_lines, start=1):
+        where = f"{source}: line {number}"
+        if isinstance(raw, dict) and "speaker" not in raw and len(raw) == 1:
+            (speaker, text), = raw.items()
+            raw = {"speaker": speaker, "text": text}
+        if not isinstance(raw, dict) or "speaker" not in raw:
+            raise ValueError(f"{where}: expected {{speaker: text}} or a mapping with speaker and text")
+        speaker = str(raw["speaker"])
+        if speaker not in voices:
+            raise ValueError(f"{where}: speaker '{speaker}' has no voice in 'voices'")
+        text = str(raw.get("text") or "").strip()
+        if not text:
+            raise ValueError(f"{where}: text is empty")
+        pause_ms = _pause(raw["pause_ms"], where) if "pause_ms" in raw else default_pause_ms
+        lines.append(ScriptLine(speaker, str(voices[speaker]), text, pause_ms))
+    return Script(lines, data.get("output") or None)
+
+
+def load_script(path: Path, default_pause_ms: Optional[int] = None) -> Script:
+    """Reads and validates a YAML dialogue script."""
+    import yaml
+
+    with open(path, "r") as f:
+        return parse_script(yaml.safe_load(f), default_pause_ms, source=str(path))
+
+
+def render_script(
+    tts: ChirpTTS,
+    script: Script,
+    output_file: str,
+    concurrency: int = 4,
+    audio_encoding: Optional[str] = None,
+    sample_rate_hertz: Optional[int] = None
+) -> Dict[str, int]:
+    """Synthesizes every distinct line once, in parallel, and joins them into output_file with pauses.
+
+    Lines repeated with the same voice share one synthesis (and the cache
+    serves lines from earlier renders). Pauses are generated in the output
+    encoding rather than synthesized. Returns line, request and character counts.
+    """
+    encoding = audio_encoding or tts.audio_encoding
+    options = {"audio_encoding": encoding, "sample_rate_hertz": sample_rate_hertz}
+    if encoding not in ENCODING_EXTENSIONS:
+        raise ValueError(f"Unsupported audio encoding: {encoding}. Choose from {', '.join(ENCODING_EXTENSIONS)}")
+    if encoding == "OGG_OPUS" and any(line.pause_ms for line in script.lines[:-1]):
+        # Checked before any request is made; silence_like() cannot produce Opus
+        raise ValueError("Pauses cannot be generated for OGG_OPUS; set pause_ms to 0 or choose another encoding")
+
+    # Whitespace differences alone should not cost a second synthesis
+    keys = [(line.voice, collapse_whitespace(line.text)) for line in script.lines]
+    unique = list(dict.fromkeys(keys))
+
+    with tempfile.TemporaryDirectory(prefix="gcp-chirp-render-") as clip_dir:
+        def run(item):
+            index, (voice, text) = item
+            path = os.path.join(clip_dir, f"{index}{ENCODING_EXTENSIONS[encoding]}")
+            tts.synthesize(text, voice, path, **options)
+            return (voice, text), path
+
+        clips = dict(unordered_map(run, enumerate(unique), concurrency))
+
+        with atomic_open(output_file, "wb", durable=False) as out:
+            writer = create_writer(encoding, out, sample_rate_hertz or tts.sample_rate_hertz or DEFAULT_SAMPLE_RATE)
+            silences: Dict[int, bytes] = {}
+            for position, (line, key) in enumerate(zip(script.lines, keys)):
+                with open(clips[key], "rb") as f:
+                    clip = f.read()
+                writer.write(clip)
+                if line.pause_ms and position + 1 < len(script.lines):
+                    if line.pause_ms not in silences:
+                        silences[line.pause_ms] = silence_like(encoding, clip, line.pause_ms / 1000)
+                    writer.write(silences[line.pause_ms])
+            writer.close()
+
+    characters = sum(len(text) for _, text in keys)
+    unique_characters = sum(len(text) for _, text in unique)
+    return {
+        "lines": len(script.lines),
+        "synthesized": len(unique),
+        "characters": characters,
+        "characters_saved": characters - unique_characters,
+    }
@@ -0,0 +1,324 @@
+import hmac
+import http.client
+import json
+import os
+import secrets
+import shutil
+import socket
+import socketserver
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+from .metrics import PROMETHEUS_CONTENT_TYPE, REGISTRY
+from .storage import atomic_write
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DAEMON_STATE_FILE = "daemon.json"
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    """Serves GET /metrics from the server's registry, in the Prometheus text format.
+
+    Used on its own by long-running modes other than the daemon (e.g. watch);
+    it exposes nothing but counters and timings, so it takes no token.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        # Per-request logging would dominate latency for short clips.
+        pass
+
+    def _send_json(self, status: int, payload: Dict[str, Any]):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_metrics(self):
+        body = self.server.metrics.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if urlparse(self.path).path == "/metrics":
+            self._send_metrics()
+        else:
+            self._send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+
+
+class ChirpRequestHandler(MetricsRequestHandler):
+    """Routes the local API onto the server's shared ChirpTTS instance.
+
+    Every request needs the daemon's bearer token, which only the owner can
+    read from the 0600 state file. Requests carrying an Origin header come
+    from a browser page and are refused, as are POSTs that are not JSON, so
+    a web page cannot drive the daemon with a "simple" cross-origin request.
+    """
+
+    def address_string(self) -> str:
+        return self.client_address[0] if self.client_address else "unix"
+
+    def _authorized(self) -> bool:
+        if self.headers.get("Origin") is not None:
+            self._send_json(403, {"error": "Cross-origin requests are not allowed"})
+            return False
+        expected = f"Bearer {self.server.token}".encode("utf-8")
+        if not hmac.compare_digest(self.headers.get("Authorization", "").encode("utf-8"), expected):
+            self._send_json(401, {"error": "Missing or invalid daemon token"})
+            return False
+        return True
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+        url = urlparse(self.path)
+        if url.path == "/health":
+            self._send_json(200, {"status": "ok", "pid": os.getpid()})
+        elif url.path == "/metrics":
+            self._send_metrics()
+        elif url.path == "/voices":
+            lang = parse_qs(url.query).get("lang", [self.server.default_language])[0]
+            try:
+                self._send_json(200, {"voices": self.server.tts.list_voices(lang)})
+            except Exception as e:
+                self._send_json(502, {"error": str(e)})
+        else:
+            self._send_json(404, {"error": f"Unknown endpoint: {url.path}"})
+
+    def do_POST(self):
+        if not self._authorized():
+            return
+        if urlparse(self.path).path != "/synthesize":
+            self._send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+            return
+        if self.headers.get_content_type() != "application/json":
+            self._send_json(415, {"error": "Expected Content-Type: application/json"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            text = request["text"]
+        except (ValueError, KeyError):
+            self._send_json(400, {"error": "Expected a JSON body with a 'text' field"})
+            return
+
+        voice = request.get("voice") or self.server.default_voice
+        output = request.get("output")
+        if output and not isinstance(self.server, ChirpUnixServer):
+            # Only the owner can reach the 0600 socket; over TCP, writing to caller-chosen paths is not offered
+            self._send_json(400, {"error": "'output' is only accepted over the Unix socket"})
+            return
+        options = {
+            "audio_encoding": request.get("audio_encoding"),
+            "sample_rate_hertz": request.get("sample_rate_hertz"),
+        }
+        self.server.metrics.count("http_synthesize_requests")
+        try:
+            if output:
+                # Same-host callers pass a path and skip shipping the audio over the socket.
+                self._send_json(200, {"output": self.server.tts.synthesize(text, voice, output, **options)})
+                return
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                path = self.server.tts.synthesize(text, voice, os.path.join(tmp_dir, "audio"), **options)
+                with open(path, "rb") as f:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/octet-stream")
+                    self.send_header("Content-Length", str(os.fstat(f.fileno()).st_size))
+                    self.end_headers()
+                    shutil.copyfileobj(f, self.wfile)
+        except Exception as e:
+            self.server.metrics.count("http_synthesize_errors")
+            self._send_json(500, {"error": str(e)})
+
+
+class _ChirpServerMixin:
+    def configure(self, tts, default_voice: str, default_language: str, token: Optional[str] = None):
+        self.tts = tts
+        # Shared secret clients read from the daemon state file
+        self.token = token or secrets.token_urlsafe(32)
+        self.default_voice = default_voice
+        self.default_language = default_language
+        # Served at /metrics; tracks the shared client's stages across every request
+        self.metrics = getattr(tts, "metrics", None) or REGISTRY
+
+
+class ChirpHTTPServer(_ChirpServerMixin, ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class ChirpUnixServer(_ChirpServerMixin, socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+        super().server_bind()
+        os.chmod(self.server_address, 0o600)
+
+
+def create_server(
+    tts,
+    default_voice: str,
+    default_language: str,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    socket_path: Optional[str] = None,
+    token: Optional[str] = None
+):
+    """Builds (but does not start) a server bound to a TCP port or a Unix socket.
+
+    Without a token, a random one is generated; server_endpoint() reports it.
+    """
+    if socket_path:
+        server = ChirpUnixServer(socket_path, ChirpRequestHandler)
+    else:
+        server = ChirpHTTPServer((host, port), ChirpRequestHandler)
+    server.configure(tts, default_voice, default_language, token)
+    return server
+
+
+def start_metrics_server(metrics=REGISTRY, host: str = DEFAULT_HOST, port: int = 0) -> ThreadingHTTPServer:
+    """Serves metrics at http://host:port/metrics from a background thread; call shutdown() to stop."""
+    server = ThreadingHTTPServer((host, port), MetricsRequestHandler)
+    server.daemon_threads = True
+    server.metrics = metrics
+    threading.Thread(target=server.serve_forever, name="gcp-chirp-metrics", daemon=True).start()
+    return server
+
+
+def server_endpoint(server) -> Dict[str, Any]:
+    """Describes where a server listens and its token, in the format stored in the daemon state file."""
+    if isinstance(server, ChirpUnixServer):
+        return {"socket": server.server_address, "token": server.token}
+    host, port = server.server_address[:2]
+    return {"host": host, "port": port, "token": server.token}
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class DaemonClient:
+    """Talks to a running `gcp-chirp serve` daemon."""
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        socket_path: Optional[str] = None,
+        timeout: float = 300.0,
+        token: str = ""
+    ):
+        self.host = host
+        self.port = port
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.token = token
+
+    def _connection(self, timeout: float) -> http.client.HTTPConnection:
+        if self.socket_path:
+            return _UnixHTTPConnection(self.socket_path, timeout)
+        return http.client.HTTPConnection(self.host, self.port, timeout=timeout)
+
+    def _request(self, method: str, path: str, body: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None):
+        conn = self._connection(timeout or self.timeout)
+        try:
+            headers = {"Authorization": f"Bearer {self.token}"}
+            if body is not None:
+                headers["Content-Type"] = "application/json"
+            conn.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+            response = conn.getresponse()
+            data = response.read()
+        finally:
+            conn.close()
+        if response.getheader("Content-Type") == "application/json":
+            payload = json.loads(data)
+            if response.status >= 400:
+                raise Exception(payload.get("error", f"Daemon returned HTTP {response.status}"))
+            return payload
+        return data
+
+    def health(self, timeout: float = 0.5) -> bool:
+        try:
+            return self._request("GET", "/health", timeout=timeout).get("status") == "ok"
+        except Exception:
+            # Unreachable, or a daemon that rejects our token: either way, not usable
+            return False
+
+    def list_voices(self, language_code: str) -> List[str]:
+        return self._request("GET", f"/voices?lang={language_code}")["voices"]
+
+    def metrics(self) -> str:
+        """Returns the daemon's metrics in the Prometheus text format."""
+        return self._request("GET", "/metrics").decode("utf-8")
+
+    def synthesize(
+        self,
+        text: str,
+        voice_name: str,
+        output_file: Optional[str] = None,
+        audio_encoding: Optional[str] = None,
+        sample_rate_hertz: Optional[int] = None
+    ):
+        """Writes audio to output_file and returns it, or returns the bytes.
+
+        Over the Unix socket the daemon writes output_file itself; over TCP
+        the audio is sent back and written here.
+        """
+        body = {
+            "text": text,
+            "voice": voice_name,
+            "audio_encoding": audio_encoding,
+            "sample_rate_hertz": sample_rate_hertz,
+        }
+        if output_file and self.socket_path:
+            body["output"] = os.path.abspath(output_file)
+            return self._request("POST", "/synthesize", body)["output"]
+        audio = self._request("POST", "/synthesize", body)
+        if output_file:
+            atomic_write(output_file, audio)
+            return output_file
+        return audio
+
+
+def write_daemon_state(config_dir: Path, endpoint: Dict[str, Any]) -> Path:
+    state_file = config_dir / DAEMON_STATE_FILE
+    # Clients poll this file; a rename means they never read it half-written.
+    # It holds the daemon token, so only the owner may read it.
+    atomic_write(state_file, json.dumps({**endpoint, "pid": os.getpid()}), permissions=0o600)
+    return state_file
+
+
+def find_daemon(config_dir: Path) -> Optional[DaemonClient]:
+    """Returns a client for the daemon recorded in config_dir if it is alive and healthy."""
+    state_file = config_dir / DAEMON_STATE_FILE
+    try:
+        with open(state_file, "r") as f:
+            state = json.load(f)
+        os.kill(state["pid"], 0)
+    except (OSError, ValueError, KeyError):
+        return None
+    client = DaemonClient(
+        host=state.get("host", DEFAULT_HOST),
+        port=state.get("port", DEFAULT_PORT),
+        socket_path=state.get("socket"),
+        token=state.get("token", ""),
+    )
+    return client if client.health() else None
@@ -0,0 +1,118 @@
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows: locks only exclude threads of this process
+    fcntl = None
+
+
+class FileLock:
+    """Reentrant lock that excludes other threads and, through flock(2) on a lock file, other processes.
+
+    Every read-modify-write of state shared on disk (settings, cache index,
+    voice catalog, watch state) happens under one of these, so any number of
+    workers can share a config directory. The lock file sits next to the
+    state rather than inside a directory that may be removed, and is never
+    deleted, since unlinking it would let two holders lock different inodes.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    def acquire(self):
+        self._lock.acquire()
+        try:
+            if self._depth == 0 and fcntl is not None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                except BaseException:
+                    os.close(fd)
+                    raise
+                self._fd = fd
+            self._depth += 1
+        except BaseException:
+            self._lock.release()
+            raise
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0 and self._fd is not None:
+            fd, self._fd = self._fd, None
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+        self._lock.release()
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+def lock_path(path: Union[str, Path]) -> Path:
+    """Returns the lock file guarding path: a sibling named `<name>.lock`."""
+    path = Path(path)
+    return path.with_name(path.name + ".lock")
+
+
+@contextmanager
+def atomic_open(
+    path: Union[str, Path],
+    mode: str = "w",
+    durable: bool = True,
+    permissions: Optional[int] = None
+) -> Iterator[IO]:
+    """Opens a uniquely named temporary file beside path and renames it over path on success.
+
+    Readers see the old content or the complete new content, never a torn
+    write. With durable, the data is also fsynced before the rename so this
+    holds after a crash; state that is cheap to lose and rewritten often can
+    skip that. The temporary name is hidden and ends in `.tmp`, so directory
+    watchers skip it. The file keeps the mode path had (0644 if new) unless
+    permissions is given.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_file = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        # mkstemp creates the file private; keep the mode the file had, as an in-place write would
+        if permissions is None:
+            try:
+                permissions = os.stat(path).st_mode & 0o777
+            except FileNotFoundError:
+                permissions = 0o644
+        os.chmod(tmp_file, permissions)
+        with os.fdopen(fd, mode) as f:
+            yield f
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_file, path)
+    except BaseException:
+        try:
+            os.remove(tmp_file)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def atomic_write(
+    path: Union[str, Path],
+    data: Union[str, bytes],
+    durable: bool = True,
+    permissions: Optional[int] = None
+):
+    """Replaces path with data in one step (temporary file, fsync, rename)."""
+    with atomic_open(path, "wb" if isinstance(data, bytes) else "w", durable, permissions) as f:
+        f.write(data)
@@ -1,63 +1,791 @@
 import os
-from google.cloud import texttospeech
-from typing import List, Optional
+import shutil
+import tempfile
+import threading
+import time
+from functools import partial
+from xml.sax.saxutils import escape as xml_escape
+from google.api_core import exceptions as core_exceptions
+from google.cloud import texttospeech, texttospeech_v1beta1
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence
+from .audio import ENCODING_EXTENSIONS, create_writer, split_audio
+from .cache import SynthesisCache
+from .lexicon import PHONETIC_ALPHABETS, Lexicon
+from .metrics import REGISTRY, Metrics
+from .normalize import BOUNDARY_RE, PARAGRAPH_RE, SENTENCE_RE, collapse_whitespace, iter_sentences
+from .pool import ClientPool
+from .voices import VoiceInfo, voice_family
+from .ratelimit import AdaptiveConcurrency, RateLimiter, RetryPolicy
+from .storage import atomic_open
+from .workers import ordered_map, unordered_map
+
+# Chirp 3 HD streams 16-bit mono PCM at 24 kHz.
+STREAMING_SAMPLE_RATE = 24000
+# Chirp 3 HD's natural rate, used to label headerless audio when no sample rate is requested.
+DEFAULT_SAMPLE_RATE = 24000
+SUPPORTED_ENCODINGS = tuple(ENCODING_EXTENSIONS)
+
+# The API rejects SynthesisInput text above 5000 bytes; leave headroom for the request envelope.
+DEFAULT_CHUNK_MAX_BYTES = 4800
+
+# AudioConfig fields a preset may set; everything else about a request comes from its arguments.
+PRESET_FIELDS = ("speaking_rate", "pitch", "volume_gain_db", "effects_profile_id")
+
+# Encodings whose responses can be cut at a timepoint, and the pause placed between packed items.
+PACKABLE_ENCODINGS = ("MP3", "LINEAR16", "MULAW", "ALAW")
+_PACK_GAP = '<break time="100ms"/>'
+
+# Longest run of text without a sentence boundary held back while streaming input.
+_MAX_PENDING_CHARS = 64 * 1024
+
+
+def _utf8_len(text: str) -> int:
+    return len(text.encode("utf-8"))
+
+
+def _split_oversized(text: str, max_bytes: int) -> Iterator[str]:
+    """Splits a sentence that exceeds the budget on words, then on characters."""
+    current = ""
+    for word in text.split(" "):
+        while _utf8_len(word) > max_bytes:
+            if current:
+                yield current
+                current = ""
+            cut = len(word.encode("utf-8")[:max_bytes].decode("utf-8", "ignore"))
+            yield word[:cut]
+            word = word[cut:]
+        candidate = f"{current} {word}" if current else word
+        if _utf8_len(candidate) <= max_bytes:
+            current = candidate
+        else:
+            yield current
+            current = word
+    if current:
+        yield current
+
+
+def iter_split_text(
+    blocks: Iterable[str],
+    max_bytes: int = DEFAULT_CHUNK_MAX_BYTES,
+    normalize: Optional[Callable[[str], str]] = None
+) -> Iterator[str]:
+    """Incremental split_text(): consumes text blocks of any size and yields the same chunks.
+
+    Only text up to the last sentence or paragraph boundary seen so far is
+    packed, so memory stays near max_bytes plus one block however long the
+    input is. A run with no boundary at all is cut at whitespace once it
+    exceeds _MAX_PENDING_CHARS. normalize, if given, is applied to each such
+    run before it is packed, so expansions cannot push a chunk over max_bytes.
+    """
+    current = ""
+    separator = "\n\n"
+    pending = ""
+    new_paragraph = True
+
+    def pack(text: str, starts_paragraph: bool) -> Iterator[str]:
+        nonlocal current, separator
+        if normalize is not None:
+            text = normalize(text)
+        for index, paragraph in enumerate(PARAGRAPH_RE.split(text)):
+            paragraph = collapse_whitespace(paragraph)
+            if index > 0 or starts_paragraph:
+                separator = "\n\n"
+            if not paragraph:
+                continue
+            for sentence in SENTENCE_RE.split(paragraph):
+                pieces = [sentence] if _utf8_len(sentence) <= max_bytes else _split_oversized(sentence, max_bytes)
+                for piece in pieces:
+                    candidate = f"{current}{separator}{piece}" if current else piece
+                    if _utf8_len(candidate) <= max_bytes:
+                        current = candidate
+                    else:
+                        yield current
+                        current = piece
+                    separator = " "
+
+    for block in blocks:
+        pending += block
+        # A boundary is only final once non-space text follows it; the whitespace run may continue otherwise
+        boundary = None
+        for match in BOUNDARY_RE.finditer(pending):
+            if match.end() < len(pending):
+                boundary = match
+        if boundary is not None:
+            yield from pack(pending[:boundary.start()], new_paragraph)
+            new_paragraph = PARAGRAPH_RE.search(boundary.group()) is not None
+            pending = pending[boundary.end():]
+        elif len(pending) > _MAX_PENDING_CHARS:
+            cut = pending.rfind(" ", 0, len(pending) - 1) + 1 or len(pending)
+            yield from pack(pending[:cut], new_paragraph)
+            new_paragraph = False
+            pending = pending[cut:]
+    yield from pack(pending, new_paragraph)
+    if current:
+        yield current
+
+
+def split_text(text: str, max_bytes: int = DEFAULT_CHUNK_MAX_BYTES) -> List[str]:
+    """Splits text into chunks of at most max_bytes, preferring paragraph and sentence boundaries."""
+    return list(iter_split_text([text], max_bytes))
+
+
+def _copy_file_to(path: str, out: BinaryIO):
+    """Copies a file into a binary stream, using sendfile(2) when both ends are real descriptors."""
+    out.flush()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        try:
+            out_fd = out.fileno()
+        except (AttributeError, OSError, ValueError):
+            out_fd = None
+        if out_fd is not None and hasattr(os, "sendfile"):
+            offset = 0
+            try:
+                while offset < size:
+                    offset += os.sendfile(out_fd, f.fileno(), offset, size - offset)
+                return
+            except OSError:
+                if offset:
+                    raise
+        f.seek(0)
+        shutil.copyfileobj(f, out)
+
+
+def _service_error(e: Exception) -> Exception:
+    """Re-wraps an API error with a cleaner message if it's a known service issue."""
+    error_msg = str(e)
+    if "quota" in error_msg.lower():
+        return Exception(f"API Quota exceeded: {error_msg}")
+    elif "authentication" in error_msg.lower() or "credentials" in error_msg.lower():
+        return Exception(f"Authentication failed. Please run 'gcp-chirp setup' or set GOOGLE_APPLICATION_CREDENTIALS: {error_msg}")
+    elif "network" in error_msg.lower() or "connection" in error_msg.lower():
+        return Exception(f"Network error: Please check your internet connection: {error_msg}")
+    else:
+        return Exception(f"TTS Synthesis failed: {error_msg}")
+
+
+def _write_atomically(output_file: str, write: Callable[[BinaryIO], None]):
+    # Write to a uniquely named temporary file and rename, so readers never see a partial file
+    # and concurrent writers of the same output cannot clobber each other's temporary file
+    with atomic_open(output_file, "wb", durable=False) as out:
+        write(out)
+
+
+def _pack_ssml(texts: Sequence[str]) -> str:
+    """Joins texts into one SSML document with a <mark> named by position before each."""
+    return "<speak>" + _PACK_GAP.join(
+        f'<mark name="{i}"/>{xml_escape(text)}' for i, text in enumerate(texts)
+    ) + "</speak>"
+
+
+class DedupeResult(NamedTuple):
+    characters: int
+    unique_characters: int
+    # One entry per text: None on success, else the error message
+    errors: List[Optional[str]]
+
+    @property
+    def characters_saved(self) -> int:
+        return self.characters - self.unique_characters
+
 
 class ChirpTTS:
-    def __init__(self, credentials_path: Optional[str] = None):
-        if credentials_path:
-            os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = credentials_path
-        self.client = texttospeech.TextToSpeechClient()
+    def __init__(
+        self,
+        credentials_path: Optional[str] = None,
+        cache: Optional[SynthesisCache] = None,
+        max_chunk_bytes: int = DEFAULT_CHUNK_MAX_BYTES,
+        concurrency: int = 1,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        max_in_flight: Optional[int] = None,
+        audio_encoding: str = "MP3",
+        sample_rate_hertz: int = 0,
+        client: Optional[texttospeech.TextToSpeechClient] = None,
+        metrics: Optional[Metrics] = None,
+        normalizer: Optional[Callable[[str], str]] = None,
+        pool: Optional[ClientPool] = None,
+        lexicon: Optional[Lexicon] = None,
+        preset: Optional[Dict[str, Any]] = None
+    ):
+        # Passed to the client explicitly, so several instances can use different accounts in one process
+        self.credentials_path = credentials_path
+        self.cache = cache
+        self.max_chunk_bytes = max_chunk_bytes
+        self.concurrency = concurrency
+        if audio_encoding not in SUPPORTED_ENCODINGS:
+            raise ValueError(f"Unsupported audio encoding: {audio_encoding}. Choose from {', '.join(SUPPORTED_ENCODINGS)}")
+        self.audio_encoding = audio_encoding
+        self.sample_rate_hertz = sample_rate_hertz
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
+        # Shared by every thread using this instance, so batch rows and chunks back off together
+        self.throttle = AdaptiveConcurrency(max_in_flight or concurrency)
+        self.metrics = metrics or REGISTRY
+        # Applied to every input before caching and billing, e.g. a TextNormalizer
+        self.normalizer = normalizer
+        # Spreads synthesis requests over several projects; client and beta_client are used otherwise
+        self.pool = pool
+        # Substitutions are applied with normalization; phonetic spellings go into each request
+        self.lexicon = lexicon
+        # Speaking rate, pitch, gain and effects profile for every request, e.g. one of the configured presets
+        unknown = set(preset or {}) - set(PRESET_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown preset setting: {', '.join(sorted(unknown))}. Choose from {', '.join(PRESET_FIELDS)}")
+        self.preset = dict(preset or {})
+        if isinstance(self.preset.get("effects_profile_id"), str):
+            self.preset["effects_profile_id"] = [self.preset["effects_profile_id"]]
+        self._client = client
+        self._beta_client = None
+        self._client_lock = threading.Lock()
+        # Voices seen returning (or omitting) SSML mark timepoints; packing is only attempted for the former
+        self._mark_voices = set()
+        self._markless_voices = set()
+
+    @property
+    def client(self) -> texttospeech.TextToSpeechClient:
+        # Created on first use so cache hits never pay for credentials or a gRPC channel.
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    # Credential discovery and channel setup; token refresh happens on the first RPC
+                    with self.metrics.stage("client_init"):
+                        if self.pool is not None:
+                            self._client = self.pool.entries[0].client(texttospeech.TextToSpeechClient)
+                        elif self.credentials_path:
+                            self._client = texttospeech.TextToSpeechClient.from_service_account_file(
+                                self.credentials_path
+                            )
+                        else:
+                            self._client = texttospeech.TextToSpeechClient()
+        return self._client
+
+    @property
+    def beta_client(self) -> texttospeech_v1beta1.TextToSpeechClient:
+        # Only the v1beta1 surface returns SSML mark timepoints, used by synthesize_many()
+        if self._beta_client is None:
+            with self._client_lock:
+                if self._beta_client is None:
+                    with self.metrics.stage("client_init"):
+                        if self.credentials_path:
+                            self._beta_client = texttospeech_v1beta1.TextToSpeechClient.from_service_account_file(
+                                self.credentials_path
+                            )
+                        else:
+                            self._beta_client = texttospeech_v1beta1.TextToSpeechClient()
+        return self._beta_client
+
+    def _normalize(self, text: str) -> str:
+        if self.normalizer is not None:
+            normalized = self.normalizer(text)
+            if len(normalized) < len(text):
+                self.metrics.count("normalized_characters_saved", len(text) - len(normalized))
+            text = normalized
+        if self.lexicon is not None:
+            text = self.lexicon.substitute(text)
+        return text
+
+    def _custom_pronunciations(self, text: str, types=texttospeech) -> Dict[str, Any]:
+        """Returns SynthesisInput arguments carrying the lexicon's phonetic spellings that text uses."""
+        found = self.lexicon.pronunciations(text) if self.lexicon is not None else []
+        if not found:
+            return {}
+        params = types.CustomPronunciationParams
+        return {"custom_pronunciations": types.CustomPronunciations(pronunciations=[
+            params(
+                phrase=phrase,
+                phonetic_encoding=params.PhoneticEncoding[PHONETIC_ALPHABETS[entry.alphabet]],
+                pronunciation=entry.pronunciation,
+            )
+            for phrase, entry in found
+        ])}
 
     def list_voices(self, language_code: str = "en-US") -> List[str]:
         """Lists available Chirp 3 HD voices for a specific language."""
         voices = self.client.list_voices(language_code=language_code).voices
         chirp_voices = [
-            voice.name for voice in voices 
+            voice.name for voice in voices
             if "Chirp3-HD" in voice.name
         ]
         return chirp_voices
 
-    def synthesize(
-        self, 
-        text: str, 
-        voice_name: str = "en-US-Chirp3-HD-Aoede", 
-        output_file: str = "output.mp3"
-    ) -> str:
-        """Synthesizes text using Chirp 3 HD voice."""
-        input_text = texttospeech.SynthesisInput(text=text)
-        
+    def fetch_voices(self) -> List[VoiceInfo]:
+        """Fetches every voice across all languages, for the local voice catalog."""
+        return [
+            VoiceInfo(
+                name=voice.name,
+                language_codes=list(voice.language_codes),
+                gender=texttospeech.SsmlVoiceGender(voice.ssml_gender).name,
+                family=voice_family(voice.name),
+                natural_sample_rate_hertz=voice.natural_sample_rate_hertz,
+            )
+            for voice in self.client.list_voices().voices
+        ]
+
+    def stream(
+        self,
+        texts: Iterable[str],
+        voice_name: str = "en-US-Chirp3-HD-Aoede",
+        sample_rate: int = STREAMING_SAMPLE_RATE
+    ) -> Iterator[bytes]:
+        """Streams raw PCM for text pieces as they arrive, using the StreamingSynthesize RPC.
+
+        texts is consumed lazily, so pieces read from stdin are sent while earlier
+        audio is already playing.
+        """
+        streaming_config = texttospeech.StreamingSynthesizeConfig(
+            voice=texttospeech.VoiceSelectionParams(
+                language_code="-".join(voice_name.split("-")[:2]),
+                name=voice_name
+            ),
+            streaming_audio_config=texttospeech.StreamingAudioConfig(
+                audio_encoding=texttospeech.AudioEncoding.PCM,
+                sample_rate_hertz=sample_rate,
+                # The only preset setting streaming supports; phonetic spellings are not sent either
+                **{key: value for key, value in self.preset.items() if key == "speaking_rate"}
+            )
+        )
+
+        def requests() -> Iterator[texttospeech.StreamingSynthesizeRequest]:
+            yield texttospeech.StreamingSynthesizeRequest(streaming_config=streaming_config)
+            for text in texts:
+                for chunk in split_text(self._normalize(text), self.max_chunk_bytes):
+                    if self.rate_limiter is not None:
+                        with self.metrics.stage("rate_limit_wait"):
+                            self.rate_limiter.acquire(len(chunk))
+                    self.metrics.count("characters", len(chunk))
+                    yield texttospeech.StreamingSynthesizeRequest(
+                        input=texttospeech.StreamingSynthesisInput(text=chunk)
+                    )
+
+        client = self.client
+        start = time.perf_counter()
+        first_audio = True
+        self.metrics.count("stream_sessions")
+        try:
+            for response in client.streaming_synthesize(requests()):
+                if response.audio_content:
+                    if first_audio:
+                        self.metrics.observe("stream_first_audio", time.perf_counter() - start)
+                        first_audio = False
+                    self.metrics.count("bytes_received", len(response.audio_content))
+                    yield response.audio_content
+        except Exception as e:
+            self.metrics.count("rpc_errors")
+            raise _service_error(e) from e
+
+    def _call_with_retries(self, call: Callable[[Any], Any], characters: int, voice_name: str, beta: bool = False):
+        """Runs call(client) for one SynthesizeSpeech request, retrying transient errors.
+
+        With a pool, each attempt goes to the least-loaded project, and an
+        exhausted project fails over to another without backing off. Failures
+        are mapped to readable messages.
+        """
+        metrics = self.metrics
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                with metrics.stage("rate_limit_wait"):
+                    self.rate_limiter.acquire(characters)
+            entry = None
+            try:
+                with self.throttle:
+                    metrics.count("rpc_requests")
+                    if self.pool is None:
+                        client = self.beta_client if beta else self.client
+                        with metrics.stage("rpc", voice=voice_name, characters=characters):
+                            response = call(client)
+                    else:
+                        client_class = texttospeech_v1beta1.TextToSpeechClient if beta else texttospeech.TextToSpeechClient
+                        with self.pool.lease() as entry:
+                            client = entry.client(client_class)
+                            with metrics.stage("rpc", voice=voice_name, characters=characters, project=entry.project_id):
+                                response = call(client)
+                        self.pool.on_success(entry)
+                self.throttle.on_success()
+                metrics.count("characters", characters)
+                metrics.count("bytes_received", len(response.audio_content))
+                return response
+            except Exception as e:
+                metrics.count("rpc_errors")
+                if not self.retry_policy.is_retryable(e) or attempt + 1 >= self.retry_policy.max_attempts:
+                    raise _service_error(e) from e
+                if isinstance(e, core_exceptions.ResourceExhausted):
+                    if entry is not None and self.pool.on_exhausted(entry):
+                        metrics.count("failovers")
+                        attempt += 1
+                        continue
+                    self.throttle.on_throttled()
+                metrics.count("retries")
+                with metrics.stage("retry_backoff"):
+                    time.sleep(self.retry_policy.delay(attempt, e))
+                attempt += 1
+
+    def _synthesize_chunk(
+        self,
+        text: str,
+        voice: texttospeech.VoiceSelectionParams,
+        audio_config: texttospeech.AudioConfig
+    ) -> bytes:
+        response = self._call_with_retries(
+            lambda client: client.synthesize_speech(
+                input=texttospeech.SynthesisInput(text=text, **self._custom_pronunciations(text)),
+                voice=voice,
+                audio_config=audio_config
+            ),
+            len(text),
+            voice.name,
+        )
+        return response.audio_content
+
+    def _request_params(
+        self,
+        voice_name: str,
+        audio_encoding: Optional[str],
+        sample_rate_hertz: Optional[int]
+    ):
+        if audio_encoding is not None and audio_encoding not in SUPPORTED_ENCODINGS:
+            raise ValueError(f"Unsupported audio encoding: {audio_encoding}. Choose from {', '.join(SUPPORTED_ENCODINGS)}")
+        language_code = "-".join(voice_name.split("-")[:2])
         # Note: Chirp 3 HD voices are selected via name
         voice = texttospeech.VoiceSelectionParams(
-            language_code="-".join(voice_name.split("-")[:2]),
+            language_code=language_code,
             name=voice_name
         )
-
         audio_config = texttospeech.AudioConfig(
-            audio_encoding=texttospeech.AudioEncoding.MP3
+            audio_encoding=texttospeech.AudioEncoding[audio_encoding or self.audio_encoding],
+            sample_rate_hertz=sample_rate_hertz if sample_rate_hertz is not None else self.sample_rate_hertz,
+            **self.preset
         )
+        return voice, audio_config
 
-        try:
-            response = self.client.synthesize_speech(
-                input=input_text, voice=voice, audio_config=audio_config
-            )
+    def _cache_key(self, text: str, voice, audio_config, packed: bool = False) -> Optional[str]:
+        if self.cache is None:
+            return None
+        # The preset is part of audio_config; phonetic spellings used by the text are added here
+        audio = texttospeech.AudioConfig.to_dict(audio_config)
+        if self.lexicon is not None:
+            found = self.lexicon.pronunciations(text)
+            if found:
+                audio["pronunciations"] = [[phrase, entry.alphabet, entry.pronunciation] for phrase, entry in found]
+        if packed:
+            # Clips cut from a packed request are not byte-identical to standalone synthesis
+            audio["packed"] = True
+        return self.cache.make_key(text, voice.name, voice.language_code, audio)
 
-            # Ensure directory exists for output_file
-            output_path = os.path.dirname(output_file)
-            if output_path:
-                os.makedirs(output_path, exist_ok=True)
+    def _write_audio(self, out: BinaryIO, text: str, voice, audio_config, on_segment=None):
+        """Synthesizes text into out, chunking inputs above the request byte limit."""
+        chunks = [text] if _utf8_len(text) <= self.max_chunk_bytes else split_text(text, self.max_chunk_bytes)
+        self._write_chunks(out, chunks, voice, audio_config, on_segment)
 
-            with open(output_file, "wb") as out:
-                out.write(response.audio_content)
-            
-            return output_file
-        except Exception as e:
-            # Re-raise with a cleaner message if it's a known service issue
-            error_msg = str(e)
-            if "quota" in error_msg.lower():
-                raise Exception(f"API Quota exceeded: {error_msg}")
-            elif "authentication" in error_msg.lower() or "credentials" in error_msg.lower():
-                raise Exception(f"Authentication failed. Please run 'gcp-chirp setup' or set GOOGLE_APPLICATION_CREDENTIALS: {error_msg}")
-            elif "network" in error_msg.lower() or "connection" in error_msg.lower():
-                raise Exception(f"Network error: Please check your internet connection: {error_msg}")
-            else:
-                raise Exception(f"TTS Synthesis failed: {error_msg}")
+    def _write_chunks(
+        self,
+        out: BinaryIO,
+        chunks: Iterable[str],
+        voice,
+        audio_config,
+        on_segment: Optional[Callable[[bytes], None]] = None
+    ):
+        """Synthesizes chunks into out as they are pulled, so neither input nor audio is held in full.
+
+        on_segment, if given, receives each chunk's audio in order as soon as it is written.
+        """
+        writer = create_writer(
+            audio_config.audio_encoding.name, out, audio_config.sample_rate_hertz or DEFAULT_SAMPLE_RATE
+        )
+        # Chunks are synthesized concurrently; each segment is written once its prefix is complete
+        synthesize_chunk = partial(self._synthesize_chunk, voice=voice, audio_config=audio_config)
+        for segment in ordered_map(synthesize_chunk, chunks, self.concurrency):
+            with self.metrics.stage("write"):
+                writer.write(segment)
+            if on_segment is not None:
+                on_segment(segment)
+        with self.metrics.stage("write"):
+            writer.close()
+
+    def synthesize(
+        self,
+        text: str,
+        voice_name: str = "en-US-Chirp3-HD-Aoede",
+        output_file: str = "output.mp3",
+        audio_encoding: Optional[str] = None,
+        sample_rate_hertz: Optional[int] = None,
+        on_segment: Optional[Callable[[bytes], None]] = None
+    ) -> str:
+        """Synthesizes text using Chirp 3 HD voice, chunking inputs above the request byte limit.
+
+        on_segment receives each chunk's audio as it is written, e.g. AudioPlayer.put
+        to start playback before the rest is synthesized. Cache hits produce no segments.
+        """
+        voice, audio_config = self._request_params(voice_name, audio_encoding, sample_rate_hertz)
+        return self._synthesize_file(self._normalize(text), voice, audio_config, output_file, on_segment)
+
+    def _synthesize_file(self, text: str, voice, audio_config, output_file: str, on_segment=None) -> str:
+        """synthesize() for text that is already normalized, so lexicon substitutions are never applied twice."""
+        cache_key = self._cache_key(text, voice, audio_config)
+        if cache_key is not None:
+            with self.metrics.stage("cache_lookup"):
+                hit = self.cache.materialize(cache_key, output_file)
+            self.metrics.count("cache_hits" if hit else "cache_misses")
+            if hit:
+                return output_file
+
+        _write_atomically(output_file, lambda out: self._write_audio(out, text, voice, audio_config, on_segment))
+
+        if cache_key is not None:
+            with self.metrics.stage("cache_store"):
+                self.cache.store(cache_key, output_file)
+        return output_file
+
+    def synthesize_chunks(
+        self,
+        blocks: Iterable[str],
+        voice_name: str = "en-US-Chirp3-HD-Aoede",
+        output_file: str = "output.mp3",
+        audio_encoding: Optional[str] = None,
+        sample_rate_hertz: Optional[int] = None,
+        on_segment: Optional[Callable[[bytes], None]] = None
+    ) -> str:
+        """Synthesizes text read in blocks (e.g. from a large file), streaming audio to output_file.
+
+        Blocks are normalized and split with iter_split_text() as they are
+        consumed, a few requests ahead of the writer, so memory stays flat for
+        inputs of any size. The cache is bypassed because the key needs the
+        whole text. on_segment works as in synthesize().
+        """
+        voice, audio_config = self._request_params(voice_name, audio_encoding, sample_rate_hertz)
+        chunks = iter_split_text(blocks, self.max_chunk_bytes, self._normalize)
+        _write_atomically(output_file, lambda out: self._write_chunks(out, chunks, voice, audio_config, on_segment))
+        return output_file
+
+    def synthesize_chunks_to(
+        self,
+        blocks: Iterable[str],
+        out: BinaryIO,
+        voice_name: str = "en-US-Chirp3-HD-Aoede",
+        audio_encoding: Optional[str] = None,
+        sample_rate_hertz: Optional[int] = None
+    ):
+        """Like synthesize_chunks(), writing into a binary stream such as stdout."""
+        voice, audio_config = self._request_params(voice_name, audio_encoding, sample_rate_hertz)
+        chunks = iter_split_text(blocks, self.max_chunk_bytes, self._normalize)
+        self._write_chunks(out, chunks, voice, audio_config)
+        out.flush()
+
+    def synthesize_many(
+        self,
+        texts: Sequence[str],
+        output_files: Sequence[str],
+        voice_name: str = "en-US-Chirp3-HD-Aoede",
+        audio_encoding: Optional[str] = None,
+        sample_rate_hertz: Optional[int] = None
+    ) -> List[str]:
+        """Synthesizes many short texts with as few requests as the size limit allows.
+
+        Texts are packed into SSML documents with a <mark> before each item; the
+        returned timepoints give each item's start, and the audio is cut there into
+        one file per item. Encodings that cannot be cut (OGG_OPUS), items too long
+        to share a request, and responses missing marks (voices without SSML mark
+        support) fall back to one synthesize() call per item. Until a voice has
+        returned marks, one pack is sent on its own as a probe; once it comes back
+        without them, the voice is never packed again by this instance, so such
+        voices cost one extra request rather than one per pack.
+        """
+        if len(texts) != len(output_files):
+            raise ValueError("Expected one output file per text")
+        voice, audio_config = self._request_params(voice_name, audio_encoding, sample_rate_hertz)
+        options = {"audio_encoding": audio_config.audio_encoding.name, "sample_rate_hertz": audio_config.sample_rate_hertz}
+
+        pending = []
+        for text, output_file in zip(map(self._normalize, texts), output_files):
+            cache_key = self._cache_key(text, voice, audio_config, packed=True)
+            if cache_key is not None:
+                with self.metrics.stage("cache_lookup"):
+                    hit = self.cache.materialize(cache_key, output_file)
+                self.metrics.count("cache_hits" if hit else "cache_misses")
+                if hit:
+                    continue
+            pending.append((text, output_file, cache_key))
+
+        if options["audio_encoding"] not in PACKABLE_ENCODINGS:
+            packs = [[item] for item in pending]
+        else:
+            packs = self._pack(pending)
+
+        def run(pack):
+            packed = len(pack) > 1 and voice.name not in self._markless_voices
+            if not packed or not self._synthesize_pack(pack, voice, audio_config):
+                for text, output_file, _ in pack:
+                    self._synthesize_file(text, voice, audio_config, output_file)
+
+        if packs and voice.name not in self._mark_voices:
+            # Learn whether the voice returns marks before sending every pack in parallel
+            run(packs.pop(0))
+        for _ in unordered_map(run, packs, self.concurrency):
+            pass
+        return list(output_files)
+
+    def _pack(self, items):
+        """Greedily groups items so each group's SSML document stays within max_chunk_bytes."""
+        envelope = _utf8_len(_pack_ssml([]))
+        packs, current, size = [], [], envelope
+        for item in items:
+            item_size = _utf8_len(_pack_ssml([item[0]])) - envelope + len(f"{len(current)}{_PACK_GAP}")
+            if current and size + item_size > self.max_chunk_bytes:
+                packs.append(current)
+                current, size = [], envelope
+            current.append(item)
+            size += item_size
+        if current:
+            packs.append(current)
+        return packs
+
+    def _synthesize_pack(self, pack, voice, audio_config) -> bool:
+        """Sends one marked SSML request for a pack and writes its clips. Returns False if marks were missing."""
+        ssml = _pack_ssml([text for text, _, _ in pack])
+        request = texttospeech_v1beta1.SynthesizeSpeechRequest(
+            input=texttospeech_v1beta1.SynthesisInput(
+                ssml=ssml, **self._custom_pronunciations(" ".join(text for text, _, _ in pack), texttospeech_v1beta1)
+            ),
+            voice=texttospeech_v1beta1.VoiceSelectionParams(language_code=voice.language_code, name=voice.name),
+            audio_config=texttospeech_v1beta1.AudioConfig(texttospeech.AudioConfig.to_dict(audio_config)),
+            enable_time_pointing=[texttospeech_v1beta1.SynthesizeSpeechRequest.TimepointType.SSML_MARK],
+        )
+        response = self._call_with_retries(
+            lambda client: client.synthesize_speech(request=request), len(ssml), voice.name, beta=True
+        )
+
+        marks = {timepoint.mark_name: timepoint.time_seconds for timepoint in response.timepoints}
+        if any(str(i) not in marks for i in range(len(pack))):
+            self.metrics.count("pack_fallbacks")
+            self._markless_voices.add(voice.name)
+            return False
+        self._mark_voices.add(voice.name)
+        clips = split_audio(
+            audio_config.audio_encoding.name, response.audio_content, [marks[str(i)] for i in range(len(pack))]
+        )
+        for (_, output_file, cache_key), clip in zip(pack, clips):
+            with self.metrics.stage("write"):
+                _write_atomically(output_file, lambda out: out.write(clip))
+            if cache_key is not None:
+                with self.metrics.stage("cache_store"):
+                    self.cache.store(cache_key, output_file)
+        self.metrics.count("packed_items", len(pack))
+        return True
+
+    def synthesize_deduplicated(
+        self,
+        texts: Sequence[str],
+        output_files: Sequence[str],
+        voice_name: str = "en-US-Chirp3-HD-Aoede",
+        audio_encoding: Optional[str] = None,
+        sample_rate_hertz: Optional[int] = None,
+        concurrency: Optional[int] = None
+    ) -> DedupeResult:
+        """Synthesizes each distinct sentence across texts once and assembles every clip from them.
+
+        Texts are normalized and split into sentences; each unique sentence is
+        synthesized (through the cache, concurrency at a time) and clips are
+        joined from the shared segments like chunks of a long input. Sentences
+        are synthesized in isolation, so prosody across sentence boundaries can
+        differ slightly from whole-clip synthesis. Failures are reported per
+        text rather than raised.
+        """
+        if len(texts) != len(output_files):
+            raise ValueError("Expected one output file per text")
+        voice, audio_config = self._request_params(voice_name, audio_encoding, sample_rate_hertz)
+        encoding = audio_config.audio_encoding.name
+
+        clips = [list(iter_sentences(self._normalize(text))) for text in texts]
+        # Insertion-ordered, so segments are synthesized in first-use order
+        segments: Dict[str, str] = {}
+        for sentences in clips:
+            for sentence in sentences:
+                segments.setdefault(sentence, "")
+        # Both totals count the same normalized sentences, so characters_saved is only what deduplication
+        # saved; normalization savings are already counted as normalized_characters_saved
+        result = DedupeResult(
+            characters=sum(len(sentence) for sentences in clips for sentence in sentences),
+            unique_characters=sum(len(sentence) for sentence in segments),
+            errors=[],
+        )
+        self.metrics.count("dedupe_characters_saved", max(0, result.characters_saved))
+
+        failures: Dict[str, str] = {}
+        with tempfile.TemporaryDirectory(prefix="gcp-chirp-segments-") as segment_dir:
+            def run(item):
+                index, sentence = item
+                path = os.path.join(segment_dir, f"{index}{ENCODING_EXTENSIONS[encoding]}")
+                try:
+                    self._synthesize_file(sentence, voice, audio_config, path)
+                except Exception as e:
+                    failures[sentence] = str(e)
+                return sentence, path
+
+            for sentence, path in unordered_map(run, enumerate(segments), concurrency or self.concurrency):
+                segments[sentence] = path
+
+            for sentences, output_file in zip(clips, output_files):
+                error = next((failures[sentence] for sentence in sentences if sentence in failures), None)
+                if not sentences:
+                    error = "Input text is empty"
+                if error is None:
+                    paths = [segments[sentence] for sentence in sentences]
+                    try:
+                        with self.metrics.stage("write"):
+                            _write_atomically(output_file, partial(self._join_segments, paths, audio_config))
+                    except Exception as e:
+                        error = str(e)
+                result.errors.append(error)
+        return result
+
+    def _join_segments(self, paths: Sequence[str], audio_config, out: BinaryIO):
+        writer = create_writer(
+            audio_config.audio_encoding.name, out, audio_config.sample_rate_hertz or DEFAULT_SAMPLE_RATE
+        )
+        for path in paths:
+            with open(path, "rb") as f:
+                writer.write(f.read())
+        writer.close()
+
+    def synthesize_to(
+        self,
+        text: str,
+        out: BinaryIO,
+        voice_name: str = "en-US-Chirp3-HD-Aoede",
+        audio_encoding: Optional[str] = None,
+        sample_rate_hertz: Optional[int] = None
+    ):
+        """Synthesizes text straight into a binary stream such as stdout.
+
+        Audio goes to out as it arrives. On a cache miss the same segments are
+        also joined into a temporary file, which is then stored, so streamed
+        output fills the cache like synthesize() does.
+        """
+        text = self._normalize(text)
+        voice, audio_config = self._request_params(voice_name, audio_encoding, sample_rate_hertz)
+        cache_key = self._cache_key(text, voice, audio_config)
+        cached = None
+        if cache_key is not None:
+            with self.metrics.stage("cache_lookup"):
+                cached = self.cache.lookup(cache_key)
+            self.metrics.count("cache_hits" if cached is not None else "cache_misses")
+        if cached is not None:
+            with self.metrics.stage("write"):
+                _copy_file_to(cached, out)
+            return
+        if cache_key is None:
+            self._write_audio(out, text, voice, audio_config)
+            out.flush()
+            return
+
+        encoding = audio_config.audio_encoding.name
+        # A second writer of its own, since out may not be seekable for the WAV header to be finalized
+        with tempfile.NamedTemporaryFile(prefix="gcp-chirp-", suffix=ENCODING_EXTENSIONS[encoding]) as copy:
+            copy_writer = create_writer(encoding, copy, audio_config.sample_rate_hertz or DEFAULT_SAMPLE_RATE)
+            self._write_audio(out, text, voice, audio_config, on_segment=copy_writer.write)
+            out.flush()
+            copy_writer.close()
+            copy.flush()
+            with self.metrics.stage("cache_store"):
+                self.cache.store(cache_key, copy.name)
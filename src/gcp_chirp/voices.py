@@ -0,0 +1,143 @@
+import difflib
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+from .storage import FileLock, atomic_write, lock_path
+
+CHIRP3_HD_FAMILY = "Chirp3-HD"
+DEFAULT_CATALOG_TTL_SECONDS = 7 * 24 * 3600
+
+
+class VoiceInfo(NamedTuple):
+    name: str
+    language_codes: List[str]
+    gender: str
+    family: str
+    natural_sample_rate_hertz: int
+
+
+def voice_family(name: str) -> str:
+    """Extracts the family from a voice name, e.g. en-US-Chirp3-HD-Aoede -> Chirp3-HD."""
+    parts = name.split("-")
+    return "-".join(parts[2:-1]) if len(parts) > 3 else ""
+
+
+class VoiceCatalog:
+    """On-disk catalog of every voice, indexed by language, gender and family for offline lookups."""
+
+    def __init__(self, path: Path, ttl_seconds: float = DEFAULT_CATALOG_TTL_SECONDS):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.fetched_at = 0.0
+        self.etag = ""
+        self._voices: Dict[str, VoiceInfo] = {}
+        self._by_language: Dict[str, List[str]] = defaultdict(list)
+        self._by_gender: Dict[str, List[str]] = defaultdict(list)
+        self._by_family: Dict[str, List[str]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    @staticmethod
+    def compute_etag(voices: Iterable[VoiceInfo]) -> str:
+        payload = json.dumps(sorted((voice._asdict() for voice in voices), key=lambda v: v["name"]), sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _index(self, voices: Iterable[VoiceInfo]):
+        self._voices = {voice.name: voice for voice in voices}
+        self._by_language = defaultdict(list)
+        self._by_gender = defaultdict(list)
+        self._by_family = defaultdict(list)
+        for voice in self._voices.values():
+            for language in voice.language_codes:
+                self._by_language[language.lower()].append(voice.name)
+            self._by_gender[voice.gender.upper()].append(voice.name)
+            self._by_family[voice.family.lower()].append(voice.name)
+
+    def load(self) -> bool:
+        """Loads the catalog from disk. Returns False if there is no usable catalog yet."""
+        with self._lock:
+            if self._loaded:
+                return bool(self._voices)
+            self._loaded = True
+            try:
+                with open(self.path, "r") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                return False
+            self.fetched_at = data.get("fetched_at", 0.0)
+            self.etag = data.get("etag", "")
+            self._index(VoiceInfo(**voice) for voice in data.get("voices", []))
+            return bool(self._voices)
+
+    @property
+    def is_stale(self) -> bool:
+        self.load()
+        return not self._voices or time.time() - self.fetched_at > self.ttl_seconds
+
+    def update(self, voices: List[VoiceInfo]) -> bool:
+        """Replaces the catalog with freshly fetched voices. Returns True if the content changed."""
+        self.load()
+        etag = self.compute_etag(voices)
+        with self._lock:
+            changed = etag != self.etag
+            if changed:
+                # Unchanged content only bumps fetched_at, like a 304 Not Modified.
+                self._index(voices)
+                self.etag = etag
+            self.fetched_at = time.time()
+            self._save()
+        return changed
+
+    def _save(self):
+        data: Dict[str, Any] = {
+            "fetched_at": self.fetched_at,
+            "etag": self.etag,
+            "voices": [voice._asdict() for voice in self._voices.values()],
+        }
+        # Several processes may refresh at once; each rename installs a complete catalog
+        with FileLock(lock_path(self.path)):
+            atomic_write(self.path, json.dumps(data))
+
+    def __contains__(self, name: str) -> bool:
+        self.load()
+        return name in self._voices
+
+    def __len__(self) -> int:
+        self.load()
+        return len(self._voices)
+
+    def get(self, name: str) -> Optional[VoiceInfo]:
+        self.load()
+        return self._voices.get(name)
+
+    def find(
+        self,
+        language: Optional[str] = None,
+        gender: Optional[str] = None,
+        family: Optional[str] = None
+    ) -> List[VoiceInfo]:
+        """Returns voices matching every given filter, using the prebuilt indexes."""
+        self.load()
+        candidates = None
+        for index, key in (
+            (self._by_language, language and language.lower()),
+            (self._by_gender, gender and gender.upper()),
+            (self._by_family, family and family.lower()),
+        ):
+            if key:
+                names = set(index.get(key, ()))
+                candidates = names if candidates is None else candidates & names
+        names = self._voices.keys() if candidates is None else candidates
+        return sorted((self._voices[name] for name in names), key=lambda voice: voice.name)
+
+    def suggest(self, name: str, limit: int = 3) -> List[str]:
+        """Returns the closest known voice names, preferring the same language."""
+        self.load()
+        language = "-".join(name.split("-")[:2]).lower()
+        pool = {candidate.lower(): candidate for candidate in self._by_language.get(language) or self._voices}
+        matches = difflib.get_close_matches(name.lower(), list(pool), n=limit, cutoff=0.5)
+        return [pool[match] for match in matches]
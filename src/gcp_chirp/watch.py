@@ -0,0 +1,305 @@
+import ctypes
+import ctypes.util
+import fnmatch
+import hashlib
+import json
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from .audio import ENCODING_EXTENSIONS
+from .storage import FileLock, atomic_write, lock_path
+from .tts import ChirpTTS
+
+WATCH_STATE = ".gcp-chirp-watch.json"
+DEFAULT_PATTERNS = ("*.txt",)
+POLL_INTERVAL_SECONDS = 2.0
+
+# inotify(7) constants from <sys/inotify.h>
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_EVENT = struct.Struct("iIII")
+
+
+def content_hash(data: bytes, *settings: str) -> str:
+    """Hashes file content together with the settings that shape its audio (voice, encoding)."""
+    digest = hashlib.sha256()
+    for setting in settings:
+        digest.update(setting.encode("utf-8") + b"\0")
+    digest.update(data)
+    return digest.hexdigest()
+
+
+class WatchState:
+    """JSON record of the content hash last synthesized for each file, so restarts skip finished work.
+
+    Each record re-reads the file under a file lock and merges into it, so
+    several watchers sharing a directory keep each other's entries.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = FileLock(lock_path(self.path))
+        self._hashes = self._read()
+
+    def _read(self) -> Dict[str, str]:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f).get("files", {})
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, name: str) -> Optional[str]:
+        return self._hashes.get(name)
+
+    def record(self, name: str, digest: str):
+        with self._lock:
+            self._hashes = self._read()
+            self._hashes[name] = digest
+            atomic_write(self.path, json.dumps({"files": self._hashes}, indent=1, sort_keys=True))
+
+
+class InotifyWatcher:
+    """Reports files closed after writing or moved into a directory, using inotify(7) through ctypes.
+
+    Waiting for close-after-write rather than modification means a file is
+    only picked up once its writer is done with it.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, f"inotify_init1: {os.strerror(error)}")
+        if libc.inotify_add_watch(self._fd, os.fsencode(self.directory), _IN_CLOSE_WRITE | _IN_MOVED_TO) < 0:
+            error = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(error, f"inotify_add_watch {self.directory}: {os.strerror(error)}")
+
+    def changes(self, timeout: float) -> Optional[List[str]]:
+        """Returns names changed within timeout seconds, or None when events were lost and a rescan is due."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            buffer = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        names = []
+        offset = 0
+        while offset + _EVENT.size <= len(buffer):
+            _, mask, _, length = _EVENT.unpack_from(buffer, offset)
+            name = buffer[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b"\0")
+            offset += _EVENT.size + length
+            if mask & _IN_Q_OVERFLOW:
+                return None
+            if mask & _IN_IGNORED:
+                raise OSError(f"Stopped watching {self.directory}; was it removed?")
+            if name:
+                names.append(os.fsdecode(name))
+        return names
+
+    def close(self):
+        os.close(self._fd)
+
+
+class PollingWatcher:
+    """Fallback that rescans the directory, reporting files whose size and mtime held between two scans."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._previous = self._scan()
+        self._reported = dict(self._previous)
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        signatures = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        signatures[entry.name] = (stat.st_size, stat.st_mtime_ns)
+                except OSError:
+                    continue
+        return signatures
+
+    def changes(self, timeout: float) -> Optional[List[str]]:
+        time.sleep(timeout)
+        current = self._scan()
+        # A file still being written changes between scans; wait until it settles
+        settled = [
+            name for name, signature in current.items()
+            if self._previous.get(name) == signature and self._reported.get(name) != signature
+        ]
+        for name in settled:
+            self._reported[name] = current[name]
+        self._previous = current
+        return settled
+
+    def close(self):
+        pass
+
+
+def open_watcher(directory: Path, poll: bool = False):
+    """Returns an inotify watcher on Linux, falling back to polling elsewhere or if inotify is unavailable."""
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(directory)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(directory)
+
+
+class FolderWatcher:
+    """Synthesizes text files dropped into a directory into audio files next to them.
+
+    Files go through one shared ChirpTTS, so they share its cache, chunker
+    and rate limits, on a pool of concurrency worker threads. Audio is
+    written to a temporary file and renamed into place. A file whose
+    content hash matches the state file and whose audio exists is skipped,
+    so a restart only redoes new or changed files.
+    """
+
+    def __init__(
+        self,
+        tts: ChirpTTS,
+        directory: Path,
+        voice_name: str,
+        state: Optional[WatchState] = None,
+        patterns: Sequence[str] = DEFAULT_PATTERNS,
+        concurrency: int = 4,
+        on_result: Optional[Callable[[Dict[str, Any]], None]] = None
+    ):
+        self.tts = tts
+        self.directory = Path(directory)
+        self.voice_name = voice_name
+        self.state = state or WatchState(self.directory / WATCH_STATE)
+        self.patterns = list(patterns)
+        self.concurrency = concurrency
+        self.on_result = on_result
+        self._lock = threading.Lock()
+        self._in_flight = set()
+        # Files that changed again while being synthesized
+        self._dirty = set()
+
+    def matches(self, name: str) -> bool:
+        # Hidden files and in-progress writes (ours or anyone's) are never inputs
+        if name.startswith(".") or name.endswith((".part", ".tmp")):
+            return False
+        return any(fnmatch.fnmatch(name, pattern) for pattern in self.patterns)
+
+    def output_for(self, path: Path) -> Path:
+        return path.with_suffix(ENCODING_EXTENSIONS[self.tts.audio_encoding])
+
+    def _settings(self) -> List[str]:
+        """Everything besides the text that shapes a file's audio, for its state digest."""
+        settings = [self.voice_name, self.tts.audio_encoding, str(self.tts.sample_rate_hertz)]
+        # Non-default settings are only hashed when set, so state recorded without them stays valid
+        if self.tts.preset:
+            settings.append(json.dumps(self.tts.preset, sort_keys=True))
+        normalizer = self.tts.normalizer
+        if normalizer is None:
+            settings.append("normalize_text:off")
+        elif normalizer.abbreviations:
+            settings.append("abbreviations:" + json.dumps(normalizer.abbreviations, sort_keys=True))
+        if self.tts.lexicon is not None and len(self.tts.lexicon):
+            settings.append("lexicon:" + json.dumps(self.tts.lexicon.entries))
+        return settings
+
+    def process(self, name: str) -> Dict[str, Any]:
+        """Synthesizes one file unless its current content was already done. Returns a result record."""
+        path = self.directory / name
+        output = self.output_for(path)
+        result = {"file": str(path), "output": str(output)}
+        start = time.perf_counter()
+        try:
+            data = path.read_bytes()
+            digest = content_hash(data, *self._settings())
+            if self.state.get(name) == digest and output.exists():
+                result["status"] = "skipped"
+            else:
+                text = data.decode("utf-8")
+                if not text.strip():
+                    raise ValueError("Input text is empty")
+                self.tts.synthesize(text, self.voice_name, str(output))
+                self.state.record(name, digest)
+                result["status"] = "ok"
+        except FileNotFoundError:
+            result["status"] = "skipped"
+        except Exception as e:
+            result["status"] = "error"
+            result["error"] = str(e)
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        return result
+
+    def _run_one(self, pool: ThreadPoolExecutor, name: str):
+        result = self.process(name)
+        if self.on_result:
+            self.on_result(result)
+        with self._lock:
+            self._in_flight.discard(name)
+            again = name in self._dirty
+            self._dirty.discard(name)
+        if again:
+            self.submit(pool, name)
+
+    def submit(self, pool: ThreadPoolExecutor, name: str):
+        if not self.matches(name):
+            return
+        with self._lock:
+            if name in self._in_flight:
+                self._dirty.add(name)
+                return
+            self._in_flight.add(name)
+        try:
+            pool.submit(self._run_one, pool, name)
+        except RuntimeError:
+            # Shutting down; the changed hash gets it picked up on the next start
+            with self._lock:
+                self._in_flight.discard(name)
+
+    def scan(self, pool: ThreadPoolExecutor):
+        for name in sorted(os.listdir(self.directory)):
+            if (self.directory / name).is_file():
+                self.submit(pool, name)
+
+    def run(
+        self,
+        once: bool = False,
+        poll: bool = False,
+        interval: float = POLL_INTERVAL_SECONDS,
+        stop: Optional[threading.Event] = None
+    ):
+        """Processes existing files, then new and changed ones until stop is set (or at once if once)."""
+        stop = stop or threading.Event()
+        # Opened before the first scan, so nothing written in between is missed
+        watcher = None if once else open_watcher(self.directory, poll)
+        pool = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="gcp-chirp-watch")
+        interrupted = True
+        try:
+            self.scan(pool)
+            while watcher is not None and not stop.is_set():
+                names = watcher.changes(interval)
+                if names is None:
+                    self.scan(pool)
+                    continue
+                for name in names:
+                    self.submit(pool, name)
+            interrupted = False
+        finally:
+            if watcher is not None:
+                watcher.close()
+            # Files already started finish, and their audio is renamed into place only when complete.
+            # Queued ones are dropped when stopping, since their content hash brings them back next time.
+            pool.shutdown(wait=True, cancel_futures=interrupted or not once)
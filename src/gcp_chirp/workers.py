@@ -0,0 +1,57 @@
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from typing import Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def ordered_map(fn: Callable[[T], R], items: Iterable[T], concurrency: int = 1) -> Iterator[R]:
+    """Applies fn to items on a bounded thread pool, yielding results in input order.
+
+    At most 2 * concurrency items are in flight, so a slow head item lets the
+    workers run ahead without buffering the whole input. Each result is yielded
+    as soon as every result before it is ready.
+    """
+    if concurrency <= 1:
+        for item in items:
+            yield fn(item)
+        return
+
+    pool = ThreadPoolExecutor(max_workers=concurrency)
+    pending = deque()
+    try:
+        for item in items:
+            pending.append(pool.submit(fn, item))
+            while pending and (pending[0].done() or len(pending) >= concurrency * 2):
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def unordered_map(fn: Callable[[T], R], items: Iterable[T], concurrency: int = 1) -> Iterator[R]:
+    """Applies fn to items on a bounded thread pool, yielding results as they complete.
+
+    Items are pulled from the iterable lazily, so at most 2 * concurrency are
+    held in memory at once regardless of the input size.
+    """
+    if concurrency <= 1:
+        for item in items:
+            yield fn(item)
+        return
+
+    pool = ThreadPoolExecutor(max_workers=concurrency)
+    pending = set()
+    try:
+        for item in items:
+            pending.add(pool.submit(fn, item))
+            if len(pending) >= concurrency * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in as_completed(pending):
+            yield future.result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,26 @@
+import struct
+
+
+class FakeClock:
+    """Stands in for time.monotonic/time.time; sleep() advances it instantly and records the delay."""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_wav(pcm: bytes, rate: int = 24000) -> bytes:
+    """Builds a 16-bit mono PCM WAV file by hand, independent of the WavWriter under test."""
+    fmt = struct.pack("<HHIIHH", 1, 1, rate, rate * 2, 2, 16)
+    return (
+        b"RIFF" + struct.pack("<I", 4 + 8 + len(fmt) + 8 + len(pcm)) + b"WAVE"
+        + b"fmt " + struct.pack("<I", len(fmt)) + fmt
+        + b"data" + struct.pack("<I", len(pcm)) + pcm
+    )
@@ -0,0 +1,131 @@
+import io
+import struct
+from gcp_chirp.audio import Mp3Writer, WavWriter, create_writer, iter_mp3_frames, parse_wav, pcm_format, silence_like, split_audio
+from tests.helpers import make_wav
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz, no padding: 417-byte frames.
+FRAME_HEADER = b"\xff\xfb\x90\x64"
+FRAME_LENGTH = 417
+
+def make_frame(fill: bytes = b"\x00") -> bytes:
+    return FRAME_HEADER + fill * (FRAME_LENGTH - 4)
+
+def make_info_frame() -> bytes:
+    body = bytearray(FRAME_LENGTH - 4)
+    body[32:36] = b"Info"
+    return FRAME_HEADER + bytes(body)
+
+def make_mp3(frames: int, fill: bytes) -> bytes:
+    id3 = b"ID3\x04\x00\x00\x00\x00\x00\x05" + b"\x00" * 5
+    return id3 + make_info_frame() + make_frame(fill) * frames
+
+def test_iter_mp3_frames_skips_tags():
+    data = make_mp3(3, b"\x01")
+    frames = list(iter_mp3_frames(data))
+    assert len(frames) == 4
+    assert frames[0].offset == 15
+    assert all(frame.length == FRAME_LENGTH for frame in frames)
+
+def test_mp3_writer_single_segment_is_verbatim():
+    out = io.BytesIO()
+    writer = Mp3Writer(out)
+    segment = make_mp3(2, b"\x01")
+    writer.write(segment)
+    writer.close()
+    assert out.getvalue() == segment
+
+def test_mp3_writer_joins_at_frame_boundaries():
+    out = io.BytesIO()
+    writer = create_writer("MP3", out)
+    writer.write(make_mp3(2, b"\x01"))
+    writer.write(make_mp3(3, b"\x02"))
+    writer.close()
+    assert out.getvalue() == make_frame(b"\x01") * 2 + make_frame(b"\x02") * 3
+
+def test_wav_writer_rewrites_header():
+    out = io.BytesIO()
+    writer = WavWriter(out)
+    writer.write(make_wav(b"\x01\x00" * 10))
+    writer.write(make_wav(b"\x02\x00" * 5))
+    writer.close()
+
+    joined = out.getvalue()
+    assert joined == make_wav(b"\x01\x00" * 10 + b"\x02\x00" * 5)
+    wav = parse_wav(joined)
+    assert wav.data_length == 30
+
+def test_wav_writer_rejects_mismatched_formats():
+    writer = WavWriter(io.BytesIO())
+    writer.write(make_wav(b"\x00\x00", rate=24000))
+    try:
+        writer.write(make_wav(b"\x00\x00", rate=16000))
+    except ValueError as e:
+        assert "different sample formats" in str(e)
+    else:
+        raise AssertionError("expected ValueError")
+
+def test_wav_writer_raw_pcm_segments():
+    out = io.BytesIO()
+    writer = WavWriter(out, raw_format=pcm_format(24000))
+    writer.write(b"\x01\x00" * 4)
+    writer.write(b"\x02\x00" * 4)
+    writer.close()
+    assert out.getvalue() == make_wav(b"\x01\x00" * 4 + b"\x02\x00" * 4)
+
+def test_create_writer_labels_headerless_mulaw():
+    out = io.BytesIO()
+    writer = create_writer("MULAW", out, sample_rate=8000)
+    writer.write(b"\xff" * 8)
+    writer.close()
+    wav = parse_wav(out.getvalue())
+    assert wav.fmt_chunk == pcm_format(8000, bits_per_sample=8, format_tag=7)
+    assert wav.data_length == 8
+
+def test_create_writer_chains_ogg_streams():
+    out = io.BytesIO()
+    writer = create_writer("OGG_OPUS", out)
+    writer.write(b"OggS-one")
+    writer.write(b"OggS-two")
+    writer.close()
+    assert out.getvalue() == b"OggS-oneOggS-two"
+
+def test_split_audio_wav_at_sample_offsets():
+    pcm = b"".join(struct.pack("<h", i) for i in range(100))
+    clips = split_audio("LINEAR16", make_wav(pcm, rate=1000), [0.0, 0.03, 0.07])
+
+    datas = [clip[parse_wav(clip).data_offset:] for clip in clips]
+    assert datas == [pcm[:60], pcm[60:140], pcm[140:]]
+    assert all(parse_wav(clip).fmt_chunk == parse_wav(make_wav(pcm, rate=1000)).fmt_chunk for clip in clips)
+
+def test_split_audio_mp3_at_frame_boundaries():
+    frame_seconds = 1152 / 44100
+    data = make_mp3(2, b"\x01") + make_mp3(3, b"\x02")[15 + FRAME_LENGTH:]
+    clips = split_audio("MP3", data, [0.0, 2 * frame_seconds - 0.001])
+
+    assert clips[0] == make_frame(b"\x01") * 2
+    assert clips[1] == make_frame(b"\x02") * 3
+
+
+def test_silence_like_matches_segment_format():
+    import pytest
+
+    silence = silence_like("LINEAR16", make_wav(b"\x01\x00" * 4, rate=8000), 0.5)
+    wav = parse_wav(silence)
+    assert wav.data_length == 8000 and set(silence[wav.data_offset:]) == {0}
+
+    for encoding, tag, byte in (("MULAW", 7, 0xFF), ("ALAW", 6, 0xD5)):
+        buffer = io.BytesIO()
+        writer = WavWriter(buffer, raw_format=pcm_format(8000, bits_per_sample=8, format_tag=tag))
+        writer.write(b"\x10" * 4)
+        writer.close()
+        silence = silence_like(encoding, buffer.getvalue(), 0.25)
+        wav = parse_wav(silence)
+        assert wav.data_length == 2000 and set(silence[wav.data_offset:]) == {byte}
+
+    # 44.1 kHz MPEG-1 frames last 1152 samples, about 26 ms
+    silence = silence_like("MP3", make_mp3(2, b"\x01"), 0.26)
+    frames = list(iter_mp3_frames(silence))
+    assert len(frames) == 10 and all(frame.header[:3] == b"\xff\xfb\x90" for frame in frames)
+
+    with pytest.raises(ValueError):
+        silence_like("OGG_OPUS", b"OggS", 1.0)
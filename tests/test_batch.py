@@ -0,0 +1,104 @@
+import json
+from pathlib import Path
+from gcp_chirp.batch import load_completed, read_manifest, run_batch
+
+class FakeTTS:
+    audio_encoding = "MP3"
+
+    def __init__(self, fail_ids=()):
+        self.calls = []
+        self.fail_ids = set(fail_ids)
+
+    def synthesize(self, text, voice_name, output_file, **options):
+        self.calls.append((text, voice_name, output_file))
+        if text in self.fail_ids:
+            raise Exception("TTS Synthesis failed: boom")
+        Path(output_file).write_bytes(b"audio")
+        return output_file
+
+def write_jsonl(path, rows):
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+
+def test_read_manifest_csv(tmp_path):
+    manifest = tmp_path / "clips.csv"
+    manifest.write_text("id,text,voice,output\n1,Hello,,hello.mp3\n2,World,en-US-Chirp3-HD-Charon,\n")
+    rows = list(read_manifest(manifest))
+    assert rows[0].id == "1" and rows[0].voice is None and rows[0].output == "hello.mp3"
+    assert rows[1].voice == "en-US-Chirp3-HD-Charon" and rows[1].output is None
+
+def test_run_batch_writes_results(tmp_path):
+    manifest = tmp_path / "clips.jsonl"
+    write_jsonl(manifest, [
+        {"id": "a", "text": "Hello"},
+        {"id": "b", "text": "World", "voice": "en-US-Chirp3-HD-Charon", "output": "world.mp3"},
+        {"id": "c", "text": "bad"},
+    ])
+    results = tmp_path / "results.jsonl"
+    tts = FakeTTS(fail_ids=["bad"])
+
+    summary = run_batch(tts, manifest, results, "en-US-Chirp3-HD-Aoede", output_dir=tmp_path, concurrency=2)
+
+    assert summary == {"ok": 2, "skipped": 0, "error": 1, "resumed": 0}
+    assert (tmp_path / "a.mp3").exists()
+    assert (tmp_path / "world.mp3").exists()
+    lines = {r["id"]: r for r in map(json.loads, results.read_text().splitlines())}
+    assert lines["c"]["status"] == "error"
+    assert "latency_ms" in lines["a"]
+
+def test_run_batch_resumes(tmp_path):
+    manifest = tmp_path / "clips.jsonl"
+    write_jsonl(manifest, [{"id": "a", "text": "Hello"}, {"id": "b", "text": "World"}, {"id": "c", "text": "Again"}])
+    results = tmp_path / "results.jsonl"
+    results.write_text(json.dumps({"id": "a", "status": "ok"}) + "\n" + '{"id": "b", "sta')
+    (tmp_path / "c.mp3").write_bytes(b"existing")
+
+    assert load_completed(results) == {"a"}
+    tts = FakeTTS()
+    summary = run_batch(tts, manifest, results, "en-US-Chirp3-HD-Aoede", output_dir=tmp_path)
+
+    assert summary == {"ok": 1, "skipped": 1, "error": 0, "resumed": 1}
+    assert [call[0] for call in tts.calls] == ["World"]
+
+class PackingTTS(FakeTTS):
+    def synthesize_many(self, texts, output_files, voice_name, **options):
+        self.calls.append((tuple(texts), voice_name))
+        for output_file in output_files:
+            Path(output_file).write_bytes(b"clip")
+        return list(output_files)
+
+def test_run_batch_pack_groups_by_voice(tmp_path):
+    manifest = tmp_path / "clips.jsonl"
+    write_jsonl(manifest, [
+        {"id": "a", "text": "Hi"},
+        {"id": "b", "text": "Bye", "voice": "en-US-Chirp3-HD-Charon"},
+        {"id": "c", "text": "Yo"},
+        {"id": "d", "text": " "},
+    ])
+    tts = PackingTTS()
+
+    summary = run_batch(tts, manifest, tmp_path / "results.jsonl", "en-US-Chirp3-HD-Aoede", output_dir=tmp_path, pack=True)
+
+    assert summary == {"ok": 3, "skipped": 0, "error": 1, "resumed": 0}
+    assert sorted(tts.calls) == [(("Bye",), "en-US-Chirp3-HD-Charon"), (("Hi", "Yo"), "en-US-Chirp3-HD-Aoede")]
+    assert (tmp_path / "c.mp3").read_bytes() == b"clip"
+
+class DedupingTTS(FakeTTS):
+    def synthesize_deduplicated(self, texts, output_files, voice_name, **options):
+        from gcp_chirp.tts import DedupeResult
+
+        self.calls.append((tuple(texts), voice_name, options.get("concurrency")))
+        for output_file in output_files:
+            Path(output_file).write_bytes(b"clip")
+        return DedupeResult(characters=100, unique_characters=40, errors=[None] * len(texts))
+
+def test_run_batch_dedupe_reports_characters_saved(tmp_path):
+    manifest = tmp_path / "clips.jsonl"
+    write_jsonl(manifest, [{"id": "a", "text": "Hi. Bye."}, {"id": "b", "text": "Hi."}, {"id": "c", "text": ""}])
+    tts = DedupingTTS()
+
+    summary = run_batch(
+        tts, manifest, tmp_path / "results.jsonl", "en-US-Chirp3-HD-Aoede", output_dir=tmp_path, concurrency=3, dedupe=True
+    )
+
+    assert summary == {"ok": 2, "skipped": 0, "error": 1, "resumed": 0, "characters_saved": 60}
+    assert tts.calls == [(("Hi. Bye.", "Hi."), "en-US-Chirp3-HD-Aoede", 3)]
@@ -0,0 +1,85 @@
+import json
+import pytest
+from typer.testing import CliRunner
+from gcp_chirp.audio import iter_mp3_frames, parse_wav
+from gcp_chirp.bench import BenchConfig, peak_rss_mb, percentile, run_benchmarks
+from gcp_chirp.cli import app
+from gcp_chirp.fakeserver import FakeServerConfig, fake_client, start_fake_server
+from gcp_chirp.ratelimit import RetryPolicy
+from gcp_chirp.tts import ChirpTTS
+
+runner = CliRunner()
+
+@pytest.fixture
+def fake_server():
+    server, servicer, address = start_fake_server(FakeServerConfig(latency_ms=1, jitter_ms=0, payload_bytes=960))
+    yield servicer, address
+    server.stop(grace=None)
+
+def test_percentile():
+    values = [0.1 * i for i in range(1, 101)]
+    assert percentile(values, 50) == pytest.approx(5.0)
+    assert percentile(values, 99) == pytest.approx(9.9)
+    assert percentile([], 95) == 0.0
+
+def test_chunked_synthesis_over_real_grpc(fake_server, tmp_path):
+    servicer, address = fake_server
+    tts = ChirpTTS(max_chunk_bytes=40, concurrency=3, client=fake_client(address))
+    output = tmp_path / "long.mp3"
+
+    tts.synthesize("One sentence here. " * 10, "en-US-Chirp3-HD-Aoede", str(output))
+
+    assert servicer.requests == 5
+    frames = list(iter_mp3_frames(output.read_bytes()))
+    assert len(frames) == 5 * 10
+    assert tts.list_voices("en-US") == ["en-US-Chirp3-HD-Aoede", "en-US-Chirp3-HD-Charon"]
+
+    wav = tmp_path / "clip.wav"
+    tts.synthesize("Hi", "en-US-Chirp3-HD-Aoede", str(wav), audio_encoding="LINEAR16", sample_rate_hertz=16000)
+    assert parse_wav(wav.read_bytes()).data_length == 960
+
+def test_injected_errors_are_retried(tmp_path):
+    server, servicer, address = start_fake_server(FakeServerConfig(latency_ms=0, jitter_ms=0, error_rate=0.5))
+    try:
+        tts = ChirpTTS(
+            retry_policy=RetryPolicy(max_attempts=20, initial_backoff=0.001, max_backoff=0.001),
+            client=fake_client(address),
+        )
+        for i in range(5):
+            tts.synthesize(f"Clip {i}", "en-US-Chirp3-HD-Aoede", str(tmp_path / f"{i}.mp3"))
+        assert servicer.requests > 5
+    finally:
+        server.stop(grace=None)
+
+def test_run_benchmarks_report():
+    report = run_benchmarks(BenchConfig(requests=8, concurrency=2, latency_ms=1, jitter_ms=0, payload_bytes=960))
+
+    assert set(report["scenarios"]) == {"single", "batch", "chunked", "streaming"}
+    for result in report["scenarios"].values():
+        assert result["errors"] == 0
+        assert result["requests_per_sec"] > 0
+        assert result["chars_per_sec"] > 0
+        assert result["latency_ms"]["p50"] <= result["latency_ms"]["p99"]
+        assert result["peak_rss_mb"] > 0
+    assert report["scenarios"]["single"]["requests"] == 8
+    json.dumps(report)
+
+def test_peak_rss_is_per_scenario():
+    ballast = b"x" * (256 * 1024 * 1024)
+    report = run_benchmarks(BenchConfig(requests=2, concurrency=1, latency_ms=0, jitter_ms=0, payload_bytes=960), ["single"])
+    # Measured in a fresh process, so this process's earlier peak does not leak in
+    assert report["scenarios"]["single"]["peak_rss_mb"] < peak_rss_mb() - 200
+    del ballast
+
+def test_run_benchmarks_rejects_unknown_scenario():
+    with pytest.raises(ValueError, match="Unknown scenario"):
+        run_benchmarks(BenchConfig(requests=1), ["warp"])
+
+def test_bench_command_json(tmp_path):
+    result = runner.invoke(app, [
+        "bench", "-n", "4", "--latency-ms", "1", "--jitter-ms", "0",
+        "--scenarios", "single,streaming", "--output", "-",
+    ])
+    assert result.exit_code == 0
+    report = json.loads(result.stdout)
+    assert list(report["scenarios"]) == ["single", "streaming"]
@@ -0,0 +1,107 @@
+import os
+from gcp_chirp.cache import SynthesisCache, normalize_text
+
+def test_normalize_text_collapses_whitespace():
+    assert normalize_text("  Hello \n\t world  ") == "Hello world"
+
+def test_make_key_depends_on_voice_and_config():
+    base = SynthesisCache.make_key("Hello", "en-US-Chirp3-HD-Aoede", "en-US", {"audio_encoding": 2})
+    assert base == SynthesisCache.make_key("Hello ", "en-US-Chirp3-HD-Aoede", "en-US", {"audio_encoding": 2})
+    assert base != SynthesisCache.make_key("Hello", "en-US-Chirp3-HD-Charon", "en-US", {"audio_encoding": 2})
+    assert base != SynthesisCache.make_key("Hello", "en-US-Chirp3-HD-Aoede", "en-US", {"audio_encoding": 1})
+
+def test_store_and_materialize(tmp_path):
+    cache = SynthesisCache(tmp_path / "cache")
+    source = tmp_path / "source.mp3"
+    source.write_bytes(b"audio bytes")
+
+    assert not cache.materialize("abc123", str(tmp_path / "miss.mp3"))
+    cache.store("abc123", str(source))
+
+    output = tmp_path / "out" / "hit.mp3"
+    assert cache.materialize("abc123", str(output))
+    assert output.read_bytes() == b"audio bytes"
+
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+def test_lru_eviction(tmp_path, mocker):
+    cache = SynthesisCache(tmp_path / "cache", max_bytes=25)
+    source = tmp_path / "source.mp3"
+    source.write_bytes(b"x" * 10)
+
+    clock = mocker.patch("gcp_chirp.cache.time.time")
+    clock.return_value = 1.0
+    cache.store("aa01", str(source))
+    clock.return_value = 2.0
+    cache.store("bb02", str(source))
+    clock.return_value = 3.0
+    assert cache.lookup("aa01") is not None  # aa01 is now most recently used
+    clock.return_value = 4.0
+    cache.store("cc03", str(source))
+
+    assert cache.lookup("bb02") is None
+    assert cache.lookup("aa01") is not None
+    assert cache.lookup("cc03") is not None
+
+def test_prune_and_clear(tmp_path):
+    cache = SynthesisCache(tmp_path / "cache")
+    source = tmp_path / "source.mp3"
+    source.write_bytes(b"x" * 10)
+    cache.store("aa01", str(source))
+    cache.store("bb02", str(source))
+
+    removed, freed = cache.prune(max_bytes=10)
+    assert (removed, freed) == (1, 10)
+    assert cache.stats()["entries"] == 1
+
+    cache.clear()
+    assert not os.path.exists(tmp_path / "cache")
+    assert cache.stats()["entries"] == 0
+
+def test_lookup_does_not_rewrite_index(tmp_path):
+    cache = SynthesisCache(tmp_path / "cache")
+    source = tmp_path / "source.mp3"
+    source.write_bytes(b"audio bytes")
+    cache.store("abc123", str(source))
+    before = cache.index_file.stat().st_mtime_ns
+
+    for _ in range(3):
+        assert cache.lookup("abc123") is not None
+    assert cache.lookup("missing") is None
+
+    assert cache.index_file.stat().st_mtime_ns == before
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (3, 1)
+    # Counters survive being folded into the index
+    cache.prune()
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (3, 1)
+
+def test_editing_output_keeps_cached_audio(tmp_path):
+    cache = SynthesisCache(tmp_path / "cache")
+    source = tmp_path / "source.mp3"
+    source.write_bytes(b"audio bytes")
+    cache.store("abc123", str(source))
+
+    output = tmp_path / "hit.mp3"
+    assert cache.materialize("abc123", str(output))
+    with open(output, "r+b") as f:
+        f.write(b"edited")
+
+    again = tmp_path / "again.mp3"
+    assert cache.materialize("abc123", str(again))
+    assert again.read_bytes() == b"audio bytes"
+
+def test_link_outputs_is_opt_in(tmp_path):
+    source = tmp_path / "source.mp3"
+    source.write_bytes(b"audio bytes")
+    copied = SynthesisCache(tmp_path / "copied")
+    copied.store("abc123", str(source))
+    assert copied.materialize("abc123", str(tmp_path / "copy.mp3"))
+    assert (tmp_path / "copy.mp3").stat().st_nlink == 1
+
+    linked = SynthesisCache(tmp_path / "linked", link_outputs=True)
+    linked.store("abc123", str(source))
+    assert linked.materialize("abc123", str(tmp_path / "link.mp3"))
+    assert (tmp_path / "link.mp3").stat().st_nlink == 2
@@ -32,3 +32,228 @@ def test_say_with_file(mocker, tmp_path):
     result = runner.invoke(app, ["say", "--file", str(test_file), "--no-play"])
     assert result.exit_code == 0
     assert "Success" in result.stdout
+
+def test_say_timings(mocker, tmp_path):
+    mocker.patch("gcp_chirp.cli.config_manager.config_dir", tmp_path)
+    mocker.patch.dict("os.environ", {"GOOGLE_CLOUD_PROJECT": "test-project"}, clear=True)
+    mocker.patch("gcp_chirp.cli.ChirpTTS.synthesize", return_value="output.mp3")
+
+    result = runner.invoke(app, ["say", "Hello", "--no-play", "--no-daemon", "--timings", "--output", str(tmp_path / "o.mp3")])
+    assert result.exit_code == 0
+    assert "Timings" in result.stdout
+    assert "synthesize" in result.stdout
+
+def test_say_play_streams_segments_to_player(mocker, tmp_path):
+    mocker.patch("gcp_chirp.cli.config_manager.config_dir", tmp_path)
+    mocker.patch.dict("os.environ", {"GOOGLE_CLOUD_PROJECT": "test-project"}, clear=True)
+    player = mocker.Mock(segments=0)
+    mocker.patch("gcp_chirp.playback.open_player", return_value=player)
+    system = mocker.patch("os.system")
+
+    def synthesize(text, voice, output_file, on_segment=None, **options):
+        on_segment(b"segment")
+        player.segments = 1
+        return output_file
+
+    mocker.patch("gcp_chirp.cli.ChirpTTS.synthesize", side_effect=synthesize)
+    result = runner.invoke(app, ["say", "Hello", "--play", "--no-daemon", "--output", str(tmp_path / "it's.mp3")])
+
+    assert result.exit_code == 0
+    player.put.assert_called_once_with(b"segment")
+    player.close.assert_called_once()
+    system.assert_not_called()
+
+def test_say_play_falls_back_to_file_player(mocker, tmp_path):
+    mocker.patch("gcp_chirp.cli.config_manager.config_dir", tmp_path)
+    mocker.patch.dict("os.environ", {"GOOGLE_CLOUD_PROJECT": "test-project"}, clear=True)
+    mocker.patch("gcp_chirp.playback.open_player", return_value=None)
+    play_file = mocker.patch("gcp_chirp.playback.play_file", return_value=True)
+    mocker.patch("gcp_chirp.cli.ChirpTTS.synthesize", side_effect=lambda text, voice, output_file, **options: output_file)
+
+    output = str(tmp_path / "it's.mp3")
+    result = runner.invoke(app, ["say", "Hello", "--play", "--no-daemon", "--output", output])
+    assert result.exit_code == 0
+    play_file.assert_called_once_with(output)
+
+def test_render_script(mocker, tmp_path):
+    mocker.patch("gcp_chirp.cli.config_manager.config_dir", tmp_path)
+    mocker.patch.dict("os.environ", {"GOOGLE_CLOUD_PROJECT": "test-project"}, clear=True)
+    render_script = mocker.patch(
+        "gcp_chirp.render.render_script",
+        return_value={"lines": 2, "synthesized": 2, "characters": 9, "characters_saved": 0},
+    )
+    script = tmp_path / "dialogue.yaml"
+    script.write_text("voices:\n  a: en-US-Chirp3-HD-Aoede\nlines:\n  - a: Hello.\n  - a: Bye.\n")
+
+    result = runner.invoke(app, ["render", str(script), "--pause-ms", "250"])
+    assert result.exit_code == 0
+    assert "2 lines" in result.stdout
+    _, parsed, output = render_script.call_args.args[:3]
+    assert output == str(tmp_path / "dialogue.mp3")
+    assert [line.pause_ms for line in parsed.lines] == [250, 250]
+
+    script.write_text("voices: {}\nlines:\n  - a: Hello.\n")
+    result = runner.invoke(app, ["render", str(script)])
+    assert result.exit_code == 1
+    assert "has no voice" in result.stdout
+
+def test_watch_once(mocker, tmp_path):
+    mocker.patch("gcp_chirp.cli.config_manager.config_dir", tmp_path)
+    mocker.patch.dict("os.environ", {"GOOGLE_CLOUD_PROJECT": "test-project"}, clear=True)
+    mocker.patch("gcp_chirp.cli.ChirpTTS.synthesize", side_effect=lambda text, voice, output_file, **options: output_file)
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    (inbox / "hello.txt").write_text("Hello")
+
+    result = runner.invoke(app, ["watch", str(inbox), "--once"])
+    assert result.exit_code == 0
+    assert "hello.txt" in result.stdout
+
+def test_cache_stats(mocker, tmp_path):
+    mocker.patch("gcp_chirp.cli.config_manager.config_dir", tmp_path)
+    result = runner.invoke(app, ["cache", "stats"])
+    assert result.exit_code == 0
+    assert "Hit Rate" in result.stdout
+
+def test_batch_command(mocker, tmp_path):
+    mocker.patch.dict("os.environ", {"GOOGLE_CLOUD_PROJECT": "test-project"}, clear=True)
+    mocker.patch("gcp_chirp.cli.config_manager.config_dir", tmp_path)
+    mocker.patch("gcp_chirp.cli.ChirpTTS.synthesize", return_value="out.mp3")
+    manifest = tmp_path / "clips.csv"
+    manifest.write_text("id,text\n1,Hello\n2,World\n")
+
+    result = runner.invoke(app, ["batch", str(manifest), "--output-dir", str(tmp_path)])
+    assert result.exit_code == 0
+    assert "Batch Summary" in result.stdout
+    assert (tmp_path / "clips.csv.results.jsonl").exists()
+
+def test_say_stream_from_stdin(mocker, tmp_path):
+    mocker.patch.dict("os.environ", {"GOOGLE_CLOUD_PROJECT": "test-project"}, clear=True)
+    mocker.patch("gcp_chirp.cli.config_manager.config_dir", tmp_path)
+    stream = mocker.patch("gcp_chirp.cli.ChirpTTS.stream", side_effect=lambda pieces, voice: (p.encode() for p in pieces))
+    output = tmp_path / "streamed.wav"
+
+    result = runner.invoke(app, ["say", "-", "--stream", "--no-play", "--output", str(output)], input="one\n\ntwo\n")
+    assert result.exit_code == 0
+    assert "Success" in result.stdout
+    assert stream.called
+    data = output.read_bytes()
+    assert data.startswith(b"RIFF") and data.endswith(b"one\ntwo\n")
+
+def test_say_stream_rejects_non_wav_output(mocker, tmp_path):
+    mocker.patch.dict("os.environ", {"GOOGLE_CLOUD_PROJECT": "test-project"}, clear=True)
+    mocker.patch("gcp_chirp.cli.config_manager.config_dir", tmp_path)
+    stream = mocker.patch("gcp_chirp.cli.ChirpTTS.stream")
+
+    result = runner.invoke(app, ["say", "Hi", "--stream", "--no-play", "--output", str(tmp_path / "speech.mp3")])
+    assert result.exit_code == 1
+    assert "ending in .wav" in result.stdout
+    result = runner.invoke(app, ["say", "Hi", "--stream", "--no-play", "--encoding", "MP3"])
+    assert result.exit_code == 1
+    assert "LINEAR16" in result.stdout
+    assert not stream.called
+
+def write_catalog(config_dir):
+    from gcp_chirp.voices import VoiceCatalog, VoiceInfo
+    VoiceCatalog(config_dir / "voices.json").update([
+        VoiceInfo("en-US-Chirp3-HD-Aoede", ["en-US"], "FEMALE", "Chirp3-HD", 24000),
+        VoiceInfo("en-US-Chirp3-HD-Charon", ["en-US"], "MALE", "Chirp3-HD", 24000),
+    ])
+
+def test_list_uses_catalog_offline(mocker, tmp_path):
+    mocker.patch("gcp_chirp.cli.config_manager.config_dir", tmp_path)
+    write_catalog(tmp_path)
+    fetch = mocker.patch("gcp_chirp.tts.ChirpTTS.fetch_voices")
+
+    result = runner.invoke(app, ["list", "--lang", "en-US"])
+    assert result.exit_code == 0
+    assert "en-US-Chirp3-HD-Charon" in result.stdout
+    assert not fetch.called
+
+def test_list_without_project_exits_with_error(mocker, tmp_path):
+    from gcp_chirp import cli
+    from gcp_chirp.config import DEFAULT_CONFIG
+
+    mocker.patch.dict("os.environ", {}, clear=True)
+    mocker.patch("gcp_chirp.cli.config_manager.config_dir", tmp_path)
+    mocker.patch.object(cli.config_manager, "_loaded", dict(DEFAULT_CONFIG))
+    fetch = mocker.patch("gcp_chirp.tts.ChirpTTS.fetch_voices")
+
+    result = runner.invoke(app, ["list", "--refresh"])
+    assert result.exit_code == 1
+    assert "Project ID is not set" in result.stdout
+    assert not fetch.called
+
+def test_say_rejects_unknown_voice(mocker, tmp_path):
+    mocker.patch.dict("os.environ", {"GOOGLE_CLOUD_PROJECT": "test-project"}, clear=True)
+    mocker.patch("gcp_chirp.cli.config_manager.config_dir", tmp_path)
+    write_catalog(tmp_path)
+    synthesize = mocker.patch("gcp_chirp.cli.ChirpTTS.synthesize")
+
+    result = runner.invoke(app, ["say", "Hello", "--voice", "en-US-Chirp3-HD-Charron", "--no-play"])
+    assert result.exit_code == 1
+    assert "en-US-Chirp3-HD-Charon" in result.stdout
+    assert not synthesize.called
+
+def test_say_to_stdout(mocker, tmp_path):
+    mocker.patch.dict("os.environ", {"GOOGLE_CLOUD_PROJECT": "test-project"}, clear=True)
+    mocker.patch("gcp_chirp.cli.config_manager.config_dir", tmp_path)
+    synthesize_to = mocker.patch(
+        "gcp_chirp.cli.ChirpTTS.synthesize_to",
+        side_effect=lambda text, out, voice, **options: out.write(b"RIFF-audio")
+    )
+
+    result = runner.invoke(app, ["say", "Hello", "--output", "-", "--encoding", "linear16", "--sample-rate", "8000"])
+    assert result.exit_code == 0
+    assert result.stdout_bytes == b"RIFF-audio"
+    assert synthesize_to.call_args.kwargs == {"audio_encoding": "LINEAR16", "sample_rate_hertz": 8000}
+
+def test_say_rejects_unknown_encoding(mocker, tmp_path):
+    mocker.patch.dict("os.environ", {"GOOGLE_CLOUD_PROJECT": "test-project"}, clear=True)
+    mocker.patch("gcp_chirp.cli.config_manager.config_dir", tmp_path)
+    result = runner.invoke(app, ["say", "Hello", "--encoding", "flac", "--no-play"])
+    assert result.exit_code == 1
+    assert "Unsupported encoding" in result.stdout
+
+def test_broken_config_fails_with_panel(mocker, tmp_path):
+    from gcp_chirp.config import ConfigManager
+
+    (tmp_path / "settings.yaml").write_text("voice: [unclosed\n")
+    mocker.patch("gcp_chirp.cli.config_manager", ConfigManager(config_dir=tmp_path))
+
+    result = runner.invoke(app, ["config", "--show"])
+    assert result.exit_code == 1
+    assert "Failure" in result.stdout
+    assert "config-reset" in result.stdout
+
+    result = runner.invoke(app, ["config-reset"], input="y\n")
+    assert result.exit_code == 0
+    assert runner.invoke(app, ["config", "--show"]).exit_code == 0
+
+def test_say_applies_preset_and_lexicon(mocker, tmp_path):
+    from gcp_chirp import cli
+    from gcp_chirp.config import DEFAULT_CONFIG
+
+    lexicon_file = tmp_path / "lexicon.yaml"
+    lexicon_file.write_text("GCP: Google Cloud\n")
+    mocker.patch("gcp_chirp.cli.config_manager.config_dir", tmp_path)
+    mocker.patch.dict("os.environ", {"GOOGLE_CLOUD_PROJECT": "test-project"}, clear=True)
+    mocker.patch.object(cli.config_manager, "_loaded", {
+        **DEFAULT_CONFIG,
+        "lexicon": str(lexicon_file),
+        "presets": {"slow": {"speaking_rate": 0.8}},
+    })
+    mock_client = mocker.patch("google.cloud.texttospeech.TextToSpeechClient")
+    mock_client.return_value.synthesize_speech.return_value.audio_content = b"fake audio content"
+    output = str(tmp_path / "o.mp3")
+
+    result = runner.invoke(app, ["say", "Hello GCP", "--preset", "slow", "--no-play", "--no-cache", "--output", output])
+    assert result.exit_code == 0
+    kwargs = mock_client.return_value.synthesize_speech.call_args.kwargs
+    assert kwargs["input"].text == "Hello Google Cloud"
+    assert kwargs["audio_config"].speaking_rate == pytest.approx(0.8)
+
+    result = runner.invoke(app, ["say", "Hello", "--preset", "fast", "--no-play", "--output", output])
+    assert result.exit_code == 1
+    assert "Unknown preset 'fast'" in result.stdout
+    assert "slow" in result.stdout
@@ -2,7 +2,7 @@ import os
 import yaml
 import pytest
 from pathlib import Path
-from gcp_chirp.config import ConfigManager, DEFAULT_CONFIG
+from gcp_chirp.config import ConfigError, ConfigManager, DEFAULT_CONFIG
 
 def test_config_manager_initialization(tmp_path):
     manager = ConfigManager(config_dir=tmp_path)
@@ -26,3 +26,46 @@ def test_config_manager_save_load(tmp_path):
 def test_config_manager_get_default(tmp_path):
     manager = ConfigManager(config_dir=tmp_path)
     assert manager.get("non_existent", "fallback") == "fallback"
+
+def test_config_manager_rejects_broken_file(tmp_path):
+    (tmp_path / "settings.yaml").write_text("project_id: [unclosed\n")
+    manager = ConfigManager(config_dir=tmp_path)
+    with pytest.raises(ConfigError, match="settings.yaml"):
+        manager.get("project_id")
+
+    (tmp_path / "settings.yaml").write_text("- not a mapping\n")
+    with pytest.raises(ConfigError, match="mapping"):
+        manager.load()
+
+def test_config_manager_parses_only_when_file_changes(tmp_path, mocker):
+    writer = ConfigManager(config_dir=tmp_path)
+    writer.set("project_id", "p1")
+    writer.save()
+
+    manager = ConfigManager(config_dir=tmp_path)
+    parse = mocker.spy(yaml, "safe_load")
+    manager.load()
+    manager.load()
+    assert parse.call_count == 1
+
+    writer.set("concurrency", 16)
+    writer.save()
+    manager.load()
+    assert parse.call_count == 2
+    assert manager.get("concurrency") == 16
+
+def test_config_manager_save_keeps_other_writers_settings(tmp_path):
+    first = ConfigManager(config_dir=tmp_path)
+    second = ConfigManager(config_dir=tmp_path)
+    first.set("project_id", "p1")
+    second.set("default_voice", "en-US-Chirp3-HD-Puck")
+    first.save()
+    second.save()
+
+    merged = ConfigManager(config_dir=tmp_path)
+    assert merged.get("project_id") == "p1"
+    assert merged.get("default_voice") == "en-US-Chirp3-HD-Puck"
+    assert second.get("project_id") == "p1"
+
+    merged.reset()
+    assert ConfigManager(config_dir=tmp_path).all == DEFAULT_CONFIG
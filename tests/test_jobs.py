@@ -0,0 +1,170 @@
+from pathlib import Path
+import pytest
+from typer.testing import CliRunner
+from gcp_chirp import cli
+from gcp_chirp.config import DEFAULT_CONFIG
+from gcp_chirp.fakeserver import fake_long_audio_client, start_fake_server
+from gcp_chirp.jobs import JobStore, LongAudioJobs, parse_gcs_uri
+from tests.helpers import FakeClock
+
+runner = CliRunner()
+
+class FakeStorage:
+    """Serves the fake server's finished objects through the google-cloud-storage call chain."""
+
+    def __init__(self, objects):
+        self.objects = objects
+
+    def bucket(self, bucket):
+        storage = self
+
+        class Blob:
+            def __init__(self, name):
+                self.uri = f"gs://{bucket}/{name}"
+
+            def download_to_file(self, file_obj):
+                file_obj.write(storage.objects[self.uri])
+
+        class Bucket:
+            def blob(self, name):
+                return Blob(name)
+
+        return Bucket()
+
+@pytest.fixture
+def fake_server():
+    server, servicer, address = start_fake_server()
+    yield servicer.long_audio, address
+    server.stop(grace=None)
+
+def make_jobs(tmp_path, long_audio, address, clock):
+    return LongAudioJobs(
+        JobStore(tmp_path / "jobs.db"),
+        project_id="test-project",
+        client=fake_long_audio_client(address),
+        storage_client=FakeStorage(long_audio.objects),
+        clock=clock,
+    )
+
+def test_parse_gcs_uri():
+    assert parse_gcs_uri("gs://bucket/dir/a.wav") == ("bucket", "dir/a.wav")
+    with pytest.raises(ValueError):
+        parse_gcs_uri("/tmp/a.wav")
+
+def test_submit_poll_with_backoff_and_download(fake_server, tmp_path):
+    long_audio, address = fake_server
+    clock = FakeClock(1000.0)
+    jobs = make_jobs(tmp_path, long_audio, address, clock)
+
+    job = jobs.submit("A very long chapter.", "en-US-Chirp3-HD-Aoede", "gs://bucket/ch1.wav", str(tmp_path / "ch1.wav"))
+    assert job.status == "running"
+    assert job.operation == "projects/test-project/locations/us-central1/operations/1"
+    assert long_audio.get_calls == 0
+
+    done = jobs.wait([job.id], sleep=clock.sleep)
+    assert [j.status for j in done] == ["succeeded"]
+    assert long_audio.get_calls == 3
+    # Polls back off: 5s after the first poll, then 10s
+    assert clock.sleeps == [5.0, 10.0]
+
+    path = jobs.download(job.id)
+    assert Path(path).read_bytes() == b"RIFFA very long chapter."
+    assert jobs.store.get(job.id).status == "downloaded"
+
+def test_jobs_survive_restart_and_failures(fake_server, tmp_path):
+    long_audio, address = fake_server
+    clock = FakeClock(1000.0)
+    first = make_jobs(tmp_path, long_audio, address, clock)
+    ok = first.submit("Fine text.", "en-US-Chirp3-HD-Aoede", "gs://bucket/ok.wav")
+    bad = first.submit("Please fail.", "en-US-Chirp3-HD-Aoede", "gs://bucket/bad.wav")
+    first.store.close()
+
+    # A new process sees the same jobs through the SQLite store
+    second = make_jobs(tmp_path, long_audio, address, clock)
+    assert [job.id for job in second.store.list(status="running")] == [ok.id, bad.id]
+    done = {job.id: job for job in second.wait([ok.id, bad.id], sleep=clock.sleep)}
+    assert done[ok.id].status == "succeeded"
+    assert done[bad.id].status == "failed" and "Injected" in done[bad.id].error
+    with pytest.raises(Exception, match="only finished jobs"):
+        second.download(bad.id)
+
+def test_wait_timeout_leaves_jobs_running(fake_server, tmp_path):
+    long_audio, address = fake_server
+    long_audio.polls_to_complete = 100
+    clock = FakeClock(1000.0)
+    jobs = make_jobs(tmp_path, long_audio, address, clock)
+    job = jobs.submit("Slow.", "en-US-Chirp3-HD-Aoede", "gs://bucket/slow.wav")
+
+    result = jobs.wait([job.id], timeout=30, sleep=clock.sleep)
+    assert result[0].status == "running"
+    assert 0 < result[0].progress < 100
+
+def test_say_long_and_jobs_commands(fake_server, mocker, tmp_path):
+    long_audio, address = fake_server
+    client = fake_long_audio_client(address)
+    mocker.patch("google.cloud.texttospeech.TextToSpeechLongAudioSynthesizeClient", return_value=client)
+    mocker.patch("gcp_chirp.jobs.INITIAL_POLL_SECONDS", 0.001)
+    mocker.patch.dict("os.environ", {"GOOGLE_CLOUD_PROJECT": "test-project"}, clear=True)
+    mocker.patch("gcp_chirp.cli.config_manager.config_dir", tmp_path)
+    mocker.patch.object(cli.config_manager, "_loaded", {**DEFAULT_CONFIG, "long_audio_bucket": "gs://bucket/chirp"})
+    mocker.patch("gcp_chirp.cli.check_voice")
+
+    result = runner.invoke(cli.app, ["say", "Chapter one.", "--long", "--output", str(tmp_path / "book.wav")])
+    assert result.exit_code == 0
+    assert "Long Audio Job Submitted" in result.stdout
+    assert list(long_audio.operations.values())[0]["request"].output_gcs_uri.startswith("gs://bucket/chirp/book-")
+
+    result = runner.invoke(cli.app, ["jobs", "wait", "--no-download"])
+    assert result.exit_code == 0
+    assert "succeeded" in result.stdout
+
+    result = runner.invoke(cli.app, ["jobs", "list"])
+    assert result.exit_code == 0
+    assert "succeeded" in result.stdout
+
+def test_say_long_requires_bucket(mocker, tmp_path):
+    mocker.patch.dict("os.environ", {"GOOGLE_CLOUD_PROJECT": "test-project"}, clear=True)
+    mocker.patch("gcp_chirp.cli.config_manager.config_dir", tmp_path)
+    mocker.patch.object(cli.config_manager, "_loaded", dict(DEFAULT_CONFIG))
+    mocker.patch("gcp_chirp.cli.check_voice")
+
+    result = runner.invoke(cli.app, ["say", "Chapter one.", "--long"])
+    assert result.exit_code == 1
+    assert "long_audio_bucket" in result.stdout
+
+def test_say_long_rejects_non_wav_output(mocker, tmp_path):
+    mocker.patch.dict("os.environ", {"GOOGLE_CLOUD_PROJECT": "test-project"}, clear=True)
+    mocker.patch("gcp_chirp.cli.config_manager.config_dir", tmp_path)
+    mocker.patch.object(cli.config_manager, "_loaded", {**DEFAULT_CONFIG, "long_audio_bucket": "gs://bucket/chirp"})
+    submit = mocker.patch("gcp_chirp.jobs.LongAudioJobs.submit")
+
+    result = runner.invoke(cli.app, ["say", "Chapter one.", "--long", "--output", str(tmp_path / "book.mp3")])
+    assert result.exit_code == 1
+    assert "ending in .wav" in result.stdout
+    assert not submit.called
+
+def test_jobs_commands_use_submission_credentials(mocker, tmp_path):
+    mocker.patch("gcp_chirp.cli.config_manager.config_dir", tmp_path)
+    mocker.patch.object(cli.config_manager, "_loaded", {**DEFAULT_CONFIG, "project_id": "test-project"})
+    jobs = mocker.patch("gcp_chirp.jobs.LongAudioJobs")
+    jobs.return_value.store.get.return_value = None
+
+    runner.invoke(cli.app, ["jobs", "status", "1", "--creds", "sa.json"])
+    runner.invoke(cli.app, ["jobs", "list", "--creds", "sa.json"])
+    assert [call.kwargs["credentials_path"] for call in jobs.call_args_list] == ["sa.json", "sa.json"]
+
+def test_storage_client_uses_credentials_file(mocker, tmp_path):
+    storage = mocker.Mock()
+    mocker.patch.dict("sys.modules", {"google.cloud.storage": storage})
+    manager = LongAudioJobs(JobStore(tmp_path / "jobs.db"), project_id="test-project", credentials_path="sa.json")
+
+    assert manager.storage_client is storage.Client.from_service_account_json.return_value
+    storage.Client.from_service_account_json.assert_called_once_with("sa.json", project="test-project")
+    assert not storage.Client.called
+
+def test_storage_client_points_at_long_audio_extra(mocker, tmp_path):
+    mocker.patch.dict("sys.modules", {"google.cloud.storage": None})
+    manager = LongAudioJobs(JobStore(tmp_path / "jobs.db"), project_id="test-project")
+
+    with pytest.raises(Exception, match=r"gcp-chirp\[long-audio\]"):
+        manager.storage_client
@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+INPUT_MB = 40
+# Growth allowed over the post-import baseline; reading the input whole would need several times INPUT_MB.
+RSS_BUDGET_MB = 24
+
+SCRIPT = textwrap.dedent(r"""
+    import resource, sys
+    from google.cloud import texttospeech
+    from gcp_chirp import cli
+    from gcp_chirp.audio import silent_mp3_frame
+
+    FRAME = silent_mp3_frame(b"\xff\xf3\x44\xc4")
+
+    class StubClient:
+        calls = 0
+
+        def synthesize_speech(self, input, voice, audio_config):
+            StubClient.calls += 1
+            return texttospeech.SynthesizeSpeechResponse(audio_content=FRAME * 4)
+
+    texttospeech.TextToSpeechClient = StubClient
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    cli.app(sys.argv[1:], standalone_mode=False)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(StubClient.calls, (peak - baseline) / 1024)
+""")
+
+def test_say_large_file_has_bounded_rss(tmp_path):
+    source = tmp_path / "transcript.txt"
+    paragraph = ("The committee reviewed the quarterly figures in detail. " * 20 + "\n\n").encode()
+    with open(source, "wb") as f:
+        for _ in range(INPUT_MB * 1024 * 1024 // len(paragraph)):
+            f.write(paragraph)
+    output = tmp_path / "out.mp3"
+    env = {**os.environ, "HOME": str(tmp_path), "GOOGLE_CLOUD_PROJECT": "test-project"}
+
+    result = subprocess.run(
+        [sys.executable, "-c", SCRIPT, "say", "--file", str(source), "--output", str(output),
+         "--no-play", "--no-daemon", "--no-cache", "-j", "1"],
+        capture_output=True, text=True, env=env, timeout=300,
+    )
+    assert result.returncode == 0, result.stderr
+    calls, growth_mb = result.stdout.split()[-2:]
+    assert int(calls) > INPUT_MB * 1024 * 1024 // 4800
+    assert float(growth_mb) < RSS_BUDGET_MB
+    assert output.stat().st_size == int(calls) * 4 * 96
@@ -0,0 +1,48 @@
+import pytest
+from gcp_chirp.lexicon import Lexicon, LexiconEntry, parse_lexicon
+
+def test_substitute_prefers_leftmost_longest_whole_words():
+    lexicon = parse_lexicon({
+        "Cloud Run": "cloud run",
+        "Cloud Run jobs": "cloud run jobs, the batch product",
+        "GCP": "Google Cloud",
+        "C++": "C plus plus",
+    })
+    text = "Use Cloud Run jobs or cloud run on GCP, not GCPs, with C++."
+    assert lexicon.substitute(text) == (
+        "Use cloud run jobs, the batch product or cloud run on Google Cloud, not GCPs, with C plus plus."
+    )
+
+def test_overlapping_phrases_do_not_hide_later_matches():
+    # "b c d" overlaps the first match, but "c d" inside it must still be found
+    lexicon = parse_lexicon({"a b": "X", "b c d": "Y", "c d": "Z"})
+    assert lexicon.substitute("a b c d") == "X Z"
+
+def test_pronunciations_keep_surface_forms_and_text():
+    lexicon = parse_lexicon({"Chirp": {"ipa": "tʃɝp"}, "kubectl": {"x-sampa": "kju:b kVn\\troUl"}, "k8s": "kubernetes"})
+    text = "Chirp and CHIRP, kubectl, Chirpy and k8s."
+    assert lexicon.substitute(text) == "Chirp and CHIRP, kubectl, Chirpy and kubernetes."
+    assert [(phrase, entry.alphabet) for phrase, entry in lexicon.pronunciations(text)] == [
+        ("Chirp", "ipa"), ("CHIRP", "ipa"), ("kubectl", "x-sampa")
+    ]
+
+def test_large_document_matches_every_occurrence():
+    lexicon = parse_lexicon({f"product{i}": f"Product {i}" for i in range(2000)})
+    text = " ".join(f"product{i % 2500}" for i in range(50000))
+    substituted = lexicon.substitute(text)
+    assert substituted.count("Product ") == 40000
+    assert "product2499" in substituted
+
+@pytest.mark.parametrize("data, message", [
+    (["GCP"], "mapping"),
+    ({"GCP": {"ipa": "x", "say": "y"}}, "must map"),
+    ({"GCP": {"klingon": "x"}}, "alphabet"),
+    ({"GCP": "a", "gcp": "b"}, "twice"),
+])
+def test_parse_lexicon_rejects_bad_entries(data, message):
+    with pytest.raises(ValueError, match=message):
+        parse_lexicon(data)
+
+def test_entry_needs_exactly_one_replacement():
+    with pytest.raises(ValueError, match="exactly one"):
+        Lexicon([LexiconEntry("GCP")])
@@ -0,0 +1,47 @@
+import pytest
+from gcp_chirp.metrics import Metrics
+
+def test_stage_and_counters_snapshot():
+    metrics = Metrics(use_open_telemetry=False)
+    with metrics.stage("rpc"):
+        pass
+    metrics.observe("rpc", 0.2)
+    metrics.count("retries")
+    metrics.count("bytes_received", 1024)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["stages"]["rpc"]["count"] == 2
+    assert snapshot["stages"]["rpc"]["max_ms"] == pytest.approx(200.0)
+    assert snapshot["counters"] == {"retries": 1, "bytes_received": 1024}
+
+    metrics.reset()
+    assert metrics.snapshot() == {"stages": {}, "counters": {}}
+
+def test_stage_records_failures():
+    metrics = Metrics(use_open_telemetry=False)
+    with pytest.raises(RuntimeError):
+        with metrics.stage("write"):
+            raise RuntimeError("disk full")
+    assert metrics.snapshot()["stages"]["write"]["count"] == 1
+
+def test_render_prometheus():
+    metrics = Metrics(use_open_telemetry=False)
+    metrics.observe("rpc", 0.003)
+    metrics.observe("rpc", 0.3)
+    metrics.count("cache_hits", 2)
+
+    text = metrics.render_prometheus()
+    assert "# TYPE gcp_chirp_stage_duration_seconds histogram" in text
+    assert 'gcp_chirp_stage_duration_seconds_bucket{stage="rpc",le="0.001"} 0' in text
+    assert 'gcp_chirp_stage_duration_seconds_bucket{stage="rpc",le="0.005"} 1' in text
+    assert 'gcp_chirp_stage_duration_seconds_bucket{stage="rpc",le="+Inf"} 2' in text
+    assert 'gcp_chirp_stage_duration_seconds_count{stage="rpc"} 2' in text
+    assert "gcp_chirp_cache_hits_total 2" in text
+
+def test_open_telemetry_spans_are_optional():
+    pytest.importorskip("opentelemetry")
+    metrics = Metrics()
+    with metrics.stage("rpc", voice="en-US-Chirp3-HD-Aoede"):
+        pass
+    metrics.count("retries")
+    assert metrics.snapshot()["stages"]["rpc"]["count"] == 1
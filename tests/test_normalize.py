@@ -0,0 +1,30 @@
+from gcp_chirp.normalize import TextNormalizer, iter_sentences
+
+def test_normalizer_canonicalizes_whitespace_and_unicode():
+    normalize = TextNormalizer()
+    text = "  Cafe\u0301\u200b  is\topen.\n \n\n\nSee   you\x07 there!  "
+    assert normalize(text) == "Café is open.\n\nSee you there!"
+    assert normalize(normalize(text)) == normalize(text)
+
+def test_normalizer_expands_whole_token_abbreviations():
+    normalize = TextNormalizer({"Dr.": "Doctor", "St.": "Street", "approx": "approximately"})
+    assert normalize("Dr. Who lives on Main St. approx 3km away.") == (
+        "Doctor Who lives on Main Street approximately 3km away."
+    )
+    # Only whole tokens are expanded
+    assert normalize("approximate Drive") == "approximate Drive"
+
+def test_iter_sentences_splits_paragraphs_and_sentences():
+    assert list(iter_sentences("One. Two?\n\nThree")) == ["One.", "Two?", "Three"]
+    assert list(iter_sentences("")) == []
+
+def test_chunking_and_dedupe_agree_on_sentences():
+    from gcp_chirp.cache import normalize_text
+    from gcp_chirp.tts import split_text
+    text = TextNormalizer()("Wait… what?  Yes!\n\n  New  paragraph。次の文。 Done.")
+    longest = max(len(sentence.encode("utf-8")) for sentence in iter_sentences(text))
+    # Chunks only ever join whole sentences, so they never cut inside a deduplication unit
+    chunks = split_text(text, max_bytes=longest)
+    assert len(chunks) > 1
+    assert [sentence for chunk in chunks for sentence in iter_sentences(chunk)] == list(iter_sentences(text))
+    assert normalize_text(" ".join(iter_sentences(text))) == normalize_text(text)
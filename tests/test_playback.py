@@ -0,0 +1,61 @@
+import sys
+import pytest
+from gcp_chirp import playback
+from gcp_chirp.playback import AudioPlayer, file_player_command, play_file, stream_player_command
+from tests.helpers import make_wav
+
+# Stands in for a player: copies stdin to the file named by its argument.
+RECORDER = [sys.executable, "-c", "import shutil, sys; shutil.copyfileobj(sys.stdin.buffer, open(sys.argv[1], 'wb'))"]
+
+def test_player_receives_segments_in_order_without_headers(tmp_path):
+    recording = tmp_path / "played.raw"
+    with AudioPlayer([*RECORDER, str(recording)], "LINEAR16", max_pending=1) as player:
+        for i in range(5):
+            player.put(make_wav(bytes([i, 0]) * 100, 8000))
+    assert player.process.returncode == 0
+    assert recording.read_bytes() == b"".join(bytes([i, 0]) * 100 for i in range(5))
+
+def test_player_strips_mp3_info_frames(tmp_path):
+    from gcp_chirp.audio import silent_mp3_frame
+
+    frame = silent_mp3_frame(b"\xff\xf3\x44\xc4")
+    info = bytearray(frame)
+    info[4 + 9:4 + 13] = b"Info"
+    recording = tmp_path / "played.mp3"
+    with AudioPlayer([*RECORDER, str(recording)], "MP3") as player:
+        player.put(b"ID3\x03\x00\x00\x00\x00\x00\x00" + bytes(info) + frame * 2)
+        player.put(frame)
+    assert recording.read_bytes() == frame * 3
+
+def test_stop_kills_player_and_unblocks_producer():
+    player = AudioPlayer([sys.executable, "-c", "import time; time.sleep(30)"], max_pending=1)
+    # More than the pipe buffer holds, so the feeder blocks on the sleeping player with one more queued
+    player.put(bytes(256 * 1024))
+    player.put(bytes(256 * 1024))
+    player.stop()
+    assert player.process.returncode is not None
+    assert not player._thread.is_alive()
+
+def test_context_manager_stops_on_interrupt(tmp_path):
+    with pytest.raises(KeyboardInterrupt):
+        with AudioPlayer([sys.executable, "-c", "import time; time.sleep(30)"]) as player:
+            raise KeyboardInterrupt
+    assert player.process.returncode is not None
+
+def test_commands_are_argument_lists(mocker):
+    mocker.patch("gcp_chirp.playback.shutil.which", side_effect=lambda name: name == "play")
+    path = "it's a \"quoted\" $(path).mp3"
+    assert file_player_command(path) == ["play", "-q", path]
+    assert stream_player_command("MULAW", 8000) == [
+        "play", "-q", "-t", "raw", "-r", "8000", "-e", "mu-law", "-b", "8", "-c", "1", "-"
+    ]
+    mocker.patch("gcp_chirp.playback.shutil.which", return_value=None)
+    assert stream_player_command("MP3", 24000) is None
+    assert play_file(path) is False
+
+def test_play_file_passes_path_without_a_shell(mocker, tmp_path):
+    path = tmp_path / "it's here.mp3"
+    path.write_bytes(b"audio")
+    mocker.patch.object(playback, "file_player_command", lambda p: [*RECORDER[:2], "import sys; open(sys.argv[1] + '.seen', 'w')", p])
+    assert play_file(str(path)) is True
+    assert (tmp_path / "it's here.mp3.seen").exists()
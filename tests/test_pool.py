@@ -0,0 +1,57 @@
+import os
+import pytest
+from gcp_chirp.pool import ClientPool, PoolEntry, build_client
+from tests.helpers import FakeClock
+
+def test_lease_picks_least_loaded_entry():
+    pool = ClientPool([PoolEntry("a"), PoolEntry("b"), PoolEntry("c")], clock=FakeClock())
+    with pool.lease() as first, pool.lease() as second:
+        with pool.lease() as third:
+            assert {first.project_id, second.project_id, third.project_id} == {"a", "b", "c"}
+        # c is idle again, a and b still busy
+        with pool.lease() as fourth:
+            assert fourth is third
+    assert [entry.in_flight for entry in pool.entries] == [0, 0, 0]
+
+def test_exhausted_entry_cools_down_and_fails_over():
+    clock = FakeClock()
+    pool = ClientPool([PoolEntry("a"), PoolEntry("b")], clock=clock)
+    a, b = pool.entries
+
+    assert pool.on_exhausted(a) is True
+    with pool.lease() as entry:
+        assert entry is b
+    with pool.lease() as entry:
+        assert entry is b
+
+    # With every entry cooling down, the one that recovers first is used
+    assert pool.on_exhausted(b) is False
+    with pool.lease() as entry:
+        assert entry is a
+
+    clock.now = 100.0
+    assert pool.on_exhausted(a) is True
+    assert a.cooldown_until == 110.0
+    pool.on_success(a)
+    assert a.strikes == 0
+
+def test_from_config_validates_entries():
+    pool = ClientPool.from_config([{"project_id": "a", "credentials": "/keys/a.json"}, {"project_id": "b"}])
+    assert [(e.project_id, e.credentials_path) for e in pool.entries] == [("a", "/keys/a.json"), ("b", None)]
+    with pytest.raises(ValueError, match="projects\\[0\\]"):
+        ClientPool.from_config([{"credentials": "/keys/a.json"}])
+    with pytest.raises(ValueError):
+        ClientPool.from_config([])
+
+def test_build_client_uses_explicit_credentials(mocker):
+    mocker.patch.dict("os.environ", {}, clear=True)
+    from_file = mocker.patch("google.oauth2.service_account.Credentials.from_service_account_file")
+    client_class = mocker.Mock()
+
+    build_client(client_class, "billing-project", "/keys/a.json")
+
+    from_file.assert_called_once_with("/keys/a.json")
+    kwargs = client_class.call_args.kwargs
+    assert kwargs["credentials"] is from_file.return_value
+    assert kwargs["client_options"].quota_project_id == "billing-project"
+    assert "GOOGLE_APPLICATION_CREDENTIALS" not in os.environ
@@ -0,0 +1,49 @@
+from google.api_core import exceptions as core_exceptions
+from google.protobuf import duration_pb2
+from google.rpc import error_details_pb2
+from gcp_chirp.ratelimit import AdaptiveConcurrency, RateLimiter, RetryPolicy, TokenBucket, retry_after
+from tests.helpers import FakeClock
+
+def test_token_bucket_waits_when_empty():
+    clock = FakeClock()
+    bucket = TokenBucket(rate_per_minute=60, capacity=2, clock=clock, sleep=clock.sleep)
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 1.0
+    clock.now += 5
+    assert bucket.acquire() == 0
+
+def test_token_bucket_allows_oversized_requests_as_debt():
+    clock = FakeClock()
+    bucket = TokenBucket(rate_per_minute=600, clock=clock, sleep=clock.sleep)
+    assert bucket.acquire(900) == 30.0
+
+def test_rate_limiter_disabled_by_default():
+    limiter = RateLimiter()
+    assert limiter.requests is None and limiter.characters is None
+    limiter.acquire(10_000)
+
+def test_adaptive_concurrency_aimd():
+    gate = AdaptiveConcurrency(max_limit=8)
+    gate.on_throttled()
+    assert gate.limit == 4
+    gate.on_throttled()
+    gate.on_throttled()
+    gate.on_throttled()
+    assert gate.limit == 1
+    for _ in range(3):
+        gate.on_success()
+    assert 1 < gate.limit <= 8
+
+def test_retry_after_from_retry_info():
+    info = error_details_pb2.RetryInfo(retry_delay=duration_pb2.Duration(seconds=3, nanos=500_000_000))
+    error = core_exceptions.ResourceExhausted("quota", details=[info])
+    assert retry_after(error) == 3.5
+
+def test_retry_policy_delay_bounds():
+    policy = RetryPolicy(initial_backoff=1.0, max_backoff=10.0)
+    error = core_exceptions.ServiceUnavailable("unavailable")
+    assert policy.is_retryable(error)
+    assert not policy.is_retryable(core_exceptions.InvalidArgument("bad"))
+    assert 0 <= policy.delay(0, error) <= 1.0
+    assert 0 <= policy.delay(10, error) <= 10.0
@@ -0,0 +1,67 @@
+import pytest
+from gcp_chirp.audio import parse_wav
+from gcp_chirp.render import DEFAULT_PAUSE_MS, ScriptLine, load_script, parse_script, render_script
+from gcp_chirp.tts import ChirpTTS
+from tests.helpers import make_wav
+
+VOICES = {"alice": "en-US-Chirp3-HD-Aoede", "bob": "en-US-Chirp3-HD-Charon"}
+
+def test_load_script_accepts_both_line_forms(tmp_path):
+    path = tmp_path / "dialogue.yaml"
+    path.write_text(
+        "voices:\n  alice: en-US-Chirp3-HD-Aoede\n  bob: en-US-Chirp3-HD-Charon\n"
+        "lines:\n  - alice: Hello there.\n  - speaker: bob\n    text: Hi!\n    pause_ms: 1000\n"
+    )
+    script = load_script(path)
+    assert script.lines == [
+        ScriptLine("alice", "en-US-Chirp3-HD-Aoede", "Hello there.", DEFAULT_PAUSE_MS),
+        ScriptLine("bob", "en-US-Chirp3-HD-Charon", "Hi!", 1000),
+    ]
+    assert script.output is None
+    assert load_script(path, default_pause_ms=0).lines[0].pause_ms == 0
+
+@pytest.mark.parametrize("data, message", [
+    ({"voices": VOICES, "lines": []}, "non-empty list"),
+    ({"voices": VOICES, "lines": [{"carol": "Hi"}]}, "'carol' has no voice"),
+    ({"voices": VOICES, "lines": [{"alice": " "}]}, "text is empty"),
+    ({"voices": VOICES, "lines": [{"speaker": "bob", "text": "Hi", "pause_ms": -1}]}, "pause_ms"),
+])
+def test_parse_script_rejects_invalid_scripts(data, message):
+    with pytest.raises(ValueError, match=message):
+        parse_script(data)
+
+def test_render_script_synthesizes_unique_lines_and_inserts_silence(mocker, tmp_path):
+    mock_client = mocker.patch("google.cloud.texttospeech.TextToSpeechClient")
+
+    def fake_synthesize(input, voice, audio_config):
+        response = mocker.Mock()
+        response.audio_content = make_wav(input.text[0].encode() + b"\x00", rate=1000)
+        return response
+
+    mock_client.return_value.synthesize_speech.side_effect = fake_synthesize
+    script = parse_script({"voices": VOICES, "pause_ms": 3, "lines": [
+        {"alice": "Knock knock."},
+        {"bob": "Who is there?"},
+        {"alice": "Knock  knock."},
+        {"speaker": "bob", "text": "Knock knock.", "pause_ms": 0},
+        {"alice": "Done."},
+    ]})
+    output = tmp_path / "dialogue.wav"
+
+    summary = render_script(ChirpTTS(audio_encoding="LINEAR16"), script, str(output), concurrency=3)
+
+    assert mock_client.return_value.synthesize_speech.call_count == 4
+    assert summary == {"lines": 5, "synthesized": 4, "characters": 54, "characters_saved": 12}
+    data = output.read_bytes()
+    wav = parse_wav(data)
+    silence = b"\x00\x00" * 3
+    assert data[wav.data_offset:] == (
+        b"K\x00" + silence + b"W\x00" + silence + b"K\x00" + silence + b"K\x00" + b"D\x00"
+    )
+
+def test_render_script_rejects_pauses_in_ogg_opus(mocker, tmp_path):
+    mock_client = mocker.patch("google.cloud.texttospeech.TextToSpeechClient")
+    script = parse_script({"voices": VOICES, "lines": [{"alice": "One."}, {"bob": "Two."}]})
+    with pytest.raises(ValueError, match="OGG_OPUS"):
+        render_script(ChirpTTS(), script, str(tmp_path / "o.ogg"), audio_encoding="OGG_OPUS")
+    mock_client.return_value.synthesize_speech.assert_not_called()
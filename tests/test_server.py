@@ -0,0 +1,127 @@
+import http.client
+import json
+import os
+import threading
+from pathlib import Path
+import pytest
+from gcp_chirp.server import DaemonClient, create_server, find_daemon, server_endpoint, start_metrics_server, write_daemon_state
+
+class FakeTTS:
+    def __init__(self):
+        self.calls = []
+
+    def synthesize(self, text, voice_name, output_file, **options):
+        self.calls.append((text, voice_name))
+        if text == "fail":
+            raise Exception("TTS Synthesis failed: boom")
+        Path(output_file).write_bytes(f"{voice_name}:{text}".encode())
+        return output_file
+
+    def list_voices(self, language_code):
+        return [f"{language_code}-Chirp3-HD-Aoede"]
+
+@pytest.fixture
+def running_server(request, tmp_path):
+    socket_path = str(tmp_path / "chirp.sock") if getattr(request, "param", None) == "unix" else None
+    tts = FakeTTS()
+    server = create_server(tts, "en-US-Chirp3-HD-Aoede", "en-US", port=0, socket_path=socket_path)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    endpoint = server_endpoint(server)
+    client = DaemonClient(
+        host=endpoint.get("host", "127.0.0.1"),
+        port=endpoint.get("port", 0),
+        socket_path=endpoint.get("socket"),
+        token=endpoint["token"],
+    )
+    yield server, client, tts
+    server.shutdown()
+    server.server_close()
+
+@pytest.mark.parametrize("running_server", ["tcp", "unix"], indirect=True)
+def test_daemon_endpoints(running_server, tmp_path):
+    server, client, tts = running_server
+    assert client.health()
+    assert client.list_voices("es-ES") == ["es-ES-Chirp3-HD-Aoede"]
+
+    assert client.synthesize("Hello", "en-US-Chirp3-HD-Charon") == b"en-US-Chirp3-HD-Charon:Hello"
+
+    output = tmp_path / "out.mp3"
+    assert client.synthesize("Hi", "en-US-Chirp3-HD-Aoede", str(output)) == str(output)
+    assert output.read_bytes() == b"en-US-Chirp3-HD-Aoede:Hi"
+
+def test_daemon_reports_errors(running_server):
+    server, client, tts = running_server
+    with pytest.raises(Exception) as excinfo:
+        client.synthesize("fail", "en-US-Chirp3-HD-Aoede")
+    assert "boom" in str(excinfo.value)
+
+def test_find_daemon(running_server, tmp_path):
+    server, client, tts = running_server
+    assert find_daemon(tmp_path) is None
+    write_daemon_state(tmp_path, server_endpoint(server))
+    found = find_daemon(tmp_path)
+    assert found is not None and found.port == client.port
+    assert found.token == server.token
+    assert os.stat(tmp_path / "daemon.json").st_mode & 0o777 == 0o600
+
+def test_daemon_metrics_endpoint(running_server):
+    from gcp_chirp.metrics import Metrics
+    server, client, tts = running_server
+    server.metrics = Metrics(use_open_telemetry=False)
+    server.metrics.observe("rpc", 0.01)
+    with pytest.raises(Exception):
+        client.synthesize("fail", "en-US-Chirp3-HD-Aoede")
+
+    text = client.metrics()
+    assert 'gcp_chirp_stage_duration_seconds_count{stage="rpc"} 1' in text
+    assert "gcp_chirp_http_synthesize_errors_total 1" in text
+
+def test_standalone_metrics_server():
+    from gcp_chirp.metrics import Metrics
+    metrics = Metrics(use_open_telemetry=False)
+    metrics.count("watch_files_ok")
+    server = start_metrics_server(metrics, port=0)
+    try:
+        host, port = server.server_address[:2]
+        conn = http.client.HTTPConnection(host, port, timeout=5)
+        conn.request("GET", "/metrics")
+        response = conn.getresponse()
+        assert response.status == 200
+        assert "gcp_chirp_watch_files_ok_total 1" in response.read().decode()
+        conn.request("GET", "/synthesize")
+        response = conn.getresponse()
+        response.read()
+        assert response.status == 404
+        conn.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def raw_post(client, body, headers):
+    conn = http.client.HTTPConnection(client.host, client.port, timeout=5)
+    try:
+        conn.request("POST", "/synthesize", body=json.dumps(body), headers=headers)
+        response = conn.getresponse()
+        return response.status, response.read()
+    finally:
+        conn.close()
+
+def test_daemon_rejects_unauthenticated_and_browser_requests(running_server, tmp_path):
+    server, client, tts = running_server
+    target = tmp_path / "victim.txt"
+    target.write_text("keep me")
+    auth = {"Authorization": f"Bearer {server.token}"}
+    json_type = {"Content-Type": "application/json"}
+
+    assert raw_post(client, {"text": "Hi"}, json_type)[0] == 401
+    assert raw_post(client, {"text": "Hi"}, {**json_type, "Authorization": "Bearer wrong"})[0] == 401
+    # A cross-origin "simple" request from a web page
+    assert raw_post(client, {"text": "Hi"}, {**auth, "Content-Type": "text/plain", "Origin": "https://example.com"})[0] == 403
+    assert raw_post(client, {"text": "Hi"}, {**auth, "Content-Type": "text/plain"})[0] == 415
+    # Over TCP the daemon never writes to a caller-chosen path
+    status, _ = raw_post(client, {"text": "Hi", "output": str(target)}, {**auth, **json_type})
+    assert status == 400
+    assert target.read_text() == "keep me"
+    assert tts.calls == []
+    assert not DaemonClient(host=client.host, port=client.port).health()
@@ -0,0 +1,55 @@
+import os
+import subprocess
+import sys
+import time
+import pytest
+
+# Cold-start budgets for commands that never touch the network. Override on slow CI runners.
+IMPORT_BUDGET_S = float(os.environ.get("GCP_CHIRP_IMPORT_BUDGET", "0.5"))
+COLD_START_BUDGET_S = float(os.environ.get("GCP_CHIRP_STARTUP_BUDGET", "1.5"))
+
+HEAVY_MODULES = (
+    "google.cloud.texttospeech",
+    "google.api_core",
+    "grpc",
+    "yaml",
+    "rich.progress",
+)
+
+RUN_CLI = "from gcp_chirp.main import main; main()"
+
+def run_importtime(tmp_path, *args):
+    """Runs the CLI under -X importtime and returns {module: cumulative seconds}."""
+    env = {**os.environ, "HOME": str(tmp_path)}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", RUN_CLI, *args],
+        capture_output=True, text=True, env=env
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative) / 1_000_000
+    return modules
+
+def best_wall_clock(tmp_path, *args, runs=3):
+    env = {**os.environ, "HOME": str(tmp_path)}
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", RUN_CLI, *args], capture_output=True, env=env, check=True)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+@pytest.mark.parametrize("args", [["--help"], ["config", "--show"], ["cache", "stats"]])
+def test_fast_commands_skip_heavy_imports(tmp_path, args):
+    modules = run_importtime(tmp_path, *args)
+    assert "gcp_chirp.cli" in modules
+    loaded = [name for name in modules if name.startswith(HEAVY_MODULES)]
+    assert loaded == []
+    assert modules["gcp_chirp.cli"] < IMPORT_BUDGET_S
+
+@pytest.mark.parametrize("args", [["--help"], ["config", "--show"]])
+def test_cold_start_budget(tmp_path, args):
+    assert best_wall_clock(tmp_path, *args) < COLD_START_BUDGET_S
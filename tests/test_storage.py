@@ -0,0 +1,64 @@
+import os
+import subprocess
+import sys
+import threading
+import pytest
+from gcp_chirp.storage import FileLock, atomic_open, atomic_write, lock_path
+
+# Read-modify-write of a counter under the lock; lost updates mean the lock did not exclude.
+INCREMENT = """
+import sys
+from gcp_chirp.storage import FileLock, atomic_write
+path = sys.argv[1]
+for _ in range(int(sys.argv[2])):
+    with FileLock(path + ".lock"):
+        with open(path) as f:
+            value = int(f.read())
+        atomic_write(path, str(value + 1), durable=False)
+"""
+
+def test_lock_excludes_other_processes(tmp_path):
+    counter = tmp_path / "counter"
+    counter.write_text("0")
+    workers = [
+        subprocess.Popen([sys.executable, "-c", INCREMENT, str(counter), "50"])
+        for _ in range(4)
+    ]
+    assert all(worker.wait() == 0 for worker in workers)
+    assert counter.read_text() == "200"
+
+def test_lock_is_reentrant_and_excludes_other_threads(tmp_path):
+    lock = FileLock(tmp_path / "state.lock")
+    entered = threading.Event()
+
+    def contend():
+        with lock:
+            entered.set()
+
+    with lock:
+        with lock:
+            thread = threading.Thread(target=contend)
+            thread.start()
+            assert not entered.wait(0.1)
+    thread.join(timeout=5)
+    assert entered.is_set()
+
+def test_atomic_write_keeps_original_on_failure(tmp_path):
+    path = tmp_path / "settings.yaml"
+    atomic_write(path, "a: 1\n")
+    os.chmod(path, 0o640)
+
+    with pytest.raises(RuntimeError):
+        with atomic_open(path) as f:
+            f.write("a: 2\n")
+            raise RuntimeError("interrupted")
+
+    assert path.read_text() == "a: 1\n"
+    assert os.listdir(tmp_path) == ["settings.yaml"]
+
+    atomic_write(path, b"a: 3\n")
+    assert path.read_bytes() == b"a: 3\n"
+    assert os.stat(path).st_mode & 0o777 == 0o640
+
+def test_lock_path_is_a_sibling():
+    assert str(lock_path("/tmp/cache")) == "/tmp/cache.lock"
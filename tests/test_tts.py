@@ -1,5 +1,13 @@
+import io
+import os
 import pytest
-from gcp_chirp.tts import ChirpTTS
+import threading
+from gcp_chirp.tts import ChirpTTS, _write_atomically, iter_split_text, split_text
+from gcp_chirp.cache import SynthesisCache
+from gcp_chirp.lexicon import parse_lexicon
+from gcp_chirp.normalize import TextNormalizer
+from gcp_chirp.pool import ClientPool, PoolEntry
+from tests.helpers import make_wav
 
 def test_synthesize_call_structure(mocker):
     mock_client = mocker.patch("google.cloud.texttospeech.TextToSpeechClient")
@@ -55,3 +63,468 @@ def test_synthesize_auth_error(mocker):
     with pytest.raises(Exception) as excinfo:
         tts.synthesize("Hello")
     assert "Authentication failed" in str(excinfo.value)
+
+def test_synthesize_cache_hit_skips_client(mocker, tmp_path):
+    mock_client = mocker.patch("google.cloud.texttospeech.TextToSpeechClient")
+    mock_response = mocker.Mock()
+    mock_response.audio_content = b"fake audio content"
+    mock_client.return_value.synthesize_speech.return_value = mock_response
+
+    cache = SynthesisCache(tmp_path / "cache")
+    ChirpTTS(cache=cache).synthesize("Hello", output_file=str(tmp_path / "first.mp3"))
+    assert mock_client.call_count == 1
+
+    second = tmp_path / "second.mp3"
+    ChirpTTS(cache=cache).synthesize("Hello", output_file=str(second))
+    assert mock_client.call_count == 1
+    assert second.read_bytes() == b"fake audio content"
+
+def test_write_atomically_concurrent_writers(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+    output = tmp_path / "out.mp3"
+    started = threading.Barrier(4)
+
+    def write(out, payload):
+        out.write(payload[:4])
+        started.wait(timeout=5)
+        out.write(payload[4:])
+
+    payloads = [bytes([i]) * 64 for i in range(4)]
+    with ThreadPoolExecutor(4) as executor:
+        list(executor.map(lambda p: _write_atomically(str(output), lambda out: write(out, p)), payloads))
+
+    assert output.read_bytes() in payloads
+    assert os.listdir(tmp_path) == ["out.mp3"]
+
+def test_split_text_respects_byte_budget():
+    text = "First sentence here. Second one follows!\n\nA new paragraph starts. " + "word " * 40
+    chunks = split_text(text, max_bytes=60)
+    assert all(len(chunk.encode("utf-8")) <= 60 for chunk in chunks)
+    assert chunks[0] == "First sentence here. Second one follows!"
+    assert " ".join(" ".join(chunks).split()) == " ".join(text.split())
+
+def test_split_text_handles_multibyte_words():
+    chunks = split_text("é" * 50, max_bytes=16)
+    assert all(len(chunk.encode("utf-8")) <= 16 for chunk in chunks)
+    assert "".join(chunks) == "é" * 50
+
+def test_iter_split_text_matches_split_text_across_blocks():
+    text = ("Short one. " * 7 + "Ünïcödé wörds fòllow here! " * 5 + "\n\n") * 6 + "tail without end"
+    expected = split_text(text, max_bytes=64)
+    for block_size in (1, 7, 50, len(text)):
+        blocks = (text[i:i + block_size] for i in range(0, len(text), block_size))
+        assert list(iter_split_text(blocks, max_bytes=64)) == expected
+
+def test_synthesize_chunks_consumes_generator(mocker, tmp_path):
+    mock_client = mocker.patch("google.cloud.texttospeech.TextToSpeechClient")
+    frame = b"\xff\xfb\x90\x64" + b"\x00" * 413
+    mock_client.return_value.synthesize_speech.return_value.audio_content = frame
+
+    output = tmp_path / "big.mp3"
+    blocks = (f"Sentence {i}. " for i in range(5))
+    ChirpTTS(max_chunk_bytes=12).synthesize_chunks(blocks, output_file=str(output))
+
+    calls = mock_client.return_value.synthesize_speech.call_args_list
+    assert [c.kwargs["input"].text for c in calls] == [f"Sentence {i}." for i in range(5)]
+    assert output.read_bytes() == frame * 5
+
+def test_synthesize_chunks_splits_after_lexicon_expansion(mocker, tmp_path):
+    mock_client = mocker.patch("google.cloud.texttospeech.TextToSpeechClient")
+    mock_client.return_value.synthesize_speech.return_value.audio_content = b"\xff\xfb\x90\x64" + b"\x00" * 413
+
+    tts = ChirpTTS(max_chunk_bytes=200, lexicon=parse_lexicon({"GCP": "Google Cloud Platform"}))
+    text = "GCP GCP GCP GCP GCP. " * 40
+    blocks = (text[i:i + 7] for i in range(0, len(text), 7))
+    tts.synthesize_chunks(blocks, output_file=str(tmp_path / "big.mp3"))
+
+    sent = [c.kwargs["input"].text for c in mock_client.return_value.synthesize_speech.call_args_list]
+    assert all(len(text.encode("utf-8")) <= 200 for text in sent)
+    assert " ".join(sent).count("Google Cloud Platform") == 200
+    assert "GCP" not in " ".join(sent)
+
+def test_synthesize_chunks_long_input(mocker, tmp_path):
+    mock_client = mocker.patch("google.cloud.texttospeech.TextToSpeechClient")
+    frame = b"\xff\xfb\x90\x64" + b"\x00" * 413
+    mock_client.return_value.synthesize_speech.return_value.audio_content = frame
+
+    output = tmp_path / "long.mp3"
+    tts = ChirpTTS(max_chunk_bytes=40)
+    tts.synthesize("This is sentence one. This is sentence two. This is sentence three.", output_file=str(output))
+
+    calls = mock_client.return_value.synthesize_speech.call_args_list
+    assert [c.kwargs["input"].text for c in calls] == [
+        "This is sentence one.", "This is sentence two.", "This is sentence three."
+    ]
+    assert output.read_bytes() == frame * 3
+
+def test_synthesize_concurrent_chunks_keep_order(mocker, tmp_path):
+    mock_client = mocker.patch("google.cloud.texttospeech.TextToSpeechClient")
+
+    def fake_synthesize(input, voice, audio_config):
+        response = mocker.Mock()
+        response.audio_content = b"\xff\xfb\x90\x64" + input.text[-2:-1].encode() * 413
+        return response
+
+    mock_client.return_value.synthesize_speech.side_effect = fake_synthesize
+    output = tmp_path / "long.mp3"
+    tts = ChirpTTS(max_chunk_bytes=10, concurrency=4)
+    tts.synthesize("Part a. Part b. Part c. Part d. Part e.", output_file=str(output))
+
+    data = output.read_bytes()
+    assert [data[i * 417 + 4:i * 417 + 5] for i in range(5)] == [b"a", b"b", b"c", b"d", b"e"]
+
+def test_synthesize_retries_resource_exhausted(mocker, tmp_path):
+    from google.api_core import exceptions as core_exceptions
+    mock_client = mocker.patch("google.cloud.texttospeech.TextToSpeechClient")
+    sleep = mocker.patch("gcp_chirp.tts.time.sleep")
+    mock_response = mocker.Mock()
+    mock_response.audio_content = b"fake audio content"
+    mock_client.return_value.synthesize_speech.side_effect = [
+        core_exceptions.ResourceExhausted("Quota exceeded"),
+        mock_response,
+    ]
+
+    tts = ChirpTTS(concurrency=4)
+    tts.synthesize("Hello", output_file=str(tmp_path / "out.mp3"))
+
+    assert mock_client.return_value.synthesize_speech.call_count == 2
+    assert sleep.call_count == 1
+    assert tts.throttle.limit < 4
+
+def test_synthesize_records_stage_metrics(mocker, tmp_path):
+    from google.api_core import exceptions as core_exceptions
+    from gcp_chirp.metrics import Metrics
+    mock_client = mocker.patch("google.cloud.texttospeech.TextToSpeechClient")
+    mocker.patch("gcp_chirp.tts.time.sleep")
+    mock_response = mocker.Mock()
+    mock_response.audio_content = b"fake audio content"
+    mock_client.return_value.synthesize_speech.side_effect = [core_exceptions.ServiceUnavailable("blip"), mock_response]
+    metrics = Metrics(use_open_telemetry=False)
+    cache = SynthesisCache(tmp_path / "cache")
+
+    tts = ChirpTTS(cache=cache, metrics=metrics)
+    tts.synthesize("Hello", output_file=str(tmp_path / "a.mp3"))
+    tts.synthesize("Hello", output_file=str(tmp_path / "b.mp3"))
+
+    snapshot = metrics.snapshot()
+    assert snapshot["stages"]["client_init"]["count"] == 1
+    assert snapshot["stages"]["rpc"]["count"] == 2
+    assert snapshot["stages"]["retry_backoff"]["count"] == 1
+    assert snapshot["stages"]["cache_lookup"]["count"] == 2
+    assert snapshot["stages"]["write"]["count"] >= 1
+    assert snapshot["counters"] == {
+        "rpc_requests": 2,
+        "rpc_errors": 1,
+        "retries": 1,
+        "characters": 5,
+        "bytes_received": len(b"fake audio content"),
+        "cache_hits": 1,
+        "cache_misses": 1,
+    }
+
+def test_synthesize_gives_up_after_max_attempts(mocker, tmp_path):
+    from google.api_core import exceptions as core_exceptions
+    from gcp_chirp.ratelimit import RetryPolicy
+    mock_client = mocker.patch("google.cloud.texttospeech.TextToSpeechClient")
+    mocker.patch("gcp_chirp.tts.time.sleep")
+    mock_client.return_value.synthesize_speech.side_effect = core_exceptions.ResourceExhausted("Quota exceeded")
+
+    tts = ChirpTTS(retry_policy=RetryPolicy(max_attempts=3))
+    with pytest.raises(Exception) as excinfo:
+        tts.synthesize("Hello", output_file=str(tmp_path / "out.mp3"))
+    assert "API Quota exceeded" in str(excinfo.value)
+    assert mock_client.return_value.synthesize_speech.call_count == 3
+
+def test_stream_sends_config_then_text(mocker):
+    mock_client = mocker.patch("google.cloud.texttospeech.TextToSpeechClient")
+    sent = []
+
+    def fake_streaming(requests):
+        for request in requests:
+            sent.append(request)
+            if request.input.text:
+                response = mocker.Mock()
+                response.audio_content = request.input.text.encode()
+                yield response
+
+    mock_client.return_value.streaming_synthesize.side_effect = fake_streaming
+
+    tts = ChirpTTS()
+    audio = list(tts.stream(["Hello there.", "General Kenobi."], voice_name="en-US-Chirp3-HD-Aoede"))
+
+    assert audio == [b"Hello there.", b"General Kenobi."]
+    assert sent[0].streaming_config.voice.name == "en-US-Chirp3-HD-Aoede"
+    assert sent[0].streaming_config.streaming_audio_config.sample_rate_hertz == 24000
+
+def test_fetch_voices_all_languages(mocker):
+    from google.cloud import texttospeech
+    mock_client = mocker.patch("google.cloud.texttospeech.TextToSpeechClient")
+    mock_client.return_value.list_voices.return_value.voices = [
+        texttospeech.Voice(
+            name="en-US-Chirp3-HD-Aoede",
+            language_codes=["en-US"],
+            ssml_gender=texttospeech.SsmlVoiceGender.FEMALE,
+            natural_sample_rate_hertz=24000,
+        )
+    ]
+
+    voices = ChirpTTS().fetch_voices()
+
+    mock_client.return_value.list_voices.assert_called_once_with()
+    assert voices[0].family == "Chirp3-HD"
+    assert voices[0].gender == "FEMALE"
+    assert voices[0].language_codes == ["en-US"]
+
+def test_synthesize_encoding_and_sample_rate(mocker, tmp_path):
+    from google.cloud import texttospeech
+    mock_client = mocker.patch("google.cloud.texttospeech.TextToSpeechClient")
+    mock_client.return_value.synthesize_speech.return_value.audio_content = b"OggS fake opus"
+
+    tts = ChirpTTS()
+    tts.synthesize("Hello", output_file=str(tmp_path / "out.ogg"), audio_encoding="OGG_OPUS", sample_rate_hertz=48000)
+
+    audio_config = mock_client.return_value.synthesize_speech.call_args.kwargs["audio_config"]
+    assert audio_config.audio_encoding == texttospeech.AudioEncoding.OGG_OPUS
+    assert audio_config.sample_rate_hertz == 48000
+
+def test_synthesize_rejects_unknown_encoding():
+    with pytest.raises(ValueError):
+        ChirpTTS(audio_encoding="FLAC")
+
+def test_synthesize_to_stream_and_cache(mocker, tmp_path):
+    mock_client = mocker.patch("google.cloud.texttospeech.TextToSpeechClient")
+    mock_client.return_value.synthesize_speech.return_value.audio_content = b"fake audio content"
+    cache = SynthesisCache(tmp_path / "cache")
+    tts = ChirpTTS(cache=cache)
+    tts.synthesize("Hello", output_file=str(tmp_path / "seed.mp3"))
+
+    # Cache hit into a real file descriptor goes through sendfile
+    target = tmp_path / "piped.mp3"
+    with open(target, "wb") as out:
+        tts.synthesize_to("Hello", out)
+    assert target.read_bytes() == b"fake audio content"
+    assert mock_client.return_value.synthesize_speech.call_count == 1
+
+    buffer = io.BytesIO()
+    tts.synthesize_to("Uncached", buffer)
+    assert buffer.getvalue() == b"fake audio content"
+
+    # The miss above was stored, so writing the same text again is a hit
+    again = io.BytesIO()
+    tts.synthesize_to("Uncached", again)
+    assert again.getvalue() == b"fake audio content"
+    assert mock_client.return_value.synthesize_speech.call_count == 2
+    assert cache.stats()["entries"] == 2
+
+def test_synthesize_to_pipe_caches_complete_wav(mocker, tmp_path):
+    from gcp_chirp.audio import parse_wav
+    mock_client = mocker.patch("google.cloud.texttospeech.TextToSpeechClient")
+    mock_client.return_value.synthesize_speech.return_value.audio_content = make_wav(b"\x01\x00" * 50, 8000)
+
+    class Pipe(io.BytesIO):
+        def seekable(self):
+            return False
+
+    tts = ChirpTTS(cache=SynthesisCache(tmp_path / "cache"), audio_encoding="LINEAR16", sample_rate_hertz=8000)
+    tts.synthesize_to("Piped", Pipe())
+    output = tmp_path / "hit.wav"
+    tts.synthesize("Piped", output_file=str(output))
+
+    assert mock_client.return_value.synthesize_speech.call_count == 1
+    assert parse_wav(output.read_bytes()).data_length == 100
+
+def test_synthesize_many_packs_into_one_request(mocker, tmp_path):
+    mock_client = mocker.patch("google.cloud.texttospeech_v1beta1.TextToSpeechClient")
+    plain_client = mocker.patch("google.cloud.texttospeech.TextToSpeechClient")
+    response = mocker.Mock()
+    response.audio_content = make_wav(b"\x01\x00" * 10 + b"\x02\x00" * 10 + b"\x03\x00" * 10, 1000)
+    response.timepoints = [mocker.Mock(mark_name=str(i), time_seconds=i * 0.01) for i in range(3)]
+    mock_client.return_value.synthesize_speech.return_value = response
+    outputs = [str(tmp_path / f"{i}.wav") for i in range(3)]
+
+    tts = ChirpTTS(audio_encoding="LINEAR16", cache=SynthesisCache(tmp_path / "cache"))
+    assert tts.synthesize_many(["Order shipped", "Tom & Jerry", "Done"], outputs) == outputs
+
+    assert mock_client.return_value.synthesize_speech.call_count == 1
+    request = mock_client.return_value.synthesize_speech.call_args.kwargs["request"]
+    assert request.input.ssml == (
+        '<speak><mark name="0"/>Order shipped<break time="100ms"/>'
+        '<mark name="1"/>Tom &amp; Jerry<break time="100ms"/><mark name="2"/>Done</speak>'
+    )
+    assert list(request.enable_time_pointing) == [1]
+    for i, fill in enumerate((b"\x01\x00", b"\x02\x00", b"\x03\x00")):
+        data = open(outputs[i], "rb").read()
+        assert data.endswith(fill * 10) and len(data) == 44 + 20
+    plain_client.return_value.synthesize_speech.assert_not_called()
+
+    # A second run is served entirely from the cache
+    tts.synthesize_many(["Order shipped", "Tom & Jerry", "Done"], [str(tmp_path / f"again{i}.wav") for i in range(3)])
+    assert mock_client.return_value.synthesize_speech.call_count == 1
+
+def test_synthesize_many_respects_request_size(mocker, tmp_path):
+    mock_client = mocker.patch("google.cloud.texttospeech_v1beta1.TextToSpeechClient")
+
+    def respond(request):
+        count = request.input.ssml.count("<mark")
+        response = mocker.Mock()
+        response.audio_content = make_wav(b"\x00\x00" * count, 1000)
+        response.timepoints = [mocker.Mock(mark_name=str(i), time_seconds=i * 0.001) for i in range(count)]
+        return response
+
+    mock_client.return_value.synthesize_speech.side_effect = respond
+    tts = ChirpTTS(audio_encoding="LINEAR16", max_chunk_bytes=200)
+    texts = [f"Notification number {i}" for i in range(20)]
+    tts.synthesize_many(texts, [str(tmp_path / f"{i}.wav") for i in range(20)])
+
+    requests = [call.kwargs["request"] for call in mock_client.return_value.synthesize_speech.call_args_list]
+    assert 1 < len(requests) < 20
+    assert all(len(request.input.ssml.encode()) <= 200 for request in requests)
+    assert sum(request.input.ssml.count("<mark") for request in requests) == 20
+
+def test_synthesize_many_falls_back_without_marks(mocker, tmp_path):
+    mock_client = mocker.patch("google.cloud.texttospeech_v1beta1.TextToSpeechClient")
+    plain_client = mocker.patch("google.cloud.texttospeech.TextToSpeechClient")
+    response = mocker.Mock()
+    response.audio_content = b"packed"
+    response.timepoints = []
+    mock_client.return_value.synthesize_speech.return_value = response
+    plain_response = mocker.Mock()
+    plain_response.audio_content = b"single"
+    plain_client.return_value.synthesize_speech.return_value = plain_response
+
+    tts = ChirpTTS()
+    tts.synthesize_many(["One", "Two"], [str(tmp_path / "1.mp3"), str(tmp_path / "2.mp3")])
+
+    assert plain_client.return_value.synthesize_speech.call_count == 2
+    assert (tmp_path / "2.mp3").read_bytes() == b"single"
+
+def test_synthesize_many_stops_packing_voices_without_marks(mocker, tmp_path):
+    mock_client = mocker.patch("google.cloud.texttospeech_v1beta1.TextToSpeechClient")
+    plain_client = mocker.patch("google.cloud.texttospeech.TextToSpeechClient")
+    response = mocker.Mock()
+    response.audio_content = b"packed"
+    response.timepoints = []
+    mock_client.return_value.synthesize_speech.return_value = response
+    plain_client.return_value.synthesize_speech.return_value.audio_content = b"single"
+
+    tts = ChirpTTS(max_chunk_bytes=300, concurrency=4)
+    texts = [f"Notification number {i}" for i in range(40)]
+    tts.synthesize_many(texts, [str(tmp_path / f"{i}.mp3") for i in range(40)])
+
+    # One probe pack, then each item on its own; not one wasted packed call per pack
+    assert mock_client.return_value.synthesize_speech.call_count == 1
+    assert plain_client.return_value.synthesize_speech.call_count == 40
+
+    tts.synthesize_many(["Again"] * 2, [str(tmp_path / "a.mp3"), str(tmp_path / "b.mp3")])
+    assert mock_client.return_value.synthesize_speech.call_count == 1
+
+def test_synthesize_deduplicated_bills_each_sentence_once(mocker, tmp_path):
+    mock_client = mocker.patch("google.cloud.texttospeech.TextToSpeechClient")
+
+    def fake_synthesize(input, voice, audio_config):
+        response = mocker.Mock()
+        response.audio_content = make_wav(input.text[0].encode() * 4, 1000)
+        return response
+
+    mock_client.return_value.synthesize_speech.side_effect = fake_synthesize
+    texts = ["Welcome aboard.  Please hold.", "Please hold. Goodbye.", "Welcome aboard."]
+    outputs = [str(tmp_path / f"{i}.wav") for i in range(3)]
+
+    tts = ChirpTTS(audio_encoding="LINEAR16", normalizer=TextNormalizer())
+    result = tts.synthesize_deduplicated(texts, outputs)
+
+    calls = [c.kwargs["input"].text for c in mock_client.return_value.synthesize_speech.call_args_list]
+    assert sorted(calls) == ["Goodbye.", "Please hold.", "Welcome aboard."]
+    assert result.errors == [None, None, None]
+    # Counted over normalized sentences, so the double space is not reported as a deduplication saving
+    assert result.characters == len("Welcome aboard.Please hold.Please hold.Goodbye.Welcome aboard.")
+    assert result.characters_saved == len("Please hold.Welcome aboard.")
+    assert open(outputs[0], "rb").read()[44:] == b"WWWWPPPP"
+    assert open(outputs[1], "rb").read()[44:] == b"PPPPGGGG"
+
+def test_synthesize_deduplicated_reports_failures_per_text(mocker, tmp_path):
+    mock_client = mocker.patch("google.cloud.texttospeech.TextToSpeechClient")
+
+    def fake_synthesize(input, voice, audio_config):
+        if input.text == "Broken.":
+            raise ValueError("boom")
+        response = mocker.Mock()
+        response.audio_content = make_wav(b"\x00\x00", 1000)
+        return response
+
+    mock_client.return_value.synthesize_speech.side_effect = fake_synthesize
+    outputs = [str(tmp_path / f"{i}.wav") for i in range(2)]
+    result = ChirpTTS(audio_encoding="LINEAR16").synthesize_deduplicated(["Fine.", "Fine. Broken."], outputs)
+
+    assert result.errors[0] is None
+    assert "boom" in result.errors[1]
+    assert not (tmp_path / "1.wav").exists()
+
+def test_synthesize_fails_over_to_another_project(mocker, tmp_path):
+    from google.api_core import exceptions as core_exceptions
+
+    exhausted, healthy = mocker.Mock(), mocker.Mock()
+    exhausted.synthesize_speech.side_effect = core_exceptions.ResourceExhausted("Quota exceeded")
+    healthy.synthesize_speech.return_value.audio_content = b"audio"
+    client_class = mocker.patch("google.cloud.texttospeech.TextToSpeechClient", side_effect=[exhausted, healthy])
+    sleep = mocker.patch("gcp_chirp.tts.time.sleep")
+
+    pool = ClientPool([PoolEntry("first"), PoolEntry("second")])
+    tts = ChirpTTS(pool=pool)
+    tts.synthesize("Hello", output_file=str(tmp_path / "a.mp3"))
+    tts.synthesize("Again", output_file=str(tmp_path / "b.mp3"))
+
+    assert exhausted.synthesize_speech.call_count == 1
+    assert healthy.synthesize_speech.call_count == 2
+    sleep.assert_not_called()
+    assert [c.kwargs["client_options"].quota_project_id for c in client_class.call_args_list] == ["first", "second"]
+
+def test_credentials_path_does_not_touch_environment(mocker):
+    mocker.patch.dict("os.environ", {}, clear=True)
+    from_file = mocker.patch("google.cloud.texttospeech.TextToSpeechClient.from_service_account_file")
+
+    tts = ChirpTTS(credentials_path="/keys/a.json")
+    assert tts.client is from_file.return_value
+    from_file.assert_called_once_with("/keys/a.json")
+    assert "GOOGLE_APPLICATION_CREDENTIALS" not in os.environ
+
+def test_synthesize_hands_each_segment_to_on_segment(mocker, tmp_path):
+    mock_client = mocker.patch("google.cloud.texttospeech.TextToSpeechClient")
+
+    def fake_synthesize(input, voice, audio_config):
+        response = mocker.Mock()
+        response.audio_content = b"\xff\xfb\x90\x64" + input.text[-2:-1].encode() * 413
+        return response
+
+    mock_client.return_value.synthesize_speech.side_effect = fake_synthesize
+    segments = []
+    ChirpTTS(max_chunk_bytes=10, concurrency=2).synthesize(
+        "Part a. Part b. Part c.", output_file=str(tmp_path / "o.mp3"), on_segment=segments.append
+    )
+    assert [segment[4:5] for segment in segments] == [b"a", b"b", b"c"]
+
+def test_lexicon_and_preset_shape_request_and_cache_key(mocker, tmp_path):
+    mock_client = mocker.patch("google.cloud.texttospeech.TextToSpeechClient")
+    mock_client.return_value.synthesize_speech.return_value.audio_content = b"fake audio content"
+    lexicon = parse_lexicon({"GCP": "Google Cloud", "Chirp": {"ipa": "tʃɝp"}})
+    cache = SynthesisCache(tmp_path / "cache")
+
+    tts = ChirpTTS(cache=cache, lexicon=lexicon, preset={"speaking_rate": 0.9, "effects_profile_id": "headphone-class-device"})
+    tts.synthesize("Chirp on GCP", output_file=str(tmp_path / "a.mp3"))
+    kwargs = mock_client.return_value.synthesize_speech.call_args.kwargs
+    assert kwargs["input"].text == "Chirp on Google Cloud"
+    [pronunciation] = kwargs["input"].custom_pronunciations.pronunciations
+    assert (pronunciation.phrase, pronunciation.pronunciation) == ("Chirp", "tʃɝp")
+    assert pronunciation.phonetic_encoding.name == "PHONETIC_ENCODING_IPA"
+    assert kwargs["audio_config"].speaking_rate == pytest.approx(0.9)
+    assert list(kwargs["audio_config"].effects_profile_id) == ["headphone-class-device"]
+
+    # Same text without the preset or lexicon is a different cache entry
+    ChirpTTS(cache=cache).synthesize("Chirp on Google Cloud", output_file=str(tmp_path / "b.mp3"))
+    assert mock_client.return_value.synthesize_speech.call_count == 2
+    tts.synthesize("Chirp  on GCP", output_file=str(tmp_path / "c.mp3"))
+    assert mock_client.return_value.synthesize_speech.call_count == 2
+
+def test_unknown_preset_setting_is_rejected():
+    with pytest.raises(ValueError, match="speed"):
+        ChirpTTS(preset={"speed": 2})
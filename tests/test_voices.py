@@ -0,0 +1,45 @@
+import time
+from gcp_chirp.voices import VoiceCatalog, VoiceInfo, voice_family
+
+VOICES = [
+    VoiceInfo("en-US-Chirp3-HD-Aoede", ["en-US"], "FEMALE", "Chirp3-HD", 24000),
+    VoiceInfo("en-US-Chirp3-HD-Charon", ["en-US"], "MALE", "Chirp3-HD", 24000),
+    VoiceInfo("en-US-Standard-A", ["en-US"], "MALE", "Standard", 24000),
+    VoiceInfo("es-ES-Chirp3-HD-Aoede", ["es-ES"], "FEMALE", "Chirp3-HD", 24000),
+]
+
+def test_voice_family():
+    assert voice_family("en-US-Chirp3-HD-Aoede") == "Chirp3-HD"
+    assert voice_family("en-US-Neural2-A") == "Neural2"
+    assert voice_family("Kore") == ""
+
+def test_catalog_persists_and_indexes(tmp_path):
+    catalog = VoiceCatalog(tmp_path / "voices.json")
+    assert catalog.is_stale
+    assert catalog.update(VOICES)
+
+    reloaded = VoiceCatalog(tmp_path / "voices.json")
+    assert not reloaded.is_stale
+    assert "en-US-Chirp3-HD-Charon" in reloaded
+    names = [voice.name for voice in reloaded.find(language="en-us", family="Chirp3-HD")]
+    assert names == ["en-US-Chirp3-HD-Aoede", "en-US-Chirp3-HD-Charon"]
+    assert [voice.name for voice in reloaded.find(language="en-US", gender="male", family="chirp3-hd")] == ["en-US-Chirp3-HD-Charon"]
+
+def test_catalog_update_detects_unchanged_content(tmp_path):
+    catalog = VoiceCatalog(tmp_path / "voices.json")
+    catalog.update(VOICES)
+    etag = catalog.etag
+    assert not catalog.update(list(reversed(VOICES)))
+    assert catalog.etag == etag
+
+def test_catalog_ttl(tmp_path, mocker):
+    catalog = VoiceCatalog(tmp_path / "voices.json", ttl_seconds=60)
+    catalog.update(VOICES)
+    mocker.patch("gcp_chirp.voices.time.time", return_value=time.time() + 120)
+    assert catalog.is_stale
+
+def test_catalog_suggest(tmp_path):
+    catalog = VoiceCatalog(tmp_path / "voices.json")
+    catalog.update(VOICES)
+    assert catalog.suggest("en-US-Chirp3-HD-Aode")[0] == "en-US-Chirp3-HD-Aoede"
+    assert catalog.suggest("en-us-chirp3-hd-charon")[0] == "en-US-Chirp3-HD-Charon"
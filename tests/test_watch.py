@@ -0,0 +1,126 @@
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+import pytest
+from gcp_chirp.watch import WATCH_STATE, FolderWatcher, InotifyWatcher, PollingWatcher, WatchState
+
+class FakeTTS:
+    audio_encoding = "MP3"
+    sample_rate_hertz = 0
+    preset = {}
+
+    def __init__(self, normalizer=None, lexicon=None):
+        self.normalizer = normalizer
+        self.lexicon = lexicon
+        self.calls = []
+
+    def synthesize(self, text, voice_name, output_file, **options):
+        self.calls.append(text)
+        Path(output_file).write_bytes(b"audio:" + text.encode())
+        return output_file
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Timed out waiting for the watcher")
+        time.sleep(0.02)
+
+def test_once_processes_matching_files_and_skips_known_content(tmp_path):
+    (tmp_path / "a.txt").write_text("Hello")
+    (tmp_path / "b.txt").write_text("World")
+    (tmp_path / "empty.txt").write_text(" ")
+    (tmp_path / "notes.md").write_text("Ignored")
+    (tmp_path / ".hidden.txt").write_text("Ignored")
+    tts = FakeTTS()
+    results = []
+
+    FolderWatcher(tts, tmp_path, "en-US-Chirp3-HD-Aoede", on_result=results.append, concurrency=2).run(once=True)
+
+    assert sorted(tts.calls) == ["Hello", "World"]
+    assert (tmp_path / "a.mp3").read_bytes() == b"audio:Hello"
+    statuses = {Path(r["file"]).name: r["status"] for r in results}
+    assert statuses == {"a.txt": "ok", "b.txt": "ok", "empty.txt": "error"}
+    assert set(json.loads((tmp_path / WATCH_STATE).read_text())["files"]) == {"a.txt", "b.txt"}
+
+    # A restart skips unchanged content but redoes edited files and missing outputs
+    (tmp_path / "a.txt").write_text("Hello again")
+    (tmp_path / "b.mp3").unlink()
+    tts = FakeTTS()
+    FolderWatcher(tts, tmp_path, "en-US-Chirp3-HD-Aoede", state=WatchState(tmp_path / WATCH_STATE)).run(once=True)
+    assert sorted(tts.calls) == ["Hello again", "World"]
+
+    # Changing the voice changes the content hash too
+    tts = FakeTTS()
+    FolderWatcher(tts, tmp_path, "en-US-Chirp3-HD-Charon").run(once=True)
+    assert sorted(tts.calls) == ["Hello again", "World"]
+
+def test_text_settings_changes_redo_files(tmp_path):
+    from gcp_chirp.lexicon import parse_lexicon
+    from gcp_chirp.normalize import TextNormalizer
+    (tmp_path / "a.txt").write_text("GCP, Dr. Smith")
+
+    def run(**settings):
+        tts = FakeTTS(**settings)
+        FolderWatcher(tts, tmp_path, "en-US-Chirp3-HD-Aoede").run(once=True)
+        return len(tts.calls)
+
+    assert run(normalizer=TextNormalizer()) == 1
+    assert run(normalizer=TextNormalizer()) == 0
+    assert run(normalizer=TextNormalizer({"Dr.": "Doctor"})) == 1
+    assert run(normalizer=TextNormalizer({"Dr.": "Doctor"}), lexicon=parse_lexicon({"GCP": "Google Cloud"})) == 1
+    assert run(normalizer=TextNormalizer({"Dr.": "Doctor"}), lexicon=parse_lexicon({"GCP": "Google Cloud Platform"})) == 1
+    assert run(normalizer=TextNormalizer({"Dr.": "Doctor"}), lexicon=parse_lexicon({"GCP": "Google Cloud Platform"})) == 0
+    assert run() == 1
+
+@pytest.mark.parametrize("poll", [
+    pytest.param(False, marks=pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")),
+    True,
+])
+def test_run_picks_up_new_and_renamed_files(tmp_path, poll):
+    tts = FakeTTS()
+    stop = threading.Event()
+    watcher = FolderWatcher(tts, tmp_path, "en-US-Chirp3-HD-Aoede")
+    thread = threading.Thread(target=watcher.run, kwargs={"poll": poll, "interval": 0.05, "stop": stop})
+    thread.start()
+    try:
+        time.sleep(0.1)
+        (tmp_path / "new.txt").write_text("Fresh")
+        # Writers that rename into place are picked up too, and the temp name is ignored
+        (tmp_path / "draft.tmp").write_text("Moved")
+        (tmp_path / "draft.tmp").rename(tmp_path / "moved.txt")
+        wait_for(lambda: (tmp_path / "new.mp3").exists() and (tmp_path / "moved.mp3").exists())
+    finally:
+        stop.set()
+        thread.join()
+    assert sorted(tts.calls) == ["Fresh", "Moved"]
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+def test_inotify_reports_closed_files_only(tmp_path):
+    watcher = InotifyWatcher(tmp_path)
+    try:
+        with open(tmp_path / "slow.txt", "w") as f:
+            f.write("partial")
+            f.flush()
+            assert watcher.changes(0.05) == []
+        assert watcher.changes(1.0) == ["slow.txt"]
+    finally:
+        watcher.close()
+
+def test_polling_waits_for_files_to_settle(tmp_path):
+    watcher = PollingWatcher(tmp_path)
+    (tmp_path / "a.txt").write_text("one")
+    assert watcher.changes(0) == []
+    assert watcher.changes(0) == ["a.txt"]
+    assert watcher.changes(0) == []
+
+def test_state_merges_records_from_other_watchers(tmp_path):
+    first = WatchState(tmp_path / WATCH_STATE)
+    second = WatchState(tmp_path / WATCH_STATE)
+    first.record("a.txt", "1")
+    second.record("b.txt", "2")
+
+    assert WatchState(tmp_path / WATCH_STATE).get("a.txt") == "1"
+    assert WatchState(tmp_path / WATCH_STATE).get("b.txt") == "2"
@@ -0,0 +1,58 @@
+import threading
+import time
+import pytest
+from gcp_chirp.workers import ordered_map, unordered_map
+
+def test_ordered_map_sequential():
+    assert list(ordered_map(lambda x: x * 2, [1, 2, 3])) == [2, 4, 6]
+
+def test_ordered_map_preserves_order_under_concurrency():
+    def slow_first(x):
+        time.sleep(0.05 if x == 0 else 0.001)
+        return x
+    assert list(ordered_map(slow_first, range(10), concurrency=4)) == list(range(10))
+
+def test_ordered_map_bounds_in_flight_work():
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    def work(x):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.01)
+        with lock:
+            state["active"] -= 1
+        return x
+
+    assert list(ordered_map(work, range(20), concurrency=3)) == list(range(20))
+    assert state["peak"] <= 3
+
+def test_ordered_map_runs_in_parallel():
+    start = time.perf_counter()
+    list(ordered_map(lambda x: time.sleep(0.05), range(8), concurrency=8))
+    assert time.perf_counter() - start < 0.3
+
+def test_ordered_map_propagates_errors():
+    def fail_on_two(x):
+        if x == 2:
+            raise RuntimeError("boom")
+        return x
+    with pytest.raises(RuntimeError):
+        list(ordered_map(fail_on_two, range(5), concurrency=2))
+
+def test_unordered_map_returns_all_results():
+    assert sorted(unordered_map(lambda x: x * 2, range(25), concurrency=4)) == [x * 2 for x in range(25)]
+
+def test_unordered_map_pulls_input_lazily():
+    consumed = []
+
+    def source():
+        for x in range(100):
+            consumed.append(x)
+            yield x
+
+    results = unordered_map(lambda x: x, source(), concurrency=2)
+    next(results)
+    assert len(consumed) <= 4
+    results.close()